@@ -0,0 +1,79 @@
+"""
+deck_weights.py
+
+This file benchmarks the card weighting step of study deck preparation.
+
+It compares the legacy per-card path (one get_study_history query per card) with the
+bulk DatabaseManager.get_card_weights query on synthetic databases of every combination of
+card count and number of selected categories.
+
+Run from the project root:
+    python -m benchmarks.deck_weights
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from database_manager import DatabaseManager
+from constants import MAX_CARD_WEIGHT
+from benchmarks.generator import populate
+
+def legacy_weights(db_manager, category_ids):
+    """Weight every card with one get_study_history query per card, as get_study_deck used to."""
+    weights = {}
+    for card in db_manager.get_flashcards_by_categories(category_ids):
+        history = db_manager.get_study_history(card[0])
+        if not history:
+            weights[card[0]] = MAX_CARD_WEIGHT
+            continue
+        correct_ratio = sum(1 for result in history if result[0]) / len(history)
+        weights[card[0]] = max(1, int(MAX_CARD_WEIGHT * (1 - correct_ratio)))
+    return weights
+
+def time_call(func, *args):
+    """Return the result of func(*args) and the elapsed time in milliseconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def run(sizes, category_counts, history_per_card, skip_legacy_above):
+    """
+    Run the benchmark and print one row per (cards, categories) pair.
+
+    Parameters:
+    - sizes (list): The numbers of cards.
+    - category_counts (list): The numbers of categories the cards are spread over. Every
+      category is selected, as when a session is started with the default options.
+    - history_per_card (int): The average number of study results per card.
+    - skip_legacy_above (int): The largest number of cards the per-card path is run for.
+    """
+    print(f"{'cards':>8} {'categories':>10} {'legacy ms':>10} {'queries':>8} {'bulk ms':>9} {'queries':>8}")
+    for num_cards in sizes:
+        for num_categories in category_counts:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                with DatabaseManager(os.path.join(tmp_dir, "bench.db")) as db_manager:
+                    category_ids = populate(db_manager, num_cards, num_categories, history_per_card)
+                    bulk, bulk_ms = time_call(db_manager.get_card_weights, category_ids)
+                    if num_cards <= skip_legacy_above:
+                        legacy, legacy_ms = time_call(legacy_weights, db_manager, category_ids)
+                        if legacy != bulk:
+                            raise AssertionError("Bulk weights differ from the per-card weights.")
+                        legacy_column = f"{legacy_ms:>10.1f} {num_cards + 1:>8}"
+                    else:
+                        legacy_column = f"{'skipped':>10} {num_cards + 1:>8}"
+                    print(f"{num_cards:>8} {num_categories:>10} {legacy_column} {bulk_ms:>9.1f} {1:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark study deck card weighting.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--categories", type=int, nargs="+", default=[1, 10, 100],
+                        help="The numbers of selected categories to run each size with.")
+    parser.add_argument("--history", type=int, default=12, help="Average study results per card.")
+    parser.add_argument("--skip-legacy-above", type=int, default=10000,
+                        help="Do not run the per-card path for decks larger than this.")
+    args = parser.parse_args()
+    run(args.sizes, args.categories, args.history, args.skip_legacy_above)
+
+if __name__ == "__main__":
+    main()
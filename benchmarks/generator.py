@@ -0,0 +1,113 @@
+"""
+generator.py
+
+This file builds synthetic flashcard databases for the benchmarks.
+
+The same size and seed always produce the same categories, cards and study history, so runs
+on different checkouts compare like with like. Build a database to inspect or profile by hand
+from the project root:
+    python -m benchmarks.generator --cards 100000 --history 10 bench.db
+"""
+
+import argparse
+import datetime
+import os
+import random
+import migrations
+from database_manager import DatabaseManager
+from scheduler import TIMESTAMP_FORMAT
+
+# Words for the generated questions and answers, so full-text search has realistic matches.
+WORDS = ["capital", "river", "element", "formula", "verb", "noun", "theorem", "enzyme", "planet", "treaty",
+         "century", "protein", "integral", "symbol", "language", "mountain", "battle", "molecule", "poem", "law"]
+
+# The share of study results that are correct.
+CORRECT_RATE = 0.7
+
+def populate(db_manager, num_cards, num_categories, history_per_card, seed=42, history_days=365):
+    """
+    Fill a database with synthetic categories, flashcards and study history.
+
+    The study history is spread over the last history_days days. Card statistics, schedules
+    and daily rollups are brought up to date with it, as they would be after real sessions.
+
+    Parameters:
+    - db_manager (DatabaseManager): The database to fill.
+    - num_cards (int): The number of flashcards to create.
+    - num_categories (int): The number of categories to spread the cards over.
+    - history_per_card (int): The average number of study results per card.
+    - seed (int): The random seed.
+    - history_days (int): The number of days the study history covers.
+
+    Returns:
+    - list: The IDs of the created categories.
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    # As the app does on startup; deleted categories move their cards to Default.
+    db_manager.initialize_default_category()
+    with db_manager.pool.writer() as cursor:
+        cursor.executemany('INSERT INTO categories (name, color) VALUES (?, ?)',
+                           [(f"Category {i}", f"#{rng.randrange(0x1000000):06x}") for i in range(num_categories)])
+        category_ids = [row[0] for row in cursor.execute("SELECT id FROM categories WHERE name LIKE 'Category %' ORDER BY id")]
+        cursor.executemany('INSERT INTO flashcards (question, answer, category_id) VALUES (?, ?, ?)',
+                           [(f"Question {i}: {' '.join(rng.sample(WORDS, 3))}", f"Answer {i}: {' '.join(rng.sample(WORDS, 2))}",
+                             category_ids[i % num_categories]) for i in range(num_cards)])
+        card_ids = [row[0] for row in cursor.execute('SELECT id FROM flashcards')]
+
+        # The card_stats triggers would update one row per insert; rebuilding afterwards is far faster.
+        cursor.execute('DROP TRIGGER IF EXISTS trg_study_history_insert_card_stats')
+        cursor.execute('DROP TRIGGER IF EXISTS trg_study_history_delete_card_stats')
+        span = history_days * 86400
+        history = []
+        for card_id in card_ids:
+            for _ in range(rng.randint(0, 2 * history_per_card)):
+                timestamp = now - datetime.timedelta(seconds=rng.randrange(span))
+                history.append((timestamp.strftime(TIMESTAMP_FORMAT), card_id, rng.random() < CORRECT_RATE))
+        # Insert in time order, so study_history IDs grow with time as they do in real use.
+        history.sort()
+        cursor.executemany('INSERT INTO study_history (timestamp, flashcard_id, is_correct) VALUES (?, ?, ?)', history)
+
+        for statement in migrations.REBUILD_CARD_STATS:
+            cursor.execute(statement)
+        migrations.create_card_weight_triggers(cursor)
+        migrations.replay_card_schedules(cursor)
+        migrations.update_rollups(cursor)
+    return category_ids
+
+def generate(db_file, num_cards, num_categories, history_per_card, seed=42, history_days=365):
+    """
+    Create a new database file filled by populate.
+
+    Parameters:
+    - db_file (str): The path of the database file, which must not exist yet.
+    - num_cards (int): The number of flashcards to create.
+    - num_categories (int): The number of categories to spread the cards over.
+    - history_per_card (int): The average number of study results per card.
+    - seed (int): The random seed.
+    - history_days (int): The number of days the study history covers.
+
+    Raises:
+    - FileExistsError: If db_file already exists.
+    """
+    if os.path.exists(db_file):
+        raise FileExistsError(f"{db_file} already exists.")
+    with DatabaseManager(db_file) as db_manager:
+        populate(db_manager, num_cards, num_categories, history_per_card, seed, history_days)
+        # Leave a single file behind, so it can be copied for each run.
+        with db_manager.pool.writer_connection() as conn:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a synthetic flashcards database.")
+    parser.add_argument("db_file", help="The database file to create.")
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--history", type=int, default=10, help="Average study results per card.")
+    parser.add_argument("--days", type=int, default=365, help="The number of days the study history covers.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate(args.db_file, args.cards, args.categories, args.history, args.seed, args.days)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+import_time.py
+
+This file benchmarks the cold import of flashcard_app, the part of startup before the first
+window. main imports it only when it starts the window, so --module study_cli measures the
+terminal study mode instead.
+
+Each run imports the module in a fresh interpreter with -X importtime and reads its cumulative
+time from the report. The benchmark prints the median over the runs and the
+slowest modules, and exits with status 1 when the median exceeds the budget, so it can
+guard startup in CI.
+
+Run from the project root:
+    python -m benchmarks.import_time
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from constants import STARTUP_IMPORT_BUDGET_MS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_import_times(report):
+    """
+    Parse the report written to stderr by -X importtime.
+
+    Parameters:
+    - report (str): The stderr output of the interpreter.
+
+    Returns:
+    - dict: The module name mapped to its (self, cumulative) import time in microseconds.
+    """
+    times = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header line
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+def measure(module="flashcard_app"):
+    """
+    Import a module in a fresh interpreter.
+
+    Parameters:
+    - module (str): The module to import.
+
+    Returns:
+    - dict: The import times of every module loaded, as returned by parse_import_times.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    times = parse_import_times(completed.stderr)
+    if module not in times:
+        raise RuntimeError(f"No import time reported for {module}.")
+    return times
+
+def run(runs, budget_ms, top, module="flashcard_app"):
+    """
+    Run the benchmark and print the results.
+
+    Parameters:
+    - runs (int): The number of fresh interpreters to import the module in.
+    - budget_ms (float): The largest median import time that passes.
+    - top (int): The number of slowest modules to list.
+    - module (str): The module to import.
+
+    Returns:
+    - bool: Whether the median import time is within the budget.
+    """
+    samples = [measure(module) for _ in range(runs)]
+    totals = [times[module][1] / 1000 for times in samples]
+    median_ms = statistics.median(totals)
+
+    # The slowest modules by their own time, from the run closest to the median.
+    typical = min(samples, key=lambda times: abs(times[module][1] / 1000 - median_ms))
+    print(f"{'self ms':>8} {'cumulative ms':>14}  module")
+    for name, (self_us, cumulative_us) in sorted(typical.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+        print(f"{self_us / 1000:>8.1f} {cumulative_us / 1000:>14.1f}  {name}")
+
+    print(f"\nimport {module}: median {median_ms:.1f} ms over {runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}), budget {budget_ms:.0f} ms")
+    if median_ms > budget_ms:
+        print(f"FAIL: the cold import of {module} exceeds the budget.")
+        return False
+    print("OK")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cold import time of the application.")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_IMPORT_BUDGET_MS,
+                        help="Fail when the median import time exceeds this.")
+    parser.add_argument("--top", type=int, default=10, help="The number of slowest modules to list.")
+    parser.add_argument("--module", default="flashcard_app", help="The module to import.")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.runs, args.budget_ms, args.top, args.module) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+scenarios.py
+
+This file contains the timed scenarios of the benchmark suite.
+
+Each scenario is a function that takes the benchmark context and returns the call to time.
+It is called again before every timed run, so any setup a scenario needs (such as creating
+the category that delete_category removes) is done outside the timing. Scenarios that write
+run on their own copy of the generated database, so they do not change what the others read.
+"""
+
+import datetime
+import random
+from review_writer import ReviewWriter
+from scheduler import utc_now
+from study_engine import StudyEngine, draw_deck
+
+# The length of the study sessions drawn by the study scenarios.
+SESSION_LENGTH = 20
+
+# The number of study results written by the write scenarios.
+RESULT_BATCH = 50
+
+def make_context(db_manager, seed=42):
+    """
+    Build the context passed to the scenarios.
+
+    Parameters:
+    - db_manager (DatabaseManager): The database the scenarios run against.
+    - seed (int): The random seed for the cards and answers the scenarios pick.
+
+    Returns:
+    - dict: The database manager, the category IDs, a random number generator and today's date.
+    """
+    return {
+        "db": db_manager,
+        "category_ids": [category["id"] for category in db_manager.get_all_categories()],
+        "card_count": db_manager.count_flashcards(),
+        "rng": random.Random(seed),
+        "today": datetime.datetime.now(datetime.timezone.utc).date(),
+    }
+
+def random_card_ids(ctx, count):
+    """Return count random flashcard IDs that exist."""
+    db = ctx["db"]
+    deck = db.select_study_deck(ctx["category_ids"], count)
+    return [ctx["rng"].choice(deck) for _ in range(count)] if deck else []
+
+# Application start and screens
+
+def load_data(ctx):
+    """The data FlashcardApp loads at startup and after changes."""
+    db = ctx["db"]
+    return lambda: (db.count_flashcards(), db.get_all_categories())
+
+def get_flashcard_page_first(ctx):
+    """The first page of the flashcard list."""
+    return lambda: ctx["db"].get_flashcard_page("question", limit=100)
+
+def get_flashcard_page_middle(ctx):
+    """A jump to the middle of the flashcard list."""
+    return lambda: ctx["db"].get_flashcard_page("question", offset=ctx["card_count"] // 2, limit=100)
+
+def search_flashcards(ctx):
+    """A two word full-text search."""
+    return lambda: ctx["db"].search_flashcards("theorem enzyme")
+
+def get_flashcard_statistics(ctx):
+    """The statistics of every studied card."""
+    return ctx["db"].get_flashcard_statistics
+
+def count_statistics(ctx):
+    """The number of rows of the progress view."""
+    return ctx["db"].count_statistics
+
+def get_statistics_page_accuracy(ctx):
+    """The first page of the progress view, weakest cards first."""
+    return lambda: ctx["db"].get_statistics_page("accuracy", limit=100)
+
+def get_statistics_page_category(ctx):
+    """The first page of the progress view sorted by category, for one category."""
+    return lambda: ctx["db"].get_statistics_page("category", category_ids=ctx["category_ids"][-1:], limit=100)
+
+def get_daily_activity(ctx):
+    """The 90 day range of the trends view."""
+    since_day = (ctx["today"] - datetime.timedelta(days=89)).isoformat()
+    return lambda: ctx["db"].get_daily_activity(since_day)
+
+def get_study_streaks(ctx):
+    """The streaks of the trends view."""
+    return lambda: ctx["db"].get_study_streaks(ctx["today"].isoformat())
+
+# Study sessions, without the GUI
+
+def get_card_weights(ctx):
+    """The weight of every card in every category."""
+    return lambda: ctx["db"].get_card_weights(ctx["category_ids"])
+
+def study_deck_weighted(ctx):
+    """Drawing a weighted deck in SQL, the default study mode."""
+    return lambda: draw_deck(ctx["db"], ctx["category_ids"], SESSION_LENGTH)
+
+def study_deck_seeded(ctx):
+    """Drawing a reproducible weighted deck in Python."""
+    return lambda: draw_deck(ctx["db"], ctx["category_ids"], SESSION_LENGTH, seed=42)
+
+def study_deck_due(ctx):
+    """Drawing the due cards, the spaced repetition study mode."""
+    return lambda: draw_deck(ctx["db"], ctx["category_ids"], SESSION_LENGTH, mode="due")
+
+def study_session(ctx):
+    """A whole session through StudyEngine: the deck drawn, every card loaded, answered and written."""
+    db = ctx["db"]
+    answers = [ctx["rng"].random() < 0.7 for _ in range(SESSION_LENGTH)]
+
+    def run_session():
+        engine = StudyEngine(db, ctx["category_ids"], SESSION_LENGTH)
+        engine.start()
+        try:
+            for is_correct in answers:
+                if engine.next_card(timeout=5) is None:
+                    break
+                engine.answer(is_correct)
+        finally:
+            engine.close()
+    return run_session
+
+def review_writer_flush(ctx):
+    """Scheduling and writing one batch of answers through ReviewWriter."""
+    db = ctx["db"]
+    card_ids = random_card_ids(ctx, RESULT_BATCH)
+    answers = [ctx["rng"].random() < 0.7 for _ in card_ids]
+
+    def write():
+        writer = ReviewWriter(db, flush_size=len(card_ids) + 1)
+        for flashcard_id, is_correct in zip(card_ids, answers):
+            writer.add(flashcard_id, is_correct)
+        writer.flush()
+    return write
+
+# Writes
+
+def add_study_results(ctx):
+    """Writing one batch of study results."""
+    timestamp = utc_now()
+    results = [(flashcard_id, ctx["rng"].random() < 0.7, timestamp) for flashcard_id in random_card_ids(ctx, RESULT_BATCH)]
+    return lambda: ctx["db"].add_study_results(results)
+
+def update_rollups(ctx):
+    """Folding one batch of new study results into the daily rollups."""
+    db = ctx["db"]
+    timestamp = utc_now()
+    db.add_study_results([(flashcard_id, True, timestamp) for flashcard_id in random_card_ids(ctx, RESULT_BATCH)])
+    return db.update_rollups
+
+def add_flashcards(ctx):
+    """Adding a batch of 100 flashcards, as an import does."""
+    category_id = ctx["category_ids"][0]
+    cards = [(f"Benchmark question {ctx['rng'].random()}", "Benchmark answer", category_id) for _ in range(100)]
+    return lambda: ctx["db"].add_flashcards(cards)
+
+def update_flashcard(ctx):
+    """Editing one flashcard."""
+    flashcard_id = random_card_ids(ctx, 1)[0]
+    return lambda: ctx["db"].update_flashcard(flashcard_id, "Edited question", "Edited answer", ctx["category_ids"][0])
+
+def delete_flashcard(ctx):
+    """Deleting one studied flashcard."""
+    flashcard_id = random_card_ids(ctx, 1)[0]
+    return lambda: ctx["db"].delete_flashcard(flashcard_id)
+
+def delete_category(ctx):
+    """Deleting a category as large as an average one, moving its cards to Default."""
+    db = ctx["db"]
+    category_id = db.add_category(f"Benchmark {ctx['rng'].random()}", "#808080")
+    size = max(1, ctx["card_count"] // len(ctx["category_ids"]))
+    db.add_flashcards([(f"Deleted category question {i}", "Answer", category_id) for i in range(size)])
+    return lambda: db.delete_category(category_id)
+
+# The scenarios by name, with whether they write to the database.
+SCENARIOS = {
+    "load_data": (load_data, False),
+    "get_flashcard_page_first": (get_flashcard_page_first, False),
+    "get_flashcard_page_middle": (get_flashcard_page_middle, False),
+    "search_flashcards": (search_flashcards, False),
+    "get_flashcard_statistics": (get_flashcard_statistics, False),
+    "count_statistics": (count_statistics, False),
+    "get_statistics_page_accuracy": (get_statistics_page_accuracy, False),
+    "get_statistics_page_category": (get_statistics_page_category, False),
+    "get_daily_activity": (get_daily_activity, False),
+    "get_study_streaks": (get_study_streaks, False),
+    "get_card_weights": (get_card_weights, False),
+    "study_deck_weighted": (study_deck_weighted, False),
+    "study_deck_seeded": (study_deck_seeded, False),
+    "study_deck_due": (study_deck_due, False),
+    "study_session": (study_session, True),
+    "review_writer_flush": (review_writer_flush, True),
+    "add_study_results": (add_study_results, True),
+    "update_rollups": (update_rollups, True),
+    "add_flashcards": (add_flashcards, True),
+    "update_flashcard": (update_flashcard, True),
+    "delete_flashcard": (delete_flashcard, True),
+    "delete_category": (delete_category, True),
+}
@@ -0,0 +1,249 @@
+"""
+suite.py
+
+This file runs the benchmark scenarios against a generated database, records the timings as
+JSON and compares them with an earlier run.
+
+Run from the project root, then again on another checkout and compare:
+    python -m benchmarks.suite run --cards 50000 --output before.json
+    python -m benchmarks.suite run --cards 50000 --output after.json --baseline before.json
+    python -m benchmarks.suite compare before.json after.json
+
+A scenario regresses when its median time grows by more than the threshold (20% by default)
+and by more than the noise floor in milliseconds. run and compare then exit with status 1.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from database_manager import DatabaseManager
+from benchmarks.generator import generate
+from benchmarks.scenarios import SCENARIOS, make_context
+
+def percentile(times, fraction):
+    """Return the value below which the given fraction of the sorted times fall."""
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def git_revision():
+    """Return the current git commit of the checkout, or None outside a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def template_database(cache_dir, args):
+    """
+    Return the path of the generated database for the requested size, generating it if needed.
+
+    Parameters:
+    - cache_dir (str): The directory the generated databases are kept in.
+    - args (argparse.Namespace): The size and seed options.
+
+    Returns:
+    - str: The path of the database file.
+    """
+    name = f"bench-{args.cards}-{args.categories}-{args.history}-{args.days}-{args.seed}.db"
+    path = os.path.join(cache_dir, name)
+    if not os.path.exists(path):
+        print(f"Generating {name}...", file=sys.stderr)
+        # Generate under a temporary name, so an interrupted run does not leave a partial file behind.
+        partial = f"{path}.partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate(partial, args.cards, args.categories, args.history, args.seed, args.days)
+        os.replace(partial, path)
+    return path
+
+def time_scenario(db_manager, prepare, rounds, warmup, seed):
+    """
+    Time one scenario.
+
+    Parameters:
+    - db_manager (DatabaseManager): The database to run it against.
+    - prepare (callable): The scenario function.
+    - rounds (int): The number of timed runs.
+    - warmup (int): The number of untimed runs before them.
+    - seed (int): The random seed of the scenario context.
+
+    Returns:
+    - list: The time of each timed run in milliseconds.
+    """
+    ctx = make_context(db_manager, seed)
+    times = []
+    for i in range(warmup + rounds):
+        call = prepare(ctx)
+        start = time.perf_counter()
+        call()
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            times.append(elapsed)
+    return times
+
+def run_scenarios(template, names, rounds, warmup, seed):
+    """
+    Run the named scenarios on copies of the template database.
+
+    Read-only scenarios share one copy; each writing scenario gets a fresh copy of its own.
+
+    Returns:
+    - dict: The timing summary of each scenario, by name.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        shared = None
+        try:
+            for name in names:
+                prepare, writes = SCENARIOS[name]
+                if writes:
+                    path = os.path.join(work_dir, f"{name}.db")
+                    shutil.copyfile(template, path)
+                    with DatabaseManager(path) as db_manager:
+                        times = time_scenario(db_manager, prepare, rounds, warmup, seed)
+                    os.remove(path)
+                else:
+                    if shared is None:
+                        path = os.path.join(work_dir, "shared.db")
+                        shutil.copyfile(template, path)
+                        shared = DatabaseManager(path)
+                    times = time_scenario(shared, prepare, rounds, warmup, seed)
+                results[name] = {
+                    "median_ms": round(statistics.median(times), 4),
+                    "min_ms": round(min(times), 4),
+                    "p95_ms": round(percentile(times, 0.95), 4),
+                    "max_ms": round(max(times), 4),
+                    "rounds": len(times),
+                }
+                print(f"{name:<30} {results[name]['median_ms']:>10.3f} {results[name]['p95_ms']:>10.3f}", file=sys.stderr)
+        finally:
+            if shared is not None:
+                shared.close()
+    return results
+
+def compare(baseline, current, threshold, noise_ms):
+    """
+    Compare two benchmark results and print one row per scenario they share.
+
+    Parameters:
+    - baseline (dict): The earlier result, as written by run.
+    - current (dict): The new result.
+    - threshold (float): The relative slowdown of the median that counts as a regression.
+    - noise_ms (float): Slowdowns of at most this many milliseconds are never regressions.
+
+    Returns:
+    - list: The names of the scenarios that regressed.
+    """
+    if baseline.get("dataset") != current.get("dataset"):
+        print(f"Warning: the datasets differ ({baseline.get('dataset')} vs {current.get('dataset')}).")
+    regressions = []
+    print(f"{'scenario':<30} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<30} {'-':>12} {result['median_ms']:>11.3f} {'new':>8}")
+            continue
+        old, new = before["median_ms"], result["median_ms"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old > noise_ms
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<30} {old:>12.3f} {new:>11.3f} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def report_regressions(regressions, threshold):
+    """Exit with status 1 if any scenario regressed."""
+    if regressions:
+        raise SystemExit(f"{len(regressions)} scenario(s) slowed down by more than {threshold:.0%}: {', '.join(regressions)}")
+
+def run(args):
+    """Run the suite, write the JSON result and compare it with the baseline if one is given."""
+    names = args.only or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="flashcards-bench-")
+    os.makedirs(cache_dir, exist_ok=True)
+    try:
+        template = template_database(cache_dir, args)
+        print(f"{'scenario':<30} {'median ms':>10} {'p95 ms':>10}", file=sys.stderr)
+        scenarios = run_scenarios(template, names, args.rounds, args.warmup, args.seed)
+    finally:
+        if not args.cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    result = {
+        "dataset": {"cards": args.cards, "categories": args.categories, "history": args.history,
+                    "days": args.days, "seed": args.seed},
+        "environment": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                        "platform": platform.platform(), "revision": git_revision()},
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report_regressions(compare(baseline, result, args.threshold, args.noise_ms), args.threshold)
+
+def compare_files(args):
+    """Compare two JSON results written by run."""
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    report_regressions(compare(baseline, current, args.threshold, args.noise_ms), args.threshold)
+
+def add_threshold_arguments(parser):
+    """Add the options that decide what counts as a regression."""
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="The relative slowdown of a median that counts as a regression.")
+    parser.add_argument("--noise-ms", type=float, default=0.5,
+                        help="Slowdowns of at most this many milliseconds are ignored.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the database and study session code.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the scenarios and record the timings as JSON.")
+    run_parser.add_argument("--cards", type=int, default=10000)
+    run_parser.add_argument("--categories", type=int, default=10)
+    run_parser.add_argument("--history", type=int, default=10, help="Average study results per card.")
+    run_parser.add_argument("--days", type=int, default=365, help="The number of days the study history covers.")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--rounds", type=int, default=15, help="Timed runs per scenario.")
+    run_parser.add_argument("--warmup", type=int, default=2, help="Untimed runs before the timed ones.")
+    run_parser.add_argument("--only", nargs="+", metavar="SCENARIO", help="Run only these scenarios.")
+    run_parser.add_argument("--output", help="The JSON file to write. Defaults to standard output.")
+    run_parser.add_argument("--baseline", help="A JSON result to check this run against.")
+    run_parser.add_argument("--cache-dir", help="Keep generated databases here and reuse them across runs.")
+    add_threshold_arguments(run_parser)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two recorded runs.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    add_threshold_arguments(compare_parser)
+    compare_parser.set_defaults(func=compare_files)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+theme_switch.py
+
+This file benchmarks applying a theme to a window full of widgets.
+
+It compares the legacy path, which switched the ttk theme and configured every style option
+with literal font tuples on each call, with ThemeStyles, which applies compiled style tables
+and pushes only the options that changed. Both are timed switching between themes and
+re-applying the active theme, as opening the settings screen used to.
+
+Needs a display. Run from the project root:
+    python -m benchmarks.theme_switch
+"""
+
+import argparse
+import statistics
+import time
+import tkinter as tk
+from tkinter import ttk
+from settings_manager import SettingsManager
+from ui.theme_styles import ThemeStyles, compile_theme
+
+def build_window(root, num_widgets):
+    """Fill the root window with a mix of themed widgets."""
+    frame = ttk.Frame(root)
+    frame.pack(fill=tk.BOTH, expand=True)
+    tree = ttk.Treeview(frame, columns=("question", "answer"), show="headings")
+    tree.pack(fill=tk.BOTH, expand=True)
+    for i in range(100):
+        tree.insert("", tk.END, values=(f"Question {i}", f"Answer {i}"))
+    for i in range(num_widgets):
+        widget_type = (ttk.Label, ttk.Button, ttk.Entry)[i % 3]
+        widget = widget_type(frame, text=f"Widget {i}") if widget_type is not ttk.Entry else widget_type(frame)
+        widget.pack()
+
+def legacy_apply(root, style, theme, scaling_factor):
+    """Apply a theme the way FlashcardApp.set_theme used to: every option, every call."""
+    table = compile_theme(theme, scaling_factor)
+    font_tuples = {name: (options["family"], options["size"], options["weight"]) for name, options in table["fonts"].items()}
+    style.theme_use("clam")
+    for style_name, options in table["configure"].items():
+        style.configure(style_name, **{option: font_tuples.get(value, value) if option == "font" else value
+                                       for option, value in options.items()})
+    for style_name, options in table["map"].items():
+        style.map(style_name, **options)
+    root.configure(bg=table["background"])
+    root.update_idletasks()
+    root.update()
+
+def compiled_apply(root, theme_styles, theme_name, theme, scaling_factor):
+    """Apply a theme through ThemeStyles and let Tk redraw."""
+    theme_styles.apply(theme_name, theme, scaling_factor)
+    root.update_idletasks()
+
+def time_switches(apply, theme_names, rounds):
+    """Return the time of each call of apply(theme_name) in milliseconds, cycling through theme_names."""
+    times = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        apply(theme_names[i % len(theme_names)])
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def run(num_widgets, rounds, scaling_factor):
+    """Run the benchmark and print the median and worst time per theme switch."""
+    settings_manager = SettingsManager()
+    themes = settings_manager.themes
+    theme_names = list(themes)
+    if len(theme_names) < 2:
+        raise SystemExit("themes.json needs at least two themes.")
+
+    root = tk.Tk()
+    try:
+        build_window(root, num_widgets)
+        style = ttk.Style()
+        root.update()
+        theme_styles = ThemeStyles(root, style)
+
+        scenarios = [
+            ("legacy, switch", lambda name: legacy_apply(root, style, themes[name], scaling_factor), theme_names),
+            ("legacy, same theme", lambda name: legacy_apply(root, style, themes[name], scaling_factor), theme_names[:1]),
+            ("compiled, switch", lambda name: compiled_apply(root, theme_styles, name, themes[name], scaling_factor), theme_names),
+            ("compiled, same theme", lambda name: compiled_apply(root, theme_styles, name, themes[name], scaling_factor), theme_names[:1]),
+        ]
+        print(f"{num_widgets} widgets, {len(theme_names)} themes, {rounds} applications per scenario")
+        print(f"{'scenario':<22} {'median ms':>10} {'max ms':>8}")
+        for label, apply, names in scenarios:
+            # Warm up: the first application of the compiled path compiles and creates the fonts.
+            apply(names[0])
+            times = time_switches(apply, names, rounds)
+            print(f"{label:<22} {statistics.median(times):>10.2f} {max(times):>8.2f}")
+    finally:
+        root.destroy()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark theme switching.")
+    parser.add_argument("--widgets", type=int, default=300, help="The number of widgets in the window.")
+    parser.add_argument("--rounds", type=int, default=40, help="Theme applications per scenario.")
+    parser.add_argument("--scale", type=float, default=1.0, help="The UI scaling factor.")
+    args = parser.parse_args()
+    run(args.widgets, args.rounds, args.scale)
+
+if __name__ == "__main__":
+    main()
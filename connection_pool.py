@@ -0,0 +1,150 @@
+"""
+connection_pool.py
+
+This file contains the ConnectionPool class, which shares one SQLite database file between threads
+through a single writer connection and a pool of reader connections.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from constants import DB_READERS, DB_BUSY_TIMEOUT_MS, DB_STATEMENT_CACHE_SIZE
+
+class ConnectionPool:
+    """
+    A pool of SQLite connections with one writer and several readers.
+
+    The database is switched to WAL journaling so readers never block the writer and the writer
+    never blocks readers. Writes are serialized through a lock on the writer connection; reads
+    check out a reader connection for the duration of the query. Every checkout gets its own
+    cursor, so any thread can use the pool.
+    """
+
+    def __init__(self, db_file, readers=DB_READERS, busy_timeout_ms=DB_BUSY_TIMEOUT_MS,
+                 cached_statements=DB_STATEMENT_CACHE_SIZE, synchronous="NORMAL", trace_callback=None):
+        """
+        Initialize the ConnectionPool and open its connections.
+
+        Parameters:
+        - db_file (str): The name of the database file.
+        - readers (int): The number of reader connections. In-memory databases always use 0,
+          in which case reads go through the writer connection.
+        - busy_timeout_ms (int): How long a connection waits for a lock before failing.
+        - cached_statements (int): The size of each connection's prepared statement cache.
+        - synchronous (str): The PRAGMA synchronous level of the writer connection.
+        - trace_callback (callable): Called with the SQL of every statement run on any connection.
+        """
+        self.db_file = db_file
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.trace_callback = trace_callback
+        self.writer_lock = threading.RLock()
+        self.local = threading.local()
+        self.readers = queue.Queue()
+        self.reader_connections = []
+        self.closed = False
+
+        self.writer_conn = self.open_connection()
+        self.writer_conn.execute(f'PRAGMA synchronous = {synchronous}')
+        if db_file == ":memory:":
+            readers = 0
+        else:
+            journal_mode = self.writer_conn.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+            if journal_mode.lower() != "wal":
+                logging.warning(f"Could not enable WAL journaling, using '{journal_mode}'.")
+
+        for _ in range(readers):
+            conn = self.open_connection()
+            conn.execute('PRAGMA query_only = ON')
+            self.reader_connections.append(conn)
+            self.readers.put(conn)
+
+    def open_connection(self):
+        """
+        Open a connection that can be handed between threads.
+
+        Returns:
+        - sqlite3.Connection: The new connection.
+        """
+        conn = sqlite3.connect(self.db_file, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False, cached_statements=self.cached_statements)
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        if self.trace_callback:
+            conn.set_trace_callback(self.trace_callback)
+        return conn
+
+    @contextmanager
+    def writer_connection(self):
+        """
+        Hold the writer lock and yield the raw writer connection. The caller manages transactions.
+
+        Yields:
+        - sqlite3.Connection: The writer connection.
+        """
+        with self.writer_lock:
+            yield self.writer_conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Run a write transaction. The transaction is committed when the outermost writer block on
+        the current thread exits, and rolled back if it raises.
+
+        Yields:
+        - sqlite3.Cursor: A cursor on the writer connection.
+        """
+        with self.writer_lock:
+            depth = getattr(self.local, "writer_depth", 0)
+            self.local.writer_depth = depth + 1
+            cursor = self.writer_conn.cursor()
+            try:
+                yield cursor
+                if depth == 0:
+                    self.writer_conn.commit()
+            except BaseException:
+                if depth == 0:
+                    self.writer_conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.local.writer_depth = depth
+
+    @contextmanager
+    def reader(self):
+        """
+        Check out a reader connection for the duration of a read.
+
+        Inside a writer block on the same thread, reads go through the writer connection so they
+        see the uncommitted changes of that transaction.
+
+        Yields:
+        - sqlite3.Cursor: A cursor on a reader connection.
+        """
+        if not self.reader_connections or getattr(self.local, "writer_depth", 0):
+            with self.writer_lock:
+                cursor = self.writer_conn.cursor()
+                try:
+                    yield cursor
+                finally:
+                    cursor.close()
+            return
+
+        conn = self.readers.get()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            self.readers.put(conn)
+
+    def close(self):
+        """Close every connection in the pool."""
+        if self.closed:
+            return
+        self.closed = True
+        with self.writer_lock:
+            self.writer_conn.close()
+        for conn in self.reader_connections:
+            conn.close()
@@ -17,6 +17,91 @@ RESOLUTIONS = ["800x600", "1024x768", "1280x720"]
 # Study Session Length (in minutes)
 DEFAULT_STUDY_SESSION_LENGTH = int(os.getenv("FLASHCARDS_DEFAULT_STUDY_SESSION_LENGTH", 20))
 
+# Card Weighting
+# Number of most recent study results used to weight a card, and the weight
+# given to cards that have never been studied. Weights are stored in card_stats,
+# so run `python maintenance.py --db <file> rebuild-stats` after changing these.
+CARD_WEIGHT_HISTORY = int(os.getenv("FLASHCARDS_CARD_WEIGHT_HISTORY", 10))
+MAX_CARD_WEIGHT = 5
+
+# Spaced Repetition (SM-2)
+# A correct answer counts as SM-2 quality SM2_CORRECT_QUALITY and an incorrect one as
+# SM2_INCORRECT_QUALITY on the 0-5 scale.
+SM2_INITIAL_EASE = 2.5
+SM2_MIN_EASE = 1.3
+SM2_MAX_INTERVAL_DAYS = int(os.getenv("FLASHCARDS_SM2_MAX_INTERVAL_DAYS", 3650))
+SM2_CORRECT_QUALITY = 4
+SM2_INCORRECT_QUALITY = 1
+
+# Study Session Prefetch
+# Number of upcoming cards a study session keeps loaded on its worker thread, and how often the
+# Tk thread checks for a card the worker has not delivered yet.
+STUDY_PREFETCH_COUNT = int(os.getenv("FLASHCARDS_STUDY_PREFETCH_COUNT", 5))
+STUDY_POLL_INTERVAL_MS = int(os.getenv("FLASHCARDS_STUDY_POLL_INTERVAL_MS", 15))
+
+# Study Result Logging
+# Study results are buffered and written in one transaction when REVIEW_FLUSH_SIZE results
+# are pending or the oldest pending result is REVIEW_FLUSH_INTERVAL_MS old, so a crash loses
+# at most one flush window. DURABILITY sets how hard SQLite syncs each committed write.
+REVIEW_FLUSH_SIZE = int(os.getenv("FLASHCARDS_REVIEW_FLUSH_SIZE", 20))
+REVIEW_FLUSH_INTERVAL_MS = int(os.getenv("FLASHCARDS_REVIEW_FLUSH_INTERVAL_MS", 5000))
+DURABILITY = os.getenv("FLASHCARDS_DURABILITY", "normal")
+DURABILITY_LEVELS = {"full": "FULL", "normal": "NORMAL", "off": "OFF"}
+
+# Database Connections
+DB_READERS = int(os.getenv("FLASHCARDS_DB_READERS", 4))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("FLASHCARDS_DB_BUSY_TIMEOUT_MS", 5000))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("FLASHCARDS_DB_STATEMENT_CACHE_SIZE", 256))
+# How often the Tk thread collects the results of database calls run in the background.
+DB_EXECUTOR_POLL_MS = int(os.getenv("FLASHCARDS_DB_EXECUTOR_POLL_MS", 16))
+
+# Bulk Import
+IMPORT_CHUNK_SIZE = int(os.getenv("FLASHCARDS_IMPORT_CHUNK_SIZE", 5000))
+
+# Export
+EXPORT_CHUNK_SIZE = int(os.getenv("FLASHCARDS_EXPORT_CHUNK_SIZE", 1000))
+
+# Search
+SEARCH_RESULT_LIMIT = int(os.getenv("FLASHCARDS_SEARCH_RESULT_LIMIT", 500))
+SEARCH_DEBOUNCE_MS = int(os.getenv("FLASHCARDS_SEARCH_DEBOUNCE_MS", 250))
+SEARCH_HIGHLIGHT = ("[", "]")
+
+# Flashcard List
+VIRTUAL_LIST_MARGIN = int(os.getenv("FLASHCARDS_VIRTUAL_LIST_MARGIN", 50))
+
+# Progress
+# The number of cards the "Weakest First" button of the progress screen shows.
+WEAKEST_CARDS_LIMIT = int(os.getenv("FLASHCARDS_WEAKEST_CARDS_LIMIT", 50))
+
+# Study History Retention
+# Study results older than this are folded into per-card archive totals by
+# `python maintenance.py archive-history`. The last CARD_WEIGHT_HISTORY results of each card
+# are always kept, since card weights are computed from them.
+HISTORY_RETENTION_DAYS = int(os.getenv("FLASHCARDS_HISTORY_RETENTION_DAYS", 365))
+
+# Settings
+# How long setting changes are held so a burst of them is written to settings.json once.
+SETTINGS_SAVE_DELAY_MS = int(os.getenv("FLASHCARDS_SETTINGS_SAVE_DELAY_MS", 500))
+
+# Screens
+# The number of built screens kept alive for navigation; older ones are rebuilt on the next visit.
+SCREEN_CACHE_SIZE = int(os.getenv("FLASHCARDS_SCREEN_CACHE_SIZE", 5))
+
+# Startup
+# The cold import time of the application allowed by benchmarks/import_time.py.
+STARTUP_IMPORT_BUDGET_MS = int(os.getenv("FLASHCARDS_STARTUP_IMPORT_BUDGET_MS", 150))
+
+# Query Instrumentation
+# DatabaseManager calls are timed per method unless FLASHCARDS_QUERY_STATS is 0. Calls slower
+# than SLOW_QUERY_MS are written with the query plans of their statements to SLOW_QUERY_LOG
+# (not written if empty), and the last SLOW_QUERY_KEEP are shown on the diagnostics screen,
+# which updates its numbers every DIAGNOSTICS_REFRESH_MS.
+QUERY_STATS_ENABLED = os.getenv("FLASHCARDS_QUERY_STATS", "1") != "0"
+SLOW_QUERY_MS = float(os.getenv("FLASHCARDS_SLOW_QUERY_MS", 100))
+SLOW_QUERY_LOG = os.getenv("FLASHCARDS_SLOW_QUERY_LOG", "slow_queries.log")
+SLOW_QUERY_KEEP = int(os.getenv("FLASHCARDS_SLOW_QUERY_KEEP", 50))
+DIAGNOSTICS_REFRESH_MS = int(os.getenv("FLASHCARDS_DIAGNOSTICS_REFRESH_MS", 1000))
+
 # Default Colors
 DEFAULT_COLORS = {
     "bg": "#F5F5F5",      # Background color
@@ -30,8 +115,13 @@ def validate_resolution(resolution):
     if resolution not in RESOLUTIONS:
         raise ValueError(f"Resolution {resolution} is not supported. Choose from {RESOLUTIONS}.")
 
+def validate_durability(durability):
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Durability {durability} is not supported. Choose from {list(DURABILITY_LEVELS)}.")
+
 # Validate the default resolution
 validate_resolution(DEFAULT_RESOLUTION)
+validate_durability(DURABILITY)
 
 # If needed, you can also validate other constants here
 # Example:
@@ -5,24 +5,73 @@ This file contains the DatabaseManager class for managing the flashcards applica
 """
 
 import sqlite3
+import datetime
 import os
+import re
 import logging
+from constants import (CARD_WEIGHT_HISTORY, MAX_CARD_WEIGHT, DURABILITY, DURABILITY_LEVELS, DB_READERS, EXPORT_CHUNK_SIZE,
+                       SEARCH_RESULT_LIMIT, SEARCH_HIGHLIGHT, HISTORY_RETENTION_DAYS, QUERY_STATS_ENABLED)
+from connection_pool import ConnectionPool
+from query_stats import QueryStats, instrumented
+import migrations
 
+# Columns the flashcard list can be sorted by: the SQL expression each one sorts on and the
+# join order that lets the sort walk an index (the primary key, idx_flashcards_question, or the
+# category name index then idx_flashcards_category).
+FLASHCARD_SORT_COLUMNS = {
+    "id": ("f.id", "flashcards f JOIN categories c ON f.category_id = c.id"),
+    "question": ("f.question", "flashcards f JOIN categories c ON f.category_id = c.id"),
+    "category": ("c.name", "categories c CROSS JOIN flashcards f ON f.category_id = c.id"),
+}
+
+# The success rate of a card. It must match the expression of idx_card_stats_accuracy.
+ACCURACY_SQL = "CAST(cs.correct AS REAL) / cs.total"
+
+# Sortable statistics columns: the sort expression, the card ID tie-breaker and the join order
+# that lets the sort walk an index (idx_card_stats_accuracy, idx_card_stats_total,
+# idx_flashcards_question, or the category name index then idx_flashcards_category).
+STATISTICS_SORT_COLUMNS = {
+    "accuracy": (ACCURACY_SQL, "cs.flashcard_id",
+                 "card_stats cs JOIN flashcards f ON f.id = cs.flashcard_id JOIN categories c ON c.id = f.category_id"),
+    "total": ("cs.total", "cs.flashcard_id",
+              "card_stats cs JOIN flashcards f ON f.id = cs.flashcard_id JOIN categories c ON c.id = f.category_id"),
+    "question": ("f.question", "f.id",
+                 "flashcards f CROSS JOIN card_stats cs ON cs.flashcard_id = f.id JOIN categories c ON c.id = f.category_id"),
+    "category": ("c.name", "f.id",
+                 "categories c CROSS JOIN flashcards f ON f.category_id = c.id CROSS JOIN card_stats cs ON cs.flashcard_id = f.id"),
+}
+
+# Public methods that are not timed by query_stats: they run no queries of their own.
+NOT_INSTRUMENTED = ("connect", "close", "add_change_listener", "notify_change", "statistics_filter",
+                    "explain_query_plan", "file_size")
+
+@instrumented(exclude=NOT_INSTRUMENTED)
 class DatabaseManager:
     """
     A class to manage the SQLite database for the flashcards application.
+
+    All queries go through a ConnectionPool, so the methods can be called from any thread.
+    Unless FLASHCARDS_QUERY_STATS is 0, every method call is timed in query_stats.
     """
 
-    def __init__(self, db_file="flashcards.db"):
+    def __init__(self, db_file="flashcards.db", durability=DURABILITY, readers=DB_READERS,
+                 query_stats=QUERY_STATS_ENABLED):
         """
         Initialize the DatabaseManager with the specified database file.
         
         Parameters:
         - db_file (str): The name of the database file.
+        - durability (str): How hard SQLite syncs committed writes ("full", "normal" or "off").
+        - readers (int): The number of reader connections in the pool.
+        - query_stats (bool): Whether to record the latency of every method call.
         """
         self.db_file = db_file
-        self.conn = None
-        self.cursor = None
+        self.durability = durability
+        self.readers = readers
+        self.pool = None
+        self.search_available = False
+        self.change_listeners = []
+        self.query_stats = QueryStats(explain=self.explain_query_plan) if query_stats else None
         self.connect()
 
     def __enter__(self):
@@ -34,60 +83,63 @@ class DatabaseManager:
     def connect(self):
         """Connect to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(self.db_file)
-            self.cursor = self.conn.cursor()
+            self.pool = ConnectionPool(self.db_file, readers=self.readers,
+                                       synchronous=DURABILITY_LEVELS[self.durability],
+                                       trace_callback=self.query_stats.trace if self.query_stats else None)
             self.create_tables()
         except sqlite3.Error as e:
             logging.error(f"Error connecting to database: {e}")
             raise
 
     def close(self):
-        """Close the SQLite database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close the SQLite database connections."""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+    def add_change_listener(self, listener):
+        """
+        Register a function to call after a write commits.
+
+        Listeners are called on the thread that made the write, with the frozenset of data
+        topics it changed: "cards" (flashcards and how they are listed), "categories" and
+        "history" (study results and statistics).
+
+        Parameters:
+        - listener (callable): A function (topics) that must be safe to call from any thread.
+        """
+        self.change_listeners.append(listener)
+
+    def notify_change(self, *topics):
+        """
+        Tell the change listeners that a write changed the given topics.
+
+        Parameters:
+        - topics (str): The data topics that changed.
+        """
+        changed = frozenset(topics)
+        for listener in list(self.change_listeners):
+            try:
+                listener(changed)
+            except Exception as e:
+                logging.error(f"Change listener failed: {e}")
 
     def create_tables(self):
-        """Create the necessary tables if they do not exist."""
-        try:
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    color TEXT NOT NULL
-                )
-            ''')
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS flashcards (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    question TEXT NOT NULL,
-                    answer TEXT NOT NULL,
-                    category_id INTEGER,
-                    FOREIGN KEY (category_id) REFERENCES categories (id)
-                )
-            ''')
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS study_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    flashcard_id INTEGER,
-                    is_correct BOOLEAN,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (flashcard_id) REFERENCES flashcards (id)
-                )
-            ''')
-            self.conn.commit()
-        except sqlite3.Error as e:
-            logging.error(f"Error creating tables: {e}")
-            raise
+        """Create the necessary tables and indexes, upgrading an existing database in place."""
+        with self.pool.writer_connection() as conn:
+            migrations.migrate(conn)
+            self.search_available = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'flashcards_fts'").fetchone() is not None
 
     def initialize_default_category(self):
         """Initialize the default category if it does not exist."""
         try:
-            self.cursor.execute('SELECT * FROM categories WHERE name = "Default"')
-            default_category = self.cursor.fetchone()
-            if not default_category:
-                self.cursor.execute('INSERT INTO categories (name, color) VALUES (?, ?)', ("Default", "#808080"))
-                self.conn.commit()
-                logging.info("Default category initialized.")
+            with self.pool.writer() as cursor:
+                cursor.execute('SELECT * FROM categories WHERE name = "Default"')
+                default_category = cursor.fetchone()
+                if not default_category:
+                    cursor.execute('INSERT INTO categories (name, color) VALUES (?, ?)', ("Default", "#808080"))
+                    logging.info("Default category initialized.")
         except sqlite3.Error as e:
             logging.error(f"Error initializing default category: {e}")
             raise
@@ -95,12 +147,13 @@ class DatabaseManager:
     def get_default_category(self):
         """Get the default category details."""
         try:
-            self.cursor.execute('SELECT id, name, color FROM categories WHERE name = "Default"')
-            default_category = self.cursor.fetchone()
-            if default_category:
-                return {"id": default_category[0], "name": default_category[1], "color": default_category[2]}
-            else:
-                return None
+            with self.pool.reader() as cursor:
+                cursor.execute('SELECT id, name, color FROM categories WHERE name = "Default"')
+                default_category = cursor.fetchone()
+                if default_category:
+                    return {"id": default_category[0], "name": default_category[1], "color": default_category[2]}
+                else:
+                    return None
         except sqlite3.Error as e:
             logging.error(f"Error getting default category: {e}")
             raise
@@ -118,29 +171,132 @@ class DatabaseManager:
         - int: The ID of the newly added flashcard.
         """
         try:
-            self.cursor.execute('''
-                INSERT INTO flashcards (question, answer, category_id)
-                VALUES (?, ?, ?)
-            ''', (question, answer, category_id))
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self.pool.writer() as cursor:
+                cursor.execute('''
+                    INSERT INTO flashcards (question, answer, category_id)
+                    VALUES (?, ?, ?)
+                ''', (question, answer, category_id))
+                new_id = cursor.lastrowid
+            self.notify_change("cards")
+            return new_id
         except sqlite3.Error as e:
             logging.error(f"Error adding flashcard: {e}")
             raise
 
+    def add_flashcards(self, flashcards):
+        """
+        Add a batch of flashcards to the database in a single transaction.
+
+        Parameters:
+        - flashcards (list): A list of (question, answer, category_id) tuples.
+
+        Returns:
+        - int: The number of flashcards added.
+        """
+        try:
+            with self.pool.writer() as cursor:
+                cursor.executemany('''
+                    INSERT INTO flashcards (question, answer, category_id)
+                    VALUES (?, ?, ?)
+                ''', flashcards)
+                added = cursor.rowcount
+            self.notify_change("cards")
+            return added
+        except sqlite3.Error as e:
+            logging.error(f"Error adding flashcards: {e}")
+            raise
+
     def get_all_flashcards(self):
         """Retrieve all flashcards from the database."""
         try:
-            self.cursor.execute('''
-                SELECT f.id, f.question, f.answer, c.name
-                FROM flashcards f
-                JOIN categories c ON f.category_id = c.id
-            ''')
-            return self.cursor.fetchall()
+            with self.pool.reader() as cursor:
+                cursor.execute('''
+                    SELECT f.id, f.question, f.answer, c.name
+                    FROM flashcards f
+                    JOIN categories c ON f.category_id = c.id
+                ''')
+                return cursor.fetchall()
         except sqlite3.Error as e:
             logging.error(f"Error retrieving flashcards: {e}")
             raise
 
+    def count_flashcards(self):
+        """
+        Count the flashcards shown in the flashcard list.
+
+        Returns:
+        - int: The number of flashcards with a category.
+        """
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute('''
+                    SELECT COUNT(*)
+                    FROM flashcards f
+                    JOIN categories c ON f.category_id = c.id
+                ''')
+                return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            logging.error(f"Error counting flashcards: {e}")
+            raise
+
+    def get_flashcard_page(self, sort_column="id", descending=False, after=None, before=None, offset=0, limit=100):
+        """
+        Retrieve one page of flashcards in sorted order using keyset pagination.
+
+        Pages are addressed by the sort key (sort value, id) of the row just before the page
+        (after) or just after it (before), so each page costs the same wherever it is in the list.
+        offset is only meant for jumps: its cost grows with the number of rows skipped.
+
+        Parameters:
+        - sort_column (str): A key of FLASHCARD_SORT_COLUMNS.
+        - descending (bool): Whether to sort in descending order.
+        - after (tuple): Return the rows that follow this (sort value, id) key.
+        - before (tuple): Return the rows that precede this (sort value, id) key.
+        - offset (int): The number of rows to skip after the after key, before the before key,
+          or from the start.
+        - limit (int): The maximum number of rows.
+
+        Returns:
+        - list: (id, question, answer, category name) tuples in sorted order.
+        """
+        expression, joins = FLASHCARD_SORT_COLUMNS[sort_column]
+        # Walking backwards from a key is a forward walk in the opposite direction, reversed afterwards.
+        reverse = before is not None
+        ascending = descending == reverse
+        direction = "ASC" if ascending else "DESC"
+        comparison = ">" if ascending else "<"
+        key = before if reverse else after
+
+        def page(where, params, limit, offset):
+            cursor.execute(f'''
+                SELECT f.id, f.question, f.answer, c.name
+                FROM {joins}
+                {where}
+                ORDER BY {expression} {direction}, f.id {direction}
+                LIMIT ? OFFSET ?
+            ''', (*params, limit, offset))
+            return cursor.fetchall()
+
+        try:
+            with self.pool.reader() as cursor:
+                if key is None:
+                    rows = page("", (), limit, offset)
+                elif sort_column == "category":
+                    # A row value comparison on the category name walks the key's category from
+                    # its start, so finish that category by card ID on idx_flashcards_category,
+                    # then go on to the following categories.
+                    same_category = page(f"WHERE c.name = ? AND f.id {comparison} ?", key, offset + limit, 0)
+                    rows = same_category[offset:]
+                    if len(rows) < limit:
+                        rows += page(f"WHERE c.name {comparison} ?", key[:1], limit - len(rows),
+                                     max(0, offset - len(same_category)))
+                else:
+                    rows = page(f"WHERE ({expression}, f.id) {comparison} (?, ?)", key, limit, offset)
+                return rows[::-1] if reverse else rows
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving flashcard page: {e}")
+            raise
+
     def update_flashcard(self, id, question, answer, category_id):
         """
         Update an existing flashcard in the database.
@@ -155,12 +311,13 @@ class DatabaseManager:
         - bool: True if the flashcard was updated successfully, False otherwise.
         """
         try:
-            self.cursor.execute('''
-                UPDATE flashcards
-                SET question = ?, answer = ?, category_id = ?
-                WHERE id = ?
-            ''', (question, answer, category_id, id))
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute('''
+                    UPDATE flashcards
+                    SET question = ?, answer = ?, category_id = ?
+                    WHERE id = ?
+                ''', (question, answer, category_id, id))
+            self.notify_change("cards")
             return True
         except sqlite3.Error as e:
             logging.error(f"Error updating flashcard: {e}")
@@ -177,8 +334,9 @@ class DatabaseManager:
         - bool: True if the flashcard was deleted successfully, False otherwise.
         """
         try:
-            self.cursor.execute('DELETE FROM flashcards WHERE id = ?', (id,))
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute('DELETE FROM flashcards WHERE id = ?', (id,))
+            self.notify_change("cards", "history")
             return True
         except sqlite3.Error as e:
             logging.error(f"Error deleting flashcard: {e}")
@@ -196,16 +354,45 @@ class DatabaseManager:
         - bool: True if the study result was added successfully, False otherwise.
         """
         try:
-            self.cursor.execute('''
-                INSERT INTO study_history (flashcard_id, is_correct)
-                VALUES (?, ?)
-            ''', (flashcard_id, is_correct))
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute('''
+                    INSERT INTO study_history (flashcard_id, is_correct)
+                    VALUES (?, ?)
+                ''', (flashcard_id, is_correct))
+            self.notify_change("history")
             return True
         except sqlite3.Error as e:
             logging.error(f"Error adding study result: {e}")
             return False
 
+    def add_study_results(self, results, schedules=()):
+        """
+        Add a batch of study results to the database in a single transaction.
+
+        Parameters:
+        - results (list): A list of (flashcard_id, is_correct, timestamp) tuples.
+        - schedules (list): (flashcard_id, schedule) pairs to store with the results, where
+          schedule is a dict as returned by get_card_schedule.
+
+        Returns:
+        - bool: True if the study results were added successfully, False otherwise.
+        """
+        try:
+            with self.pool.writer() as cursor:
+                cursor.executemany('''
+                    INSERT INTO study_history (flashcard_id, is_correct, timestamp)
+                    VALUES (?, ?, ?)
+                ''', results)
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO card_schedule (flashcard_id, interval_days, ease, repetitions, due)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(flashcard_id, s["interval"], s["ease"], s["repetitions"], s["due"]) for flashcard_id, s in schedules])
+            self.notify_change("history")
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Error adding study results: {e}")
+            return False
+
     def get_study_history(self, flashcard_id):
         """
         Retrieve the study history for a flashcard.
@@ -217,22 +404,294 @@ class DatabaseManager:
         - list: A list of study results.
         """
         try:
-            self.cursor.execute('''
-                SELECT is_correct FROM study_history
-                WHERE flashcard_id = ?
-                ORDER BY timestamp DESC
-                LIMIT 10
-            ''', (flashcard_id,))
-            return self.cursor.fetchall()
+            with self.pool.reader() as cursor:
+                cursor.execute('''
+                    SELECT is_correct FROM study_history
+                    WHERE flashcard_id = ?
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                ''', (flashcard_id, CARD_WEIGHT_HISTORY))
+                return cursor.fetchall()
         except sqlite3.Error as e:
             logging.error(f"Error retrieving study history: {e}")
             raise
 
+    def get_card_weights(self, category_ids):
+        """
+        Calculate the study weight of every flashcard in the given categories in a single query.
+
+        The weight is based on the most recent CARD_WEIGHT_HISTORY results of each card:
+        cards that have never been studied get MAX_CARD_WEIGHT, the others get
+        max(1, int(MAX_CARD_WEIGHT * (1 - correct_ratio))). It is kept in card_stats by triggers.
+
+        Parameters:
+        - category_ids (list): A list of category IDs.
+
+        Returns:
+        - dict: A mapping of flashcard ID to weight.
+        """
+        if not category_ids:
+            return {}
+        try:
+            with self.pool.reader() as cursor:
+                placeholders = ','.join(['?' for _ in category_ids])
+                query = f'''
+                    SELECT f.id, COALESCE(cs.weight, ?)
+                    FROM flashcards f
+                    LEFT JOIN card_stats cs ON cs.flashcard_id = f.id
+                    WHERE f.category_id IN ({placeholders})
+                '''
+                cursor.execute(query, [MAX_CARD_WEIGHT, *category_ids])
+                return dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            logging.error(f"Error calculating card weights: {e}")
+            raise
+
+    def select_study_deck(self, category_ids, length):
+        """
+        Draw the IDs of a study deck in SQL, without reading any flashcard text.
+
+        Cards are drawn without replacement with probability proportional to their weight.
+        The draw first tries rejection sampling: random IDs are probed through the primary key
+        and a card is accepted with probability weight / MAX_CARD_WEIGHT, so its cost depends on
+        the session length, not on the library size. When the chosen categories hold too few of
+        the cards for that to finish quickly, the candidates are few and are scanned instead.
+
+        Parameters:
+        - category_ids (list): A list of category IDs.
+        - length (int): The number of cards to draw.
+
+        Returns:
+        - list: The drawn flashcard IDs in study order.
+        """
+        if not category_ids or length <= 0:
+            return []
+        try:
+            with self.pool.reader() as cursor:
+                max_id = cursor.execute('SELECT MAX(id) FROM flashcards').fetchone()[0]
+                if max_id is None:
+                    return []
+                drawn = {}
+                for trials in (16 * length, 128 * length, 1024 * length):
+                    for flashcard_id in self.probe_study_deck(cursor, category_ids, max_id, trials):
+                        drawn.setdefault(flashcard_id, None)
+                        if len(drawn) == length:
+                            return list(drawn)
+                return self.scan_study_deck(cursor, category_ids, length)
+        except sqlite3.Error as e:
+            logging.error(f"Error selecting study deck: {e}")
+            raise
+
+    def probe_study_deck(self, cursor, category_ids, max_id, trials):
+        """
+        Run rejection sampling trials for select_study_deck.
+
+        Each trial picks a uniformly random ID up to max_id and is accepted if it is a card in one of
+        the categories and a random draw below its weight succeeds. The accepted trials, in order,
+        are a sequence of independent weighted draws, so keeping the first occurrence of each card
+        gives a weighted sample without replacement.
+
+        Returns:
+        - list: The accepted flashcard IDs in trial order, possibly with repeats.
+        """
+        placeholders = ','.join(['?' for _ in category_ids])
+        cursor.execute(f'''
+            WITH RECURSIVE trials (n, id) AS (
+                SELECT 1, (random() & 9223372036854775807) % ? + 1
+                UNION ALL
+                SELECT n + 1, (random() & 9223372036854775807) % ? + 1 FROM trials WHERE n < ?
+            )
+            SELECT t.id
+            FROM trials t
+            JOIN flashcards f ON f.id = t.id
+            LEFT JOIN card_stats cs ON cs.flashcard_id = f.id
+            WHERE f.category_id IN ({placeholders})
+              AND (random() & 9223372036854775807) % ? < COALESCE(cs.weight, ?)
+            ORDER BY t.n
+        ''', [max_id, max_id, trials, *category_ids, MAX_CARD_WEIGHT, MAX_CARD_WEIGHT])
+        return [row[0] for row in cursor.fetchall()]
+
+    def scan_study_deck(self, cursor, category_ids, length):
+        """
+        Draw a study deck by scanning every card in the categories, for select_study_deck.
+
+        A card of integer weight w gets the largest of w random numbers as its key, which has the
+        same distribution as u ** (1 / w), and the cards with the largest keys win (Efraimidis and Spirakis).
+
+        Returns:
+        - list: The drawn flashcard IDs in study order.
+        """
+        random_value = '(random() & 9223372036854775807)'
+        key = 'CASE COALESCE(cs.weight, {0}) WHEN 1 THEN {1} {2} ELSE MAX({3}) END'.format(
+            MAX_CARD_WEIGHT,
+            random_value,
+            ' '.join(f"WHEN {weight} THEN MAX({', '.join([random_value] * weight)})" for weight in range(2, MAX_CARD_WEIGHT)),
+            ', '.join([random_value] * max(2, MAX_CARD_WEIGHT)))
+        placeholders = ','.join(['?' for _ in category_ids])
+        cursor.execute(f'''
+            SELECT f.id
+            FROM flashcards f
+            LEFT JOIN card_stats cs ON cs.flashcard_id = f.id
+            WHERE f.category_id IN ({placeholders})
+            ORDER BY {key} DESC
+            LIMIT ?
+        ''', [*category_ids, length])
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_flashcards_by_ids(self, flashcard_ids):
+        """
+        Retrieve flashcards by their IDs, in the order of the IDs.
+
+        Parameters:
+        - flashcard_ids (list): A list of flashcard IDs.
+
+        Returns:
+        - list: (id, question, answer, category name, category color) tuples, like get_flashcards_by_categories.
+        """
+        if not flashcard_ids:
+            return []
+        try:
+            with self.pool.reader() as cursor:
+                placeholders = ','.join(['?' for _ in flashcard_ids])
+                query = f'''
+                    SELECT f.id, f.question, f.answer, c.name, c.color
+                    FROM flashcards f
+                    JOIN categories c ON f.category_id = c.id
+                    WHERE f.id IN ({placeholders})
+                '''
+                cursor.execute(query, flashcard_ids)
+                cards = {row[0]: row for row in cursor.fetchall()}
+                return [cards[flashcard_id] for flashcard_id in flashcard_ids if flashcard_id in cards]
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving flashcards by IDs: {e}")
+            raise
+
+    def get_card_schedule(self, flashcard_id):
+        """
+        Retrieve the spaced repetition schedule of a flashcard.
+
+        Parameters:
+        - flashcard_id (int): The ID of the flashcard.
+
+        Returns:
+        - dict: The schedule with "interval", "ease", "repetitions" and "due", or None if the card
+          has never been reviewed.
+        """
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute('''
+                    SELECT interval_days, ease, repetitions, due FROM card_schedule
+                    WHERE flashcard_id = ?
+                ''', (flashcard_id,))
+                row = cursor.fetchone()
+                return dict(zip(["interval", "ease", "repetitions", "due"], row)) if row else None
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving card schedule: {e}")
+            raise
+
+    def get_due_flashcards(self, category_ids, limit, now):
+        """
+        Retrieve the IDs of the flashcards that are due for review.
+
+        Reviewed cards whose due time has passed come first, most overdue first, read in order from
+        the due time index. Cards that have never been reviewed fill the rest, oldest first.
+
+        Parameters:
+        - category_ids (list): A list of category IDs.
+        - limit (int): The maximum number of IDs.
+        - now (str): The current UTC time, as "%Y-%m-%d %H:%M:%S".
+
+        Returns:
+        - list: The due flashcard IDs in study order.
+        """
+        if not category_ids or limit <= 0:
+            return []
+        try:
+            with self.pool.reader() as cursor:
+                placeholders = ','.join(['?' for _ in category_ids])
+                # CROSS JOIN keeps card_schedule as the outer loop, so the due time index is read in
+                # order and the scan stops at the limit instead of sorting every card in the categories.
+                cursor.execute(f'''
+                    SELECT s.flashcard_id
+                    FROM card_schedule s
+                    CROSS JOIN flashcards f ON f.id = s.flashcard_id
+                    WHERE s.due <= ? AND f.category_id IN ({placeholders})
+                    ORDER BY s.due
+                    LIMIT ?
+                ''', [now, *category_ids, limit])
+                due_ids = [row[0] for row in cursor.fetchall()]
+                if len(due_ids) < limit:
+                    # The unary + keeps the category index out, so new cards are read in ID order.
+                    cursor.execute(f'''
+                        SELECT f.id
+                        FROM flashcards f
+                        WHERE +f.category_id IN ({placeholders})
+                          AND NOT EXISTS (SELECT 1 FROM card_schedule s WHERE s.flashcard_id = f.id)
+                        ORDER BY f.id
+                        LIMIT ?
+                    ''', [*category_ids, limit - len(due_ids)])
+                    due_ids.extend(row[0] for row in cursor.fetchall())
+                return due_ids
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving due flashcards: {e}")
+            raise
+
+    def search_flashcards(self, query, limit=SEARCH_RESULT_LIMIT):
+        """
+        Search flashcard questions and answers, best matches first.
+
+        Every word of the query must match, and each word also matches as a prefix, so the
+        results follow the user's typing. Matches are marked with SEARCH_HIGHLIGHT in the snippets.
+
+        Parameters:
+        - query (str): The text to search for.
+        - limit (int): The maximum number of results.
+
+        Returns:
+        - list: A list of dictionaries with the flashcard "id", "question", "answer", "category",
+          and the highlighted "question_snippet" and "answer_snippet".
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        columns = ["id", "question", "answer", "category", "question_snippet", "answer_snippet"]
+        try:
+            with self.pool.reader() as cursor:
+                if self.search_available:
+                    match = " ".join(f'"{term}"*' for term in terms)
+                    start, end = SEARCH_HIGHLIGHT
+                    cursor.execute('''
+                        SELECT f.id, f.question, f.answer, c.name,
+                               highlight(flashcards_fts, 0, ?, ?),
+                               snippet(flashcards_fts, 1, ?, ?, '…', 16)
+                        FROM flashcards_fts
+                        JOIN flashcards f ON f.id = flashcards_fts.rowid
+                        LEFT JOIN categories c ON f.category_id = c.id
+                        WHERE flashcards_fts MATCH ?
+                        ORDER BY bm25(flashcards_fts)
+                        LIMIT ?
+                    ''', (start, end, start, end, match, limit))
+                else:
+                    conditions = " AND ".join("(f.question LIKE ? OR f.answer LIKE ?)" for _ in terms)
+                    params = [value for term in terms for value in (f"%{term}%", f"%{term}%")]
+                    cursor.execute(f'''
+                        SELECT f.id, f.question, f.answer, c.name, f.question, f.answer
+                        FROM flashcards f
+                        LEFT JOIN categories c ON f.category_id = c.id
+                        WHERE {conditions}
+                        LIMIT ?
+                    ''', (*params, limit))
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logging.error(f"Error searching flashcards: {e}")
+            raise
+
     def get_all_categories(self):
         """Retrieve all categories from the database."""
         try:
-            self.cursor.execute('SELECT id, name, color FROM categories')
-            return [{"id": row[0], "name": row[1], "color": row[2]} for row in self.cursor.fetchall()]
+            with self.pool.reader() as cursor:
+                cursor.execute('SELECT id, name, color FROM categories')
+                return [{"id": row[0], "name": row[1], "color": row[2]} for row in cursor.fetchall()]
         except sqlite3.Error as e:
             logging.error(f"Error retrieving categories: {e}")
             raise
@@ -249,9 +708,11 @@ class DatabaseManager:
         - int: The ID of the newly added category.
         """
         try:
-            self.cursor.execute('INSERT INTO categories (name, color) VALUES (?, ?)', (name, color))
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self.pool.writer() as cursor:
+                cursor.execute('INSERT INTO categories (name, color) VALUES (?, ?)', (name, color))
+                new_id = cursor.lastrowid
+            self.notify_change("categories")
+            return new_id
         except sqlite3.Error as e:
             logging.error(f"Error adding category: {e}")
             raise
@@ -267,9 +728,10 @@ class DatabaseManager:
         - int: The ID of the category.
         """
         try:
-            self.cursor.execute('SELECT id FROM categories WHERE name = ?', (category_name,))
-            result = self.cursor.fetchone()
-            return result[0] if result else None
+            with self.pool.reader() as cursor:
+                cursor.execute('SELECT id FROM categories WHERE name = ?', (category_name,))
+                result = cursor.fetchone()
+                return result[0] if result else None
         except sqlite3.Error as e:
             logging.error(f"Error getting category ID: {e}")
             raise
@@ -287,8 +749,10 @@ class DatabaseManager:
         - bool: True if the category was updated successfully, False otherwise.
         """
         try:
-            self.cursor.execute('UPDATE categories SET name = ?, color = ? WHERE id = ?', (name, color, id))
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute('UPDATE categories SET name = ?, color = ? WHERE id = ?', (name, color, id))
+            # Card lists show the category of each card.
+            self.notify_change("categories", "cards")
             return True
         except sqlite3.Error as e:
             logging.error(f"Error updating category: {e}")
@@ -305,12 +769,13 @@ class DatabaseManager:
         - bool: True if the category was deleted successfully, False otherwise.
         """
         try:
-            default_category = self.get_default_category()
-            if default_category:
-                self.cursor.execute('UPDATE flashcards SET category_id = ? WHERE category_id = ?', (default_category['id'], id))
+            with self.pool.writer() as cursor:
+                default_category = self.get_default_category()
+                if default_category:
+                    cursor.execute('UPDATE flashcards SET category_id = ? WHERE category_id = ?', (default_category['id'], id))
             
-            self.cursor.execute('DELETE FROM categories WHERE id = ?', (id,))
-            self.conn.commit()
+                cursor.execute('DELETE FROM categories WHERE id = ?', (id,))
+            self.notify_change("categories", "cards")
             return True
         except sqlite3.Error as e:
             logging.error(f"Error deleting category: {e}")
@@ -327,15 +792,16 @@ class DatabaseManager:
         - list: A list of flashcards that belong to the specified categories.
         """
         try:
-            placeholders = ','.join(['?' for _ in category_ids])
-            query = f'''
-                SELECT f.id, f.question, f.answer, c.name, c.color
-                FROM flashcards f
-                JOIN categories c ON f.category_id = c.id
-                WHERE c.id IN ({placeholders})
-            '''
-            self.cursor.execute(query, category_ids)
-            return self.cursor.fetchall()
+            with self.pool.reader() as cursor:
+                placeholders = ','.join(['?' for _ in category_ids])
+                query = f'''
+                    SELECT f.id, f.question, f.answer, c.name, c.color
+                    FROM flashcards f
+                    JOIN categories c ON f.category_id = c.id
+                    WHERE c.id IN ({placeholders})
+                '''
+                cursor.execute(query, category_ids)
+                return cursor.fetchall()
         except sqlite3.Error as e:
             logging.error(f"Error retrieving flashcards by categories: {e}")
             raise
@@ -348,21 +814,238 @@ class DatabaseManager:
         - list: A list of dictionaries containing flashcard statistics.
         """
         try:
-            query = '''
-                SELECT f.question, c.name as category,
-                       SUM(CASE WHEN sh.is_correct THEN 1 ELSE 0 END) as correct,
-                       COUNT(sh.id) as total
-                FROM flashcards f
-                LEFT JOIN study_history sh ON f.id = sh.flashcard_id
-                LEFT JOIN categories c ON f.category_id = c.id
-                GROUP BY f.id
-            '''
-            self.cursor.execute(query)
-            return [dict(zip(["question", "category", "correct", "total"], row)) for row in self.cursor.fetchall()]
+            with self.pool.reader() as cursor:
+                query = '''
+                    SELECT f.question, c.name as category,
+                           COALESCE(cs.correct, 0) as correct,
+                           COALESCE(cs.total, 0) as total,
+                           cs.last_reviewed
+                    FROM flashcards f
+                    LEFT JOIN card_stats cs ON cs.flashcard_id = f.id
+                    LEFT JOIN categories c ON f.category_id = c.id
+                '''
+                cursor.execute(query)
+                return [dict(zip(["question", "category", "correct", "total", "last_reviewed"], row)) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             logging.error(f"Error retrieving flashcard statistics: {e}")
             raise
 
+    def statistics_filter(self, category_ids, min_attempts):
+        """
+        Build the WHERE conditions shared by the statistics queries.
+
+        Parameters:
+        - category_ids (list): The IDs of the categories to include, or None for all.
+        - min_attempts (int): The minimum number of study results of a card.
+
+        Returns:
+        - tuple: (conditions, params), a list of SQL conditions and their parameters.
+        """
+        # Cards without a card_stats row have never been studied and have no statistics.
+        conditions, params = ["cs.total >= ?"], [max(1, min_attempts)]
+        if category_ids is not None:
+            conditions.append(f"f.category_id IN ({','.join('?' * len(category_ids))})")
+            params.extend(category_ids)
+        return conditions, params
+
+    def count_statistics(self, category_ids=None, min_attempts=1):
+        """
+        Count the cards listed by get_statistics_page.
+
+        Parameters:
+        - category_ids (list): The IDs of the categories to include, or None for all.
+        - min_attempts (int): The minimum number of study results of a card.
+
+        Returns:
+        - int: The number of studied cards that match the filters.
+        """
+        conditions, params = self.statistics_filter(category_ids, min_attempts)
+        join = "JOIN flashcards f ON f.id = cs.flashcard_id" if category_ids is not None else ""
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM card_stats cs {join} WHERE {" AND ".join(conditions)}', params)
+                return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            logging.error(f"Error counting flashcard statistics: {e}")
+            raise
+
+    def get_statistics_page(self, sort_column="accuracy", descending=False, category_ids=None, min_attempts=1,
+                            after=None, before=None, offset=0, limit=100):
+        """
+        Retrieve one page of card statistics in sorted order using keyset pagination.
+
+        Statistics are read from the card_stats aggregates, and every sort order walks an index,
+        so a page costs the same however long the study history is. Pages are addressed as in
+        get_flashcard_page.
+
+        Parameters:
+        - sort_column (str): A key of STATISTICS_SORT_COLUMNS.
+        - descending (bool): Whether to sort in descending order.
+        - category_ids (list): The IDs of the categories to include, or None for all.
+        - min_attempts (int): The minimum number of study results of a card, at least 1.
+        - after (tuple): Return the rows that follow this (sort value, id) key.
+        - before (tuple): Return the rows that precede this (sort value, id) key.
+        - offset (int): The number of rows to skip after the after key, before the before key,
+          or from the start.
+        - limit (int): The maximum number of rows.
+
+        Returns:
+        - list: (id, question, category name, correct, total, success rate) tuples in sorted
+          order, with the success rate between 0 and 1.
+        """
+        expression, tie_breaker, joins = STATISTICS_SORT_COLUMNS[sort_column]
+        reverse = before is not None
+        ascending = descending == reverse
+        direction = "ASC" if ascending else "DESC"
+        conditions, params = self.statistics_filter(category_ids, min_attempts)
+        key = before if reverse else after
+        if key is not None:
+            # The plain bound lets the planner seek into the index; the row value comparison
+            # alone would scan it from the start.
+            conditions.append(f"{expression} {'>=' if ascending else '<='} ?")
+            conditions.append(f"({expression}, {tie_breaker}) {'>' if ascending else '<'} (?, ?)")
+            params.extend([key[0], *key])
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute(f'''
+                    SELECT f.id, f.question, c.name, cs.correct, cs.total, {ACCURACY_SQL}
+                    FROM {joins}
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY {expression} {direction}, {tie_breaker} {direction}
+                    LIMIT ? OFFSET ?
+                ''', (*params, limit, offset))
+                rows = cursor.fetchall()
+                return rows[::-1] if reverse else rows
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving flashcard statistics page: {e}")
+            raise
+
+    def get_weakest_cards(self, limit, category_ids=None, min_attempts=1):
+        """
+        Retrieve the cards with the lowest success rate.
+
+        Parameters:
+        - limit (int): The number of cards.
+        - category_ids (list): The IDs of the categories to include, or None for all.
+        - min_attempts (int): The minimum number of study results of a card.
+
+        Returns:
+        - list: Rows as returned by get_statistics_page, weakest first.
+        """
+        return self.get_statistics_page("accuracy", category_ids=category_ids, min_attempts=min_attempts, limit=limit)
+
+    def update_rollups(self, rebuild=False):
+        """
+        Bring the daily rollup tables up to date with the study history.
+
+        Parameters:
+        - rebuild (bool): Whether to recompute the rollups from the whole study history
+          instead of only the results added since the last update.
+
+        Returns:
+        - int: The number of study results folded in.
+
+        Raises:
+        - ValueError: If rebuild is requested after study results were archived, since their
+          days can no longer be recomputed.
+        """
+        try:
+            with self.pool.writer() as cursor:
+                if rebuild:
+                    if cursor.execute('SELECT 1 FROM study_history_archive LIMIT 1').fetchone():
+                        raise ValueError("Study results were archived; rebuilding the rollups would lose their days.")
+                    for statement in migrations.CLEAR_ROLLUPS:
+                        cursor.execute(statement)
+                return migrations.update_rollups(cursor)
+        except sqlite3.Error as e:
+            logging.error(f"Error updating study rollups: {e}")
+            raise
+
+    def get_daily_activity(self, since_day, category_ids=None):
+        """
+        Retrieve the number of reviews and correct answers per day from the daily rollups.
+
+        Call update_rollups first to include the latest study results.
+
+        Parameters:
+        - since_day (str): The first day to include, as YYYY-MM-DD (UTC).
+        - category_ids (list): The IDs of the categories to include, or None for all.
+
+        Returns:
+        - list: (day, correct, total) tuples in day order, for the days with reviews.
+        """
+        conditions, params = ["day >= ?"], [since_day]
+        if category_ids is not None:
+            conditions.append(f"category_id IN ({','.join('?' * len(category_ids))})")
+            params.extend(category_ids)
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute(f'''
+                    SELECT day, SUM(correct), SUM(total)
+                    FROM daily_rollup
+                    WHERE {" AND ".join(conditions)}
+                    GROUP BY day
+                    ORDER BY day
+                ''', params)
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving daily activity: {e}")
+            raise
+
+    def get_card_activity(self, flashcard_id, since_day=""):
+        """
+        Retrieve the reviews of a flashcard per day from the daily rollups.
+
+        Parameters:
+        - flashcard_id (int): The ID of the flashcard.
+        - since_day (str): The first day to include, as YYYY-MM-DD (UTC).
+
+        Returns:
+        - list: (day, correct, total) tuples in day order, for the days with reviews.
+        """
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute('''
+                    SELECT day, correct, total
+                    FROM card_daily_rollup
+                    WHERE flashcard_id = ? AND day >= ?
+                    ORDER BY day
+                ''', (flashcard_id, since_day))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving card activity: {e}")
+            raise
+
+    def get_study_streaks(self, today):
+        """
+        Compute the current and longest runs of consecutive days with reviews.
+
+        The current streak still counts when the user has not studied yet today.
+
+        Parameters:
+        - today (str): The current day, as YYYY-MM-DD (UTC).
+
+        Returns:
+        - dict: "current" and "longest" streaks in days.
+        """
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute('SELECT DISTINCT day FROM daily_rollup ORDER BY day')
+                days = [datetime.date.fromisoformat(row[0]) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logging.error(f"Error retrieving study streaks: {e}")
+            raise
+
+        longest = run = 0
+        previous = None
+        for day in days:
+            run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+            longest = max(longest, run)
+            previous = day
+        today = datetime.date.fromisoformat(today)
+        current = run if previous is not None and (today - previous).days <= 1 else 0
+        return {"current": current, "longest": longest}
+
     def reset_statistics(self):
         """
         Reset the study history statistics.
@@ -371,9 +1054,158 @@ class DatabaseManager:
         - bool: True if the statistics were reset successfully, False otherwise.
         """
         try:
-            self.cursor.execute('DELETE FROM study_history')
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute('DELETE FROM card_stats')
+                # Dropping and recreating study_history frees it in one step instead of deleting
+                # (and running the triggers for) every row. Its ID counter is kept, so the
+                # rollup high-water mark stays valid.
+                migrations.recreate_empty_table(cursor, 'study_history')
+                cursor.execute('DELETE FROM study_history_archive')
+                cursor.execute('DELETE FROM card_schedule')
+                cursor.execute('DELETE FROM daily_rollup')
+                cursor.execute('DELETE FROM card_daily_rollup')
+            self.notify_change("history")
             return True
         except sqlite3.Error as e:
             logging.error(f"Error resetting statistics: {e}")
             return False
+
+    def rebuild_card_stats(self):
+        """
+        Recompute the card_stats table from the full study history.
+
+        This also recompiles the card weight triggers, so it applies changes to
+        CARD_WEIGHT_HISTORY and MAX_CARD_WEIGHT.
+
+        Returns:
+        - bool: True if the statistics were rebuilt successfully, False otherwise.
+        """
+        try:
+            with self.pool.writer() as cursor:
+                for statement in migrations.REBUILD_CARD_STATS:
+                    cursor.execute(statement)
+                cursor.execute(migrations.ADD_ARCHIVED_CARD_STATS)
+                migrations.create_card_weight_triggers(cursor)
+            self.notify_change("history")
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Error rebuilding card statistics: {e}")
+            return False
+
+    def archive_history(self, retention_days=HISTORY_RETENTION_DAYS):
+        """
+        Fold study results older than retention_days into per-card archive totals.
+
+        The last CARD_WEIGHT_HISTORY results of every card are kept. Statistics, card weights
+        and trend charts are unchanged; only the individual archived results are gone. Run
+        vacuum() afterwards to return the freed space to the file system.
+
+        Parameters:
+        - retention_days (int): The age in days after which results are archived.
+
+        Returns:
+        - int: The number of study results archived.
+        """
+        try:
+            with self.pool.writer() as cursor:
+                archived = migrations.archive_history(cursor, retention_days)
+            if archived:
+                self.notify_change("history")
+            return archived
+        except sqlite3.Error as e:
+            logging.error(f"Error archiving study history: {e}")
+            raise
+
+    def vacuum(self):
+        """
+        Rebuild the database file to reclaim the space freed by deletes, and truncate the WAL.
+
+        Returns:
+        - int: The number of bytes reclaimed.
+        """
+        size_before = self.file_size()
+        try:
+            with self.pool.writer_connection() as conn:
+                conn.execute('VACUUM')
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        except sqlite3.Error as e:
+            logging.error(f"Error vacuuming database: {e}")
+            raise
+        return size_before - self.file_size()
+
+    def file_size(self):
+        """Return the size in bytes of the database file and its write-ahead log."""
+        return sum(os.path.getsize(path) for path in (self.db_file, f"{self.db_file}-wal") if os.path.exists(path))
+
+    def explain_query_plan(self, sql):
+        """
+        Get the query plan of a statement, for the slow query log.
+
+        Parameters:
+        - sql (str): The statement, with its parameters filled in.
+
+        Returns:
+        - list: The lines of the plan.
+
+        Raises:
+        - sqlite3.Error: If the statement cannot be planned, such as one on a temporary table.
+        """
+        with self.pool.reader() as cursor:
+            return [row[-1] for row in cursor.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+    def iter_rows(self, query, params=(), chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Stream the rows of a query in chunks, keeping memory use constant.
+
+        The reader connection is held until the generator is exhausted or closed.
+
+        Parameters:
+        - query (str): The SQL query.
+        - params (tuple): The query parameters.
+        - chunk_size (int): The number of rows fetched at a time.
+
+        Yields:
+        - tuple: One row of the result.
+        """
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield from rows
+        except sqlite3.Error as e:
+            logging.error(f"Error streaming rows: {e}")
+            raise
+
+    def iter_categories(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """Stream all categories as (id, name, color) tuples."""
+        return self.iter_rows('SELECT id, name, color FROM categories ORDER BY id', chunk_size=chunk_size)
+
+    def iter_flashcards(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """Stream all flashcards as (id, question, answer, category_id, category name) tuples."""
+        return self.iter_rows('''
+            SELECT f.id, f.question, f.answer, f.category_id, c.name
+            FROM flashcards f
+            LEFT JOIN categories c ON f.category_id = c.id
+            ORDER BY f.id
+        ''', chunk_size=chunk_size)
+
+    def iter_study_history(self, since_id=0, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Stream study results with an ID greater than since_id, oldest first.
+
+        Parameters:
+        - since_id (int): Only results after this study_history ID are returned.
+        - chunk_size (int): The number of rows fetched at a time.
+
+        Yields:
+        - tuple: (id, flashcard_id, is_correct, timestamp).
+        """
+        return self.iter_rows('''
+            SELECT id, flashcard_id, is_correct, timestamp
+            FROM study_history
+            WHERE id > ?
+            ORDER BY id
+        ''', (since_id,), chunk_size=chunk_size)
@@ -0,0 +1,135 @@
+"""
+db_executor.py
+
+This file contains the DatabaseExecutor class, which runs database calls on a worker thread and
+delivers their results back to the Tk thread.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from constants import DB_EXECUTOR_POLL_MS
+
+class DatabaseExecutor:
+    """
+    A single worker thread for database calls made on behalf of the UI.
+
+    submit() returns a Future at once. When calls finish, their callbacks run on the Tk thread,
+    all calls completed since the last check in one batch, from a poll scheduled with after()
+    only while calls are outstanding. Calls are tagged with their owner, usually a view, so
+    cancel() can drop everything a view asked for once its results are no longer wanted.
+    """
+
+    def __init__(self, schedule, poll_interval_ms=DB_EXECUTOR_POLL_MS):
+        """
+        Initialize the DatabaseExecutor and start its worker thread.
+
+        Parameters:
+        - schedule (callable): A function (delay_ms, callback) that runs callback on the Tk thread
+          later, such as tk.Tk.after.
+        - poll_interval_ms (int): How often completed calls are delivered.
+        """
+        self.schedule = schedule
+        self.poll_interval_ms = poll_interval_ms
+        self.requests = queue.Queue()
+        self.completed = queue.Queue()
+        # Outstanding futures and their tags; only touched on the Tk thread.
+        self.active = {}
+        self.superseded = set()
+        self.polling = False
+        self.thread = threading.Thread(target=self.run, name="db-executor", daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args, tag=None, callback=None, error_callback=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on the worker thread. Call from the Tk thread.
+
+        Parameters:
+        - func (callable): The database call, usually a DatabaseManager method.
+        - tag (object): The owner of the call, for cancel().
+        - callback (callable): Called on the Tk thread with the result.
+        - error_callback (callable): Called on the Tk thread with the exception if func raises.
+          Errors are logged when it is None.
+
+        Returns:
+        - Future: The future of the call.
+        """
+        future = Future()
+        self.active[future] = tag
+        self.requests.put((future, func, args, kwargs, callback, error_callback))
+        if not self.polling:
+            self.polling = True
+            self.schedule(self.poll_interval_ms, self.deliver)
+        return future
+
+    def cancel(self, tag):
+        """
+        Cancel the outstanding calls of an owner. Calls that are already running finish, but
+        their callbacks are not run. Call from the Tk thread.
+
+        Parameters:
+        - tag (object): The owner whose calls to cancel.
+        """
+        for future, future_tag in self.active.items():
+            if future_tag is tag and not future.cancel():
+                self.superseded.add(future)
+
+    def cancel_on_destroy(self, widget):
+        """
+        Cancel the outstanding calls tagged with widget when it is destroyed.
+
+        Parameters:
+        - widget (tk.Widget): The widget, usually a view.
+        """
+        widget.bind("<Destroy>", lambda event: self.cancel(widget) if event.widget is widget else None, add="+")
+
+    def deliver(self):
+        """Run the callbacks of every call completed since the last poll."""
+        while True:
+            try:
+                future, callback, error_callback = self.completed.get_nowait()
+            except queue.Empty:
+                break
+            self.active.pop(future, None)
+            if future.cancelled() or future in self.superseded:
+                self.superseded.discard(future)
+                continue
+            error = future.exception()
+            try:
+                if error is not None:
+                    if error_callback:
+                        error_callback(error)
+                    else:
+                        logging.error(f"Database call failed: {error}")
+                elif callback:
+                    callback(future.result())
+            except Exception as e:
+                # One failing callback must not stop the delivery of the rest of the batch.
+                logging.error(f"Database call callback failed: {e}")
+
+        if self.active:
+            self.schedule(self.poll_interval_ms, self.deliver)
+        else:
+            self.polling = False
+
+    def run(self):
+        """Run submitted calls one at a time until the executor is closed."""
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            future, func, args, kwargs, callback, error_callback = request
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+            self.completed.put((future, callback, error_callback))
+
+    def close(self):
+        """Cancel the calls that have not started and wait for the worker to stop."""
+        for future in list(self.active):
+            future.cancel()
+        self.requests.put(None)
+        self.thread.join()
@@ -0,0 +1,63 @@
+"""
+export_cards.py
+
+This file exports the flashcards database from the command line.
+
+Usage:
+    python export_cards.py OUTPUT [--format bundle|csv|jsonl] [--db flashcards.db]
+                           [--since-history-id N | --state-file export_state.json] [--history-only]
+
+With --state-file, the last exported study history ID is stored after every successful run and the
+next run only exports newer study results, so nightly exports of a large history stay cheap.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from database_manager import DatabaseManager
+from exporter import Exporter, EXPORT_FORMATS
+
+def load_state(state_file):
+    """Return the last exported study history ID recorded in the state file, or 0."""
+    if not state_file or not os.path.exists(state_file):
+        return 0
+    with open(state_file, "r") as f:
+        return int(json.load(f).get("last_history_id", 0))
+
+def save_state(state_file, last_history_id):
+    """Record the last exported study history ID, replacing the state file atomically."""
+    temp_path = f"{state_file}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"last_history_id": last_history_id}, f)
+    os.replace(temp_path, state_file)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export flashcards, categories and study history.")
+    parser.add_argument("output", help="A directory for csv and jsonl, or a .jsonl.gz file for bundle.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="bundle", help="The export format.")
+    parser.add_argument("--db", default="flashcards.db", help="The database file.")
+    since = parser.add_mutually_exclusive_group()
+    since.add_argument("--since-history-id", type=int, help="Only export study results after this ID.")
+    since.add_argument("--state-file", help="Read and update the last exported study history ID in this file.")
+    parser.add_argument("--history-only", action="store_true", help="Only export study history.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    since_history_id = args.since_history_id if args.since_history_id is not None else load_state(args.state_file)
+    tables = ["study_history"] if args.history_only else None
+
+    with DatabaseManager(args.db) as db_manager:
+        try:
+            summary = Exporter(db_manager).export(args.output, args.format, since_history_id, tables)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Export failed: {e}")
+
+    if args.state_file:
+        save_state(args.state_file, summary["last_history_id"])
+    counts = ", ".join(f"{count} {table}" for table, count in summary["counts"].items())
+    print(f"Exported {counts}. Last study history ID: {summary['last_history_id']}.")
+
+if __name__ == "__main__":
+    main()
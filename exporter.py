@@ -0,0 +1,149 @@
+"""
+exporter.py
+
+This file contains the Exporter class for streaming flashcards, categories and study history
+out of the database as CSV, JSONL or a gzip-compressed JSONL bundle.
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+from constants import EXPORT_CHUNK_SIZE
+
+# Table name -> (column names, DatabaseManager iterator method).
+EXPORT_TABLES = {
+    "categories": (["id", "name", "color"], "iter_categories"),
+    "flashcards": (["id", "question", "answer", "category_id", "category"], "iter_flashcards"),
+    "study_history": (["id", "flashcard_id", "is_correct", "timestamp"], "iter_study_history"),
+}
+
+EXPORT_FORMATS = ["csv", "jsonl", "bundle"]
+
+class Exporter:
+    """
+    A class to export the database with constant memory use.
+
+    Rows are streamed from chunked cursors straight into the output files. Study history can be
+    exported incrementally from a given history ID, and every file is written to a temporary name
+    and renamed when complete, so an interrupted export can simply be run again.
+    """
+
+    def __init__(self, db_manager, chunk_size=EXPORT_CHUNK_SIZE, progress_callback=None):
+        """
+        Initialize the Exporter.
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager.
+        - chunk_size (int): The number of rows fetched from the database at a time.
+        - progress_callback (callable): Called every chunk_size rows with the table name and
+          the number of rows written for it so far.
+        """
+        self.db_manager = db_manager
+        self.chunk_size = max(1, chunk_size)
+        self.progress_callback = progress_callback
+
+    def export(self, path, file_format="bundle", since_history_id=0, tables=None):
+        """
+        Export tables to CSV files, JSONL files or a single gzip bundle.
+
+        Parameters:
+        - path (str): A directory for "csv" and "jsonl", or a file path for "bundle".
+        - file_format (str): "csv", "jsonl" or "bundle".
+        - since_history_id (int): Only study results after this ID are exported.
+        - tables (list): The tables to export. Defaults to all of EXPORT_TABLES.
+
+        Returns:
+        - dict: The rows written per table under "counts", and "last_history_id", the ID to pass
+          as since_history_id to continue with the next incremental export.
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{file_format}'. Choose from {EXPORT_FORMATS}.")
+        tables = tables or list(EXPORT_TABLES)
+        summary = {"counts": {}, "last_history_id": since_history_id}
+
+        if file_format == "bundle":
+            with AtomicFile(path, gzip_compressed=True) as file:
+                for table in tables:
+                    for row in self.iter_records(table, since_history_id, summary):
+                        file.write(json.dumps({"table": table, "row": row}) + "\n")
+        else:
+            os.makedirs(path, exist_ok=True)
+            for table in tables:
+                with AtomicFile(os.path.join(path, f"{table}.{file_format}")) as file:
+                    if file_format == "csv":
+                        writer = csv.DictWriter(file, fieldnames=EXPORT_TABLES[table][0])
+                        writer.writeheader()
+                        writer.writerows(self.iter_records(table, since_history_id, summary))
+                    else:
+                        for row in self.iter_records(table, since_history_id, summary):
+                            file.write(json.dumps(row) + "\n")
+
+        logging.info(f"Exported {summary['counts']} to '{path}'.")
+        return summary
+
+    def iter_records(self, table, since_history_id, summary):
+        """
+        Stream the rows of a table as dictionaries, counting them in summary.
+
+        Parameters:
+        - table (str): The table name.
+        - since_history_id (int): Only study results after this ID are exported.
+        - summary (dict): The export summary to update.
+
+        Yields:
+        - dict: One row keyed by column name.
+        """
+        columns, method_name = EXPORT_TABLES[table]
+        iterator = getattr(self.db_manager, method_name)
+        if table == "study_history":
+            rows = iterator(since_id=since_history_id, chunk_size=self.chunk_size)
+        else:
+            rows = iterator(chunk_size=self.chunk_size)
+
+        count = 0
+        for row in rows:
+            record = dict(zip(columns, row))
+            if table == "study_history":
+                record["is_correct"] = bool(record["is_correct"])
+                summary["last_history_id"] = record["id"]
+            count += 1
+            if self.progress_callback and count % self.chunk_size == 0:
+                self.progress_callback(table, count)
+            yield record
+        summary["counts"][table] = count
+        if self.progress_callback:
+            self.progress_callback(table, count)
+
+class AtomicFile:
+    """
+    A text file that is written under a temporary name and renamed into place on success.
+    """
+
+    def __init__(self, path, gzip_compressed=False):
+        """
+        Initialize the AtomicFile.
+
+        Parameters:
+        - path (str): The final path of the file.
+        - gzip_compressed (bool): Whether to gzip-compress the file.
+        """
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.gzip_compressed = gzip_compressed
+        self.file = None
+
+    def __enter__(self):
+        if self.gzip_compressed:
+            self.file = gzip.open(self.temp_path, "wt", encoding="utf-8", newline="")
+        else:
+            self.file = open(self.temp_path, "w", encoding="utf-8", newline="")
+        return self.file
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.temp_path, self.path)
+        else:
+            os.remove(self.temp_path)
@@ -7,43 +7,90 @@ This file contains the FlashcardApp class which is the main application class fo
 import tkinter as tk
 from tkinter import ttk, messagebox
 from database_manager import DatabaseManager
+from db_executor import DatabaseExecutor
 from settings_manager import SettingsManager
 from ui.main_menu import MainMenu
-from ui.flashcard_views import FlashcardViews
-from ui.study_session import StudySession, PreStudyOptionsDialog
-from ui.settings_view import SettingsView
-from ui.progress_view import ProgressView
-from ui.category_manager import CategoryManager
+from ui.screen_cache import ScreenCache
+from ui.theme_styles import ThemeStyles
 from utils import show_toast, ErrorHandler
+import importlib
 import logging
+import time
+
+# The modules of the screens other than the main menu, imported the first time a screen is
+# opened so startup only pays for the main menu.
+SCREEN_MODULES = {
+    "FlashcardViews": "ui.flashcard_views",
+    "StudySession": "ui.study_session",
+    "PreStudyOptionsDialog": "ui.study_session",
+    "SettingsView": "ui.settings_view",
+    "ProgressView": "ui.progress_view",
+    "TrendView": "ui.trend_view",
+    "CategoryManager": "ui.category_manager",
+    "ImportView": "ui.import_view",
+    "DiagnosticsView": "ui.diagnostics_view",
+}
+
+def load_screen(name):
+    """
+    Import a screen class on first use.
+
+    Parameters:
+    - name (str): The class name, a key of SCREEN_MODULES.
+
+    Returns:
+    - type: The screen class.
+    """
+    return getattr(importlib.import_module(SCREEN_MODULES[name]), name)
 
 class FlashcardApp:
     """
     The main application class for the flashcards application.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, started_at=None):
         """
         Initialize the FlashcardApp.
 
         Parameters:
         - root (tk.Tk): The root window of the application.
+        - started_at (float): The time.perf_counter() value at process start, for the startup
+          timing report. Defaults to now.
         """
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.startup_times = {}
         self.root = root
         self.root.title("Flashcard Learning App")
         
         self.db_manager = DatabaseManager()
+        self.db_executor = DatabaseExecutor(self.root.after)
+        # The pipelines of study sessions, kept until they have written their results so
+        # shutdown can wait for them.
+        self.session_pipelines = []
         self.settings_manager = SettingsManager()
         self.error_handler = ErrorHandler(self.root)
         
         self.db_manager.initialize_default_category()
         
-        self.flashcards = []
+        # Screens load the flashcards they show themselves; the app only keeps the categories
+        # and a count of the flashcards.
+        self.flashcard_count = 0
         self.categories = []
+        self.data_loaded = False
+        self.app_data_stale = False
         self.load_data()
 
+        # Built screens are kept for the next visit and refreshed only when their data changed.
+        self.screen_cache = ScreenCache()
+        self.current_screen = None
+        self.db_manager.add_change_listener(self.screen_cache.mark_dirty)
+        self.db_manager.add_change_listener(self.on_data_changed)
+
+        self.style = ttk.Style()
+        self.theme_styles = ThemeStyles(self.root, self.style)
         self.apply_settings()
         self.create_widgets()
+        self.map_binding = self.root.bind("<Map>", self.on_first_map, add="+")
 
     def apply_settings(self):
         """Apply settings from the SettingsManager to the application."""
@@ -55,77 +102,56 @@ class FlashcardApp:
         scaled_height = int(base_height * self.scaling_factor)
         self.root.geometry(f"{scaled_width}x{scaled_height}")
         
-        self.style = ttk.Style()
         self.set_theme()
 
     def set_theme(self):
         """Set the theme based on the current settings."""
-        theme = self.settings_manager.get_current_theme()
-        
-        self.style.theme_use("clam")
-        
-        colors = theme["colors"]
-        fonts = theme["fonts"]
-        styles = theme["styles"]
-
-        main_font_size = int(fonts["main"]["size"] * self.scaling_factor)
-        header_font_size = int(fonts["header"]["size"] * self.scaling_factor)
-
-        main_font = (fonts["main"]["family"], main_font_size)
-        header_font = (fonts["header"]["family"], header_font_size, fonts["header"]["weight"])
-
-        self.style.configure(".", font=main_font, background=colors["background"])
-        self.style.configure("TFrame", background=colors["background"])
-        self.style.configure("TLabel", background=colors["background"], foreground=colors["foreground"], font=main_font)
-        self.style.configure("Header.TLabel", font=header_font)
-        self.style.configure("TButton", 
-                            background=colors["button"], 
-                            foreground=colors["button_text"],
-                            font=(fonts["main"]["family"], main_font_size, "bold"),
-                            padding=int(styles["button"]["padding"] * self.scaling_factor))
-        self.style.map("TButton", 
-                       background=[("active", colors["accent"])],
-                       foreground=[("active", colors["background"])])
-        entry_height = int(30 * self.scaling_factor)
-        self.style.configure("TEntry", 
-                            fieldbackground=colors["background"], 
-                            foreground=colors["foreground"],
-                            borderwidth=styles["entry"]["borderwidth"],
-                            font=main_font,
-                            height=entry_height)
-        self.style.configure("TCombobox", 
-                            fieldbackground=colors["background"], 
-                            foreground=colors["foreground"],
-                            borderwidth=styles["entry"]["borderwidth"],
-                            font=main_font,
-                            height=entry_height)
-        self.style.configure("Treeview", 
-                            background=styles["treeview"]["background"],
-                            fieldbackground=styles["treeview"]["fieldbackground"], 
-                            foreground=colors["foreground"],
-                            font=main_font,
-                            rowheight=int(styles["treeview"]["rowheight"] * self.scaling_factor))
-        self.style.configure("Treeview.Heading", 
-                            background=colors["button"], 
-                            foreground=colors["button_text"],
-                            font=(fonts["main"]["family"], main_font_size, "bold"))
-        self.style.configure("Vertical.TScrollbar", background=colors["button"], troughcolor=colors["background"])
-        self.style.configure("Horizontal.TScrollbar", background=colors["button"], troughcolor=colors["background"])
-        self.style.configure("TProgressbar", background=colors["accent"], troughcolor=colors["background"])
-        
-        self.root.configure(bg=colors["background"])
-        
-        self.root.update_idletasks()
-        self.root.update()
+        self.theme_styles.apply(self.settings_manager.get_current_theme_name(),
+                                self.settings_manager.get_current_theme(), self.scaling_factor)
 
     def load_data(self):
-        """Load flashcards and categories from the database."""
-        try:
-            self.flashcards = self.db_manager.get_all_flashcards()
-            self.categories = self.db_manager.get_all_categories()
-        except Exception as e:
-            self.error_handler.show_error("Failed to load data", str(e))
-            logging.error(f"Failed to load data: {e}")
+        """Load the categories and the flashcard count from the database in the background."""
+        self.db_executor.cancel(self)
+        self.db_executor.submit(self.fetch_data, tag=self, callback=self.on_data_loaded, error_callback=self.on_data_error)
+
+    def fetch_data(self):
+        """Read the flashcard count and the categories. Runs on the database executor thread."""
+        return self.db_manager.count_flashcards(), self.db_manager.get_all_categories()
+
+    def on_data_loaded(self, data):
+        """Store the flashcard count and categories loaded by load_data."""
+        self.flashcard_count, self.categories = data
+        self.data_loaded = True
+        self.mark_startup("data_loaded")
+
+    def on_first_map(self, event):
+        """Record when the main window is first shown."""
+        if event.widget is self.root:
+            self.root.unbind("<Map>", self.map_binding)
+            self.mark_startup("first_window")
+
+    def mark_startup(self, milestone):
+        """
+        Record a startup milestone and log the startup timing report once the app is interactive.
+
+        The app is interactive when the window is shown and the initial data has loaded.
+
+        Parameters:
+        - milestone (str): "first_window" or "data_loaded".
+        """
+        if milestone in self.startup_times:
+            return
+        self.startup_times[milestone] = (time.perf_counter() - self.started_at) * 1000
+        if len(self.startup_times) == 2:
+            interactive = max(self.startup_times.values())
+            logging.info(f"Startup: first window after {self.startup_times['first_window']:.0f} ms, "
+                         f"data loaded after {self.startup_times['data_loaded']:.0f} ms, "
+                         f"interactive after {interactive:.0f} ms.")
+
+    def on_data_error(self, error):
+        """Report a failure of load_data."""
+        self.error_handler.show_error("Failed to load data", str(error))
+        logging.error(f"Failed to load data: {error}")
 
     def create_widgets(self):
         """Create the main widgets for the application."""
@@ -156,23 +182,70 @@ class FlashcardApp:
 
     def show_main_menu(self):
         """Show the main menu view."""
+        self.show_screen("main_menu", "Flashcard App", lambda parent: MainMenu(parent, self), back=False)
+
+    def show_screen(self, key, title, create, topics=(), back=True):
+        """
+        Show a screen in the content frame, reusing its cached instance when there is one.
+
+        A cached screen whose data changed while it was hidden is refreshed before it is shown.
+
+        Parameters:
+        - key (str): The screen cache key, or None for screens that are never cached.
+        - title (str): The header title.
+        - create (callable): A function (parent) that builds the screen.
+        - topics (tuple): The data topics the screen displays, see DatabaseManager.add_change_listener.
+        - back (bool): Whether to show the back button.
+
+        Returns:
+        - tk.Widget: The screen.
+        """
         self.clear_content()
-        self.back_button.pack_forget()
-        self.title_label.config(text="Flashcard App")
-        MainMenu(self.content_frame, self).pack(fill=tk.BOTH, expand=True)
+        if self.app_data_stale:
+            self.app_data_stale = False
+            self.load_data()
+
+        screen, dirty = self.screen_cache.get(key) if key else (None, False)
+        if screen is None:
+            screen = create(self.content_frame)
+            if key:
+                self.screen_cache.put(key, screen, topics)
+        elif dirty:
+            screen.refresh()
+        screen.pack(fill=tk.BOTH, expand=True)
+        self.current_screen = screen
+
+        if back:
+            self.back_button.pack(side=tk.LEFT)
+        else:
+            self.back_button.pack_forget()
+        self.title_label.config(text=title)
+        return screen
 
     def clear_content(self):
-        """Clear the content frame."""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        """Hide the current screen, destroying it unless the screen cache keeps it."""
+        if self.current_screen is None:
+            return
+        if self.screen_cache.holds(self.current_screen):
+            self.current_screen.pack_forget()
+        else:
+            self.current_screen.destroy()
+        self.current_screen = None
+
+    def on_data_changed(self, topics):
+        """
+        Note that the flashcard count or categories changed. Called on the writing thread.
+
+        Parameters:
+        - topics (frozenset): The data topics that changed.
+        """
+        if topics & {"cards", "categories"}:
+            self.app_data_stale = True
 
     def show_settings(self):
         """Show the settings view."""
-        self.clear_content()
-        self.back_button.pack(side=tk.LEFT)
-        self.title_label.config(text="Settings")
-        SettingsView(self.content_frame, self.settings_manager, self.apply_settings, self.show_toast).pack(fill=tk.BOTH, expand=True)
-        self.set_theme()
+        self.show_screen("settings", "Settings",
+                         lambda parent: load_screen("SettingsView")(parent, self.settings_manager, self.apply_settings, self.show_toast))
 
     def show_toast(self, message):
         """
@@ -185,63 +258,72 @@ class FlashcardApp:
 
     def view_flashcards(self):
         """Show the view flashcards view."""
-        self.clear_content()
-        self.back_button.pack(side=tk.LEFT)
-        self.title_label.config(text="View Flashcards")
-        FlashcardViews(self.content_frame, self).pack(fill=tk.BOTH, expand=True)
+        self.show_screen("view_flashcards", "View Flashcards",
+                         lambda parent: load_screen("FlashcardViews")(parent, self), ("cards", "categories"))
 
     def add_flashcard(self):
         """Show the add flashcard view."""
-        self.clear_content()
-        self.back_button.pack(side=tk.LEFT)
-        self.title_label.config(text="Add Flashcard")
-        FlashcardViews(self.content_frame, self, mode="add").pack(fill=tk.BOTH, expand=True)
+        self.show_screen("add_flashcard", "Add Flashcard",
+                         lambda parent: load_screen("FlashcardViews")(parent, self, mode="add"), ("categories",))
 
     def edit_flashcards(self):
         """Show the edit flashcards view."""
-        self.clear_content()
-        self.back_button.pack(side=tk.LEFT)
-        self.title_label.config(text="Edit Flashcards")
-        FlashcardViews(self.content_frame, self, mode="edit").pack(fill=tk.BOTH, expand=True)
+        self.show_screen("edit_flashcards", "Edit Flashcards",
+                         lambda parent: load_screen("FlashcardViews")(parent, self, mode="edit"), ("cards", "categories"))
 
     def start_study_session(self):
         """Start a study session."""
-        if not self.flashcards:
+        if not self.data_loaded:
+            self.show_toast("Flashcards are still loading. Please try again in a moment.")
+            return
+        if not self.flashcard_count:
             self.show_toast("No flashcards available. Please add some flashcards before starting a study session.")
             return
 
-        options = PreStudyOptionsDialog(self.root, self.categories).show()
+        options = load_screen("PreStudyOptionsDialog")(self.root, self.categories).show()
         if options:
-            self.clear_content()
-            self.back_button.pack(side=tk.LEFT)
-            self.title_label.config(text="Study Session")
-            study_session = StudySession(self.content_frame, self, options)
-            study_session.pack(fill=tk.BOTH, expand=True)
-            
-            if not study_session.study_deck:
-                self.show_toast("No flashcards available for the selected categories.")
+            # Each session is a new screen, destroyed when the user leaves it.
+            self.show_screen(None, "Study Session", lambda parent: load_screen("StudySession")(parent, self, options))
 
     def manage_categories(self):
         """Show the manage categories view."""
-        self.clear_content()
-        self.back_button.pack(side=tk.LEFT)
-        self.title_label.config(text="Manage Categories")
-        CategoryManager(self.content_frame, self).pack(fill=tk.BOTH, expand=True)
+        self.show_screen("manage_categories", "Manage Categories",
+                         lambda parent: load_screen("CategoryManager")(parent, self), ("categories",))
+
+    def import_flashcards(self):
+        """Show the import flashcards view."""
+        self.show_screen("import_flashcards", "Import Flashcards", lambda parent: load_screen("ImportView")(parent, self))
 
     def view_progress(self):
         """Show the view progress view."""
-        self.clear_content()
-        self.back_button.pack(side=tk.LEFT)
-        self.title_label.config(text="View Progress")
-        ProgressView(self.content_frame, self).pack(fill=tk.BOTH, expand=True)
+        self.show_screen("view_progress", "View Progress",
+                         lambda parent: load_screen("ProgressView")(parent, self), ("cards", "categories", "history"))
+
+    def view_trends(self):
+        """Show the study trends view."""
+        self.show_screen("view_trends", "Study Trends", lambda parent: load_screen("TrendView")(parent, self), ("history",))
+
+    def show_diagnostics(self):
+        """Show the database diagnostics view. It is rebuilt on each visit, so it only updates while shown."""
+        self.show_screen(None, "Diagnostics", lambda parent: load_screen("DiagnosticsView")(parent, self))
 
     def __del__(self):
         """Destructor to ensure database connection is closed."""
         self.db_manager.close()
 
+    def shutdown(self):
+        """Write any pending settings and buffered study results and close the database connection."""
+        self.settings_manager.flush()
+        for pipeline in self.session_pipelines:
+            pipeline.close()
+        self.session_pipelines = []
+        if self.db_manager.pool:
+            self.db_executor.close()
+            self.db_manager.close()
+
     def quit_app(self):
         """Quit the application."""
         if messagebox.askyesno("Quit", "Are you sure you want to quit the application?"):
-            self.db_manager.close()
+            self.shutdown()
             self.root.quit()
             self.root.destroy()
@@ -0,0 +1,48 @@
+"""
+import_cards.py
+
+This file imports a CSV, TSV or JSONL deck into the flashcards database from the command line.
+
+Usage:
+    python import_cards.py deck.csv [--format csv|tsv|jsonl] [--db flashcards.db] [--category Default]
+
+Rows need a question and an answer column and may name a category; missing categories are created.
+"""
+
+import argparse
+import logging
+import sys
+from database_manager import DatabaseManager
+from importer import BulkImporter
+from constants import IMPORT_CHUNK_SIZE
+
+def print_progress(progress):
+    """Print import progress on a single, updating line."""
+    percentage = progress["bytes_read"] / progress["total_bytes"] * 100 if progress["total_bytes"] else 100
+    sys.stderr.write(f"\r{percentage:5.1f}%  {progress['imported']} imported, {progress['skipped']} skipped")
+    sys.stderr.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description="Import flashcards from a CSV, TSV or JSONL file.")
+    parser.add_argument("path", help="The deck file to import.")
+    parser.add_argument("--format", choices=["csv", "tsv", "jsonl"], help="The file format. Detected from the extension by default.")
+    parser.add_argument("--db", default="flashcards.db", help="The database file.")
+    parser.add_argument("--category", default="Default", help="The category for rows that do not name one.")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Flashcards inserted per transaction.")
+    parser.add_argument("--encoding", default="utf-8", help="The text encoding of the file.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with DatabaseManager(args.db) as db_manager:
+        db_manager.initialize_default_category()
+        importer = BulkImporter(db_manager, chunk_size=args.chunk_size, progress_callback=print_progress,
+                                default_category=args.category)
+        try:
+            summary = importer.import_file(args.path, args.format, args.encoding)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Import failed: {e}")
+    sys.stderr.write("\n")
+    print(f"Imported {summary['imported']} flashcards, skipped {summary['skipped']} invalid rows.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+importer.py
+
+This file contains the BulkImporter class for loading large CSV, TSV and JSONL decks into the
+flashcards database.
+"""
+
+import csv
+import json
+import logging
+import os
+from constants import IMPORT_CHUNK_SIZE
+
+IMPORT_FORMATS = {".csv": "csv", ".tsv": "tsv", ".txt": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+def detect_format(path):
+    """
+    Detect the format of a deck file from its extension.
+
+    Parameters:
+    - path (str): The path of the deck file.
+
+    Returns:
+    - str: "csv", "tsv" or "jsonl".
+
+    Raises:
+    - ValueError: If the extension is not a supported format.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported file type '{extension}'. Use one of {sorted(IMPORT_FORMATS)}.")
+    return IMPORT_FORMATS[extension]
+
+def prepend_row(row, reader):
+    """Yield row, then every row of reader."""
+    yield row
+    yield from reader
+
+def read_delimited(file, delimiter):
+    """
+    Stream (question, answer, category) rows from a CSV or TSV file.
+
+    A header row naming the question and answer columns is used when present; otherwise the
+    columns are read as question, answer and an optional category.
+
+    Parameters:
+    - file (file): The open text file.
+    - delimiter (str): The column delimiter.
+
+    Yields:
+    - tuple: (question, answer, category) with category None when missing.
+    """
+    reader = csv.reader(file, delimiter=delimiter)
+    first_row = next(reader, None)
+    if first_row is None:
+        return
+    header = [column.strip().lower() for column in first_row]
+    if "question" in header and "answer" in header:
+        question_index = header.index("question")
+        answer_index = header.index("answer")
+        category_index = header.index("category") if "category" in header else None
+    else:
+        question_index, answer_index, category_index = 0, 1, 2
+        reader = prepend_row(first_row, reader)
+
+    for row in reader:
+        if len(row) <= max(question_index, answer_index):
+            yield (None, None, None)
+            continue
+        category = row[category_index] if category_index is not None and category_index < len(row) else None
+        yield (row[question_index], row[answer_index], category)
+
+def read_jsonl(file):
+    """
+    Stream (question, answer, category) rows from a JSON Lines file.
+
+    Parameters:
+    - file (file): The open text file.
+
+    Yields:
+    - tuple: (question, answer, category) with category None when missing.
+    """
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield (None, None, None)
+            continue
+        if not isinstance(record, dict):
+            yield (None, None, None)
+            continue
+        yield (record.get("question"), record.get("answer"), record.get("category"))
+
+class BulkImporter:
+    """
+    A class to stream flashcards from a deck file into the database in chunked transactions.
+    """
+
+    def __init__(self, db_manager, chunk_size=IMPORT_CHUNK_SIZE, progress_callback=None, default_category="Default"):
+        """
+        Initialize the BulkImporter.
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager.
+        - chunk_size (int): The number of flashcards inserted per transaction.
+        - progress_callback (callable): Called after every chunk with a dict holding
+          "imported", "skipped", "bytes_read" and "total_bytes".
+        - default_category (str): The category used for rows that do not name one.
+        """
+        self.db_manager = db_manager
+        self.chunk_size = max(1, chunk_size)
+        self.progress_callback = progress_callback
+        self.default_category = default_category
+        self.category_cache = {}
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the import before the next row. The rows read so far are still written."""
+        self.cancelled = True
+
+    def resolve_category(self, name):
+        """
+        Get the ID of a category by name, creating the category if it does not exist.
+
+        Parameters:
+        - name (str): The category name.
+
+        Returns:
+        - int: The ID of the category.
+        """
+        category_id = self.category_cache.get(name)
+        if category_id is None:
+            category_id = self.db_manager.get_category_id_by_name(name)
+            if category_id is None:
+                category_id = self.db_manager.add_category(name, "#808080")
+                logging.info(f"Created category '{name}' during import.")
+            self.category_cache[name] = category_id
+        return category_id
+
+    def import_file(self, path, file_format=None, encoding="utf-8"):
+        """
+        Import every flashcard of a deck file.
+
+        Parameters:
+        - path (str): The path of the deck file.
+        - file_format (str): "csv", "tsv" or "jsonl". Detected from the extension when None.
+        - encoding (str): The text encoding of the file.
+
+        Returns:
+        - dict: The number of "imported" and "skipped" rows and whether the import was "cancelled".
+        """
+        file_format = file_format or detect_format(path)
+        self.category_cache = {category["name"]: category["id"] for category in self.db_manager.get_all_categories()}
+        total_bytes = os.path.getsize(path)
+        summary = {"imported": 0, "skipped": 0, "cancelled": False}
+
+        with open(path, "r", encoding=encoding, newline="") as file:
+            if file_format == "jsonl":
+                rows = read_jsonl(file)
+            else:
+                rows = read_delimited(file, "\t" if file_format == "tsv" else ",")
+
+            chunk = []
+            for question, answer, category in rows:
+                # Checked before the row's category is created, so a cancelled import leaves
+                # no empty categories behind, wherever in the file it stops.
+                if self.cancelled:
+                    summary["cancelled"] = True
+                    break
+                question = str(question).strip() if question is not None else ""
+                answer = str(answer).strip() if answer is not None else ""
+                if not (question and answer):
+                    summary["skipped"] += 1
+                    continue
+                category_name = str(category).strip() if category else ""
+                chunk.append((question, answer, self.resolve_category(category_name or self.default_category)))
+                if len(chunk) >= self.chunk_size:
+                    self.write_chunk(chunk, summary, file.buffer.tell(), total_bytes)
+                    chunk = []
+            if chunk:
+                self.write_chunk(chunk, summary, file.buffer.tell() if summary["cancelled"] else total_bytes, total_bytes)
+
+        logging.info(f"Imported {summary['imported']} flashcards from '{path}' ({summary['skipped']} rows skipped).")
+        return summary
+
+    def write_chunk(self, chunk, summary, bytes_read, total_bytes):
+        """Insert a chunk of flashcards in one transaction and report progress."""
+        self.db_manager.add_flashcards(chunk)
+        summary["imported"] += len(chunk)
+        if self.progress_callback:
+            self.progress_callback({
+                "imported": summary["imported"],
+                "skipped": summary["skipped"],
+                "bytes_read": min(bytes_read, total_bytes),
+                "total_bytes": total_bytes,
+            })
@@ -1,32 +1,51 @@
 """
 main.py
 
-This file initializes and runs the FlashcardApp.
+This file initializes and runs the FlashcardApp, or the terminal study mode with --cli.
 """
 
-import tkinter as tk
-from flashcard_app import FlashcardApp
+import time
+
+# Taken before the other imports so the startup timing report includes them.
+STARTED_AT = time.perf_counter()
+
 import os
+import sys
 import logging
 
 # Ensure UTF-8 encoding is used
 os.environ['PYTHONUTF8'] = '1'
 
-def main():
+def run_gui():
     """
-    The main function to initialize and run the FlashcardApp.
+    Initialize and run the FlashcardApp.
     """
+    # Imported here so the terminal study mode never loads tkinter.
+    import tkinter as tk
+    from flashcard_app import FlashcardApp
+
     # Setup logging
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     
     try:
         root = tk.Tk()
-        app = FlashcardApp(root)
+        app = FlashcardApp(root, started_at=STARTED_AT)
         logging.info("FlashcardApp initialized successfully.")
         root.mainloop()
+        app.shutdown()
     except Exception as e:
         logging.error(f"An error occurred while running the application: {e}")
         raise
 
+def main():
+    """
+    The main function: run the terminal study mode with --cli, the FlashcardApp otherwise.
+    """
+    args = sys.argv[1:]
+    if "--cli" in args:
+        import study_cli
+        sys.exit(study_cli.main([arg for arg in args if arg != "--cli"], started_at=STARTED_AT))
+    run_gui()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+"""
+maintenance.py
+
+This file contains command-line maintenance tasks for the flashcards application's database.
+
+Usage:
+    python maintenance.py rebuild-stats [--db flashcards.db]
+    python maintenance.py update-rollups [--db flashcards.db]
+    python maintenance.py rebuild-rollups [--db flashcards.db]
+    python maintenance.py archive-history [--db flashcards.db]
+    python maintenance.py vacuum [--db flashcards.db]
+"""
+
+import argparse
+import logging
+from database_manager import DatabaseManager
+from constants import HISTORY_RETENTION_DAYS
+
+def rebuild_stats(db_manager, args):
+    """Recompute the per-card statistics table from the study history."""
+    if not db_manager.rebuild_card_stats():
+        raise SystemExit("Failed to rebuild card statistics.")
+    print("Card statistics rebuilt.")
+
+def update_rollups(db_manager, args):
+    """Fold the study results added since the last update into the daily rollups."""
+    print(f"Folded {db_manager.update_rollups()} study results into the daily rollups.")
+
+def rebuild_rollups(db_manager, args):
+    """Recompute the daily rollups from the full study history."""
+    print(f"Rebuilt the daily rollups from {db_manager.update_rollups(rebuild=True)} study results.")
+
+def archive_history(db_manager, args):
+    """Fold old study results into per-card totals."""
+    archived = db_manager.archive_history()
+    print(f"Archived {archived} study results older than {HISTORY_RETENTION_DAYS} days. "
+          "Run the vacuum task to reclaim the space.")
+
+def vacuum(db_manager, args):
+    """Rebuild the database file to reclaim free space."""
+    print(f"Reclaimed {db_manager.vacuum() / 1024 / 1024:.1f} MB.")
+
+TASKS = {
+    "rebuild-stats": (rebuild_stats, "Recompute the per-card statistics from the full study history."),
+    "update-rollups": (update_rollups, "Fold new study results into the daily rollups used by the trend charts."),
+    "rebuild-rollups": (rebuild_rollups, "Recompute the daily rollups from the full study history."),
+    "archive-history": (archive_history, "Fold study results older than FLASHCARDS_HISTORY_RETENTION_DAYS into per-card totals."),
+    "vacuum": (vacuum, "Rebuild the database file to reclaim the space freed by deletes and archiving."),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run maintenance tasks on a flashcards database.")
+    parser.add_argument("--db", default="flashcards.db", help="The database file.")
+    subparsers = parser.add_subparsers(dest="task", required=True)
+    for name, (_, help_text) in TASKS.items():
+        subparsers.add_parser(name, help=help_text)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with DatabaseManager(args.db) as db_manager:
+        TASKS[args.task][0](db_manager, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,708 @@
+"""
+migrations.py
+
+This file contains the versioned schema migrations for the flashcards application's database.
+
+The schema version is stored in SQLite's user_version pragma and every applied migration
+is recorded in the schema_migrations table. Run this file directly to upgrade a database
+file in place, or with --dry-run to see the query plans of the hot queries before and
+after the pending migrations without changing the file.
+"""
+
+import logging
+import sqlite3
+from constants import CARD_WEIGHT_HISTORY, MAX_CARD_WEIGHT, HISTORY_RETENTION_DAYS
+import scheduler
+
+def card_weight_sql(flashcard_id):
+    """
+    Return the SQL expression for the study weight of a card, from its most recent results.
+
+    Cards without results get MAX_CARD_WEIGHT, the others max(1, int(MAX_CARD_WEIGHT * (1 - correct_ratio)))
+    over their last CARD_WEIGHT_HISTORY results.
+
+    Parameters:
+    - flashcard_id (str): The SQL expression for the flashcard ID.
+    """
+    return f'''
+        COALESCE((
+            SELECT MAX(1, CAST({MAX_CARD_WEIGHT} * (1.0 - SUM(is_correct) * 1.0 / COUNT(*)) AS INTEGER))
+            FROM (
+                SELECT is_correct FROM study_history
+                WHERE flashcard_id = {flashcard_id}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT {CARD_WEIGHT_HISTORY}
+            )
+        ), {MAX_CARD_WEIGHT})
+    '''
+
+def create_card_weight_triggers(cursor):
+    """
+    (Re)create the card_stats triggers so they also keep card_stats.weight up to date, and
+    recompute every stored weight.
+
+    The weight rule is compiled into the triggers, so after changing CARD_WEIGHT_HISTORY or
+    MAX_CARD_WEIGHT this has to run again (maintenance.py rebuild-stats does).
+    """
+    cursor.execute('DROP TRIGGER IF EXISTS trg_study_history_insert_card_stats')
+    cursor.execute('DROP TRIGGER IF EXISTS trg_study_history_delete_card_stats')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_study_history_insert_card_stats
+        AFTER INSERT ON study_history
+        BEGIN
+            INSERT INTO card_stats (flashcard_id, correct, total, last_reviewed, weight)
+            VALUES (NEW.flashcard_id, CASE WHEN NEW.is_correct THEN 1 ELSE 0 END, 1, NEW.timestamp,
+                    {card_weight_sql('NEW.flashcard_id')})
+            ON CONFLICT (flashcard_id) DO UPDATE SET
+                correct = correct + excluded.correct,
+                total = total + 1,
+                last_reviewed = MAX(COALESCE(last_reviewed, excluded.last_reviewed), excluded.last_reviewed),
+                weight = excluded.weight;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_study_history_delete_card_stats
+        AFTER DELETE ON study_history
+        BEGIN
+            UPDATE card_stats SET
+                correct = correct - CASE WHEN OLD.is_correct THEN 1 ELSE 0 END,
+                total = total - 1,
+                last_reviewed = (SELECT MAX(timestamp) FROM study_history WHERE flashcard_id = OLD.flashcard_id),
+                weight = {card_weight_sql('OLD.flashcard_id')}
+            WHERE flashcard_id = OLD.flashcard_id;
+            DELETE FROM card_stats WHERE flashcard_id = OLD.flashcard_id AND total <= 0;
+        END
+    ''')
+    cursor.execute(f'UPDATE card_stats SET weight = {card_weight_sql("card_stats.flashcard_id")}')
+
+def replay_card_schedules(cursor):
+    """
+    Fill card_schedule by replaying the study history of every card through the scheduler,
+    so cards studied before scheduling existed keep their progress.
+    """
+    schedules = {}
+    cursor.execute('''
+        SELECT sh.flashcard_id, sh.is_correct, sh.timestamp
+        FROM study_history sh
+        JOIN flashcards f ON f.id = sh.flashcard_id
+        ORDER BY sh.flashcard_id, sh.timestamp, sh.id
+    ''')
+    for flashcard_id, is_correct, timestamp in cursor.fetchall():
+        schedule = schedules.get(flashcard_id) or scheduler.new_schedule()
+        schedules[flashcard_id] = scheduler.review(schedule, is_correct, timestamp)
+    cursor.executemany('''
+        INSERT OR REPLACE INTO card_schedule (flashcard_id, interval_days, ease, repetitions, due)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(flashcard_id, s["interval"], s["ease"], s["repetitions"], s["due"]) for flashcard_id, s in schedules.items()])
+
+def update_rollups(cursor):
+    """
+    Fold the study results added since the last run into the daily rollup tables.
+
+    rollup_state holds the highest study_history ID already folded in, so each run reads only
+    the new rows and adds their counts onto the existing daily totals. Study results of deleted
+    cards are counted under category 0 in daily_rollup.
+
+    Returns:
+    - int: The number of study results folded in.
+    """
+    row = cursor.execute("SELECT last_id FROM rollup_state WHERE name = 'study_history'").fetchone()
+    last_id = row[0] if row else 0
+    max_id = cursor.execute('SELECT MAX(id) FROM study_history').fetchone()[0]
+    if max_id is None or max_id <= last_id:
+        return 0
+    cursor.execute('''
+        INSERT INTO daily_rollup (day, category_id, correct, total)
+        SELECT date(sh.timestamp), COALESCE(f.category_id, 0), SUM(sh.is_correct), COUNT(*)
+        FROM study_history sh
+        LEFT JOIN flashcards f ON f.id = sh.flashcard_id
+        WHERE sh.id > ? AND sh.id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT (day, category_id) DO UPDATE SET
+            correct = correct + excluded.correct,
+            total = total + excluded.total
+    ''', (last_id, max_id))
+    cursor.execute('''
+        INSERT INTO card_daily_rollup (flashcard_id, day, correct, total)
+        SELECT sh.flashcard_id, date(sh.timestamp), SUM(sh.is_correct), COUNT(*)
+        FROM study_history sh
+        JOIN flashcards f ON f.id = sh.flashcard_id
+        WHERE sh.id > ? AND sh.id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT (flashcard_id, day) DO UPDATE SET
+            correct = correct + excluded.correct,
+            total = total + excluded.total
+    ''', (last_id, max_id))
+    folded = cursor.execute('SELECT COUNT(*) FROM study_history WHERE id > ? AND id <= ?', (last_id, max_id)).fetchone()[0]
+    cursor.execute('''
+        INSERT INTO rollup_state (name, last_id) VALUES ('study_history', ?)
+        ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id
+    ''', (max_id,))
+    return folded
+
+# Empties the rollup tables so update_rollups folds in the whole study history again.
+CLEAR_ROLLUPS = [
+    'DELETE FROM daily_rollup',
+    'DELETE FROM card_daily_rollup',
+    'DELETE FROM rollup_state',
+]
+
+def create_search_index(cursor):
+    """
+    Create the FTS5 index over flashcard questions and answers, with triggers that keep it in sync.
+
+    SQLite builds without FTS5 skip the index; DatabaseManager.search_flashcards then falls back
+    to a LIKE scan.
+    """
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS flashcards_fts USING fts5(
+                question, answer,
+                content='flashcards', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logging.warning(f"Full-text search is unavailable: {e}")
+        return
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_insert_fts
+        AFTER INSERT ON flashcards
+        BEGIN
+            INSERT INTO flashcards_fts (rowid, question, answer) VALUES (NEW.id, NEW.question, NEW.answer);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_delete_fts
+        AFTER DELETE ON flashcards
+        BEGIN
+            INSERT INTO flashcards_fts (flashcards_fts, rowid, question, answer)
+            VALUES ('delete', OLD.id, OLD.question, OLD.answer);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_update_fts
+        AFTER UPDATE OF question, answer ON flashcards
+        BEGIN
+            INSERT INTO flashcards_fts (flashcards_fts, rowid, question, answer)
+            VALUES ('delete', OLD.id, OLD.question, OLD.answer);
+            INSERT INTO flashcards_fts (rowid, question, answer) VALUES (NEW.id, NEW.question, NEW.answer);
+        END
+    ''')
+    cursor.execute("INSERT INTO flashcards_fts (flashcards_fts) VALUES ('rebuild')")
+
+# Recomputes card_stats from the full study history.
+REBUILD_CARD_STATS = [
+    'DELETE FROM card_stats',
+    '''
+    INSERT INTO card_stats (flashcard_id, correct, total, last_reviewed)
+    SELECT sh.flashcard_id, SUM(CASE WHEN sh.is_correct THEN 1 ELSE 0 END), COUNT(*), MAX(sh.timestamp)
+    FROM study_history sh
+    JOIN flashcards f ON f.id = sh.flashcard_id
+    GROUP BY sh.flashcard_id
+    ''',
+]
+
+# Adds the totals of archived study results back after REBUILD_CARD_STATS.
+ADD_ARCHIVED_CARD_STATS = '''
+    INSERT INTO card_stats (flashcard_id, correct, total, last_reviewed)
+    SELECT a.flashcard_id, a.correct, a.total, a.last_reviewed
+    FROM study_history_archive a
+    JOIN flashcards f ON f.id = a.flashcard_id
+    WHERE a.total > 0
+    ON CONFLICT (flashcard_id) DO UPDATE SET
+        correct = correct + excluded.correct,
+        total = total + excluded.total,
+        last_reviewed = MAX(COALESCE(last_reviewed, excluded.last_reviewed), excluded.last_reviewed)
+'''
+
+def archive_history(cursor, retention_days=HISTORY_RETENTION_DAYS, keep_per_card=CARD_WEIGHT_HISTORY):
+    """
+    Move old study results into the per-card totals of study_history_archive.
+
+    A result is archived when it is older than retention_days and is not one of the last
+    keep_per_card results of its card, so card weights, which read the most recent results,
+    do not change. card_stats already counts the archived results and is left as it is; the
+    daily rollups are brought up to date first so the trend charts keep them too.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): A cursor on the writer connection.
+    - retention_days (int): The age in days after which results are archived.
+    - keep_per_card (int): The number of most recent results kept for every card.
+
+    Returns:
+    - int: The number of study results archived.
+    """
+    update_rollups(cursor)
+    cursor.execute('''
+        CREATE TEMP TABLE IF NOT EXISTS archived_history (
+            id INTEGER PRIMARY KEY,
+            flashcard_id INTEGER,
+            is_correct BOOLEAN,
+            timestamp DATETIME
+        )
+    ''')
+    cursor.execute('DELETE FROM temp.archived_history')
+    cursor.execute('''
+        INSERT INTO temp.archived_history (id, flashcard_id, is_correct, timestamp)
+        SELECT id, flashcard_id, is_correct, timestamp
+        FROM (
+            SELECT id, flashcard_id, is_correct, timestamp,
+                   ROW_NUMBER() OVER (PARTITION BY flashcard_id ORDER BY timestamp DESC, id DESC) AS recency
+            FROM study_history
+        )
+        WHERE recency > ? AND timestamp < datetime('now', ?)
+    ''', (keep_per_card, f"-{int(retention_days)} days"))
+    archived = cursor.execute('SELECT COUNT(*) FROM temp.archived_history').fetchone()[0]
+    if archived:
+        cursor.execute('''
+            INSERT INTO study_history_archive (flashcard_id, correct, total, first_reviewed, last_reviewed)
+            SELECT flashcard_id, SUM(CASE WHEN is_correct THEN 1 ELSE 0 END), COUNT(*), MIN(timestamp), MAX(timestamp)
+            FROM temp.archived_history
+            GROUP BY flashcard_id
+            ON CONFLICT (flashcard_id) DO UPDATE SET
+                correct = correct + excluded.correct,
+                total = total + excluded.total,
+                first_reviewed = MIN(first_reviewed, excluded.first_reviewed),
+                last_reviewed = MAX(last_reviewed, excluded.last_reviewed)
+        ''')
+        # The delete trigger would subtract the archived results from card_stats, which must
+        # keep counting them, so it is set aside while they are removed.
+        trigger_sql = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_study_history_delete_card_stats'").fetchone()
+        cursor.execute('DROP TRIGGER IF EXISTS trg_study_history_delete_card_stats')
+        cursor.execute('DELETE FROM study_history WHERE id IN (SELECT id FROM temp.archived_history)')
+        if trigger_sql:
+            cursor.execute(trigger_sql[0])
+    cursor.execute('DELETE FROM temp.archived_history')
+    return archived
+
+def recreate_empty_table(cursor, table):
+    """
+    Empty a table by dropping and recreating it with its indexes, triggers and AUTOINCREMENT counter.
+
+    Dropping a table frees its pages in one step, where a DELETE visits every row and runs
+    the row triggers for each of them.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): A cursor on the writer connection, inside a transaction.
+    - table (str): The name of the table.
+    """
+    # The table comes first; indexes behind constraints have no SQL and come back with it.
+    schema = cursor.execute('''
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = ? AND sql IS NOT NULL
+        ORDER BY type != 'table', type = 'trigger'
+    ''', (table,)).fetchall()
+    sequence = cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+    cursor.execute(f'DROP TABLE {table}')
+    for (sql,) in schema:
+        cursor.execute(sql)
+    if sequence:
+        # IDs must not be reused: the rollup high-water mark and incremental exports rely on it.
+        cursor.execute('DELETE FROM sqlite_sequence WHERE name = ?', (table,))
+        cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, sequence[0]))
+
+# Each migration is (version, description, steps). A step is either an SQL statement
+# or a callable that receives the cursor, for changes that cannot be written as plain SQL.
+MIGRATIONS = [
+    (1, "Create categories, flashcards and study_history tables", [
+        '''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            color TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS flashcards (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            category_id INTEGER,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS study_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            flashcard_id INTEGER,
+            is_correct BOOLEAN,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (flashcard_id) REFERENCES flashcards (id)
+        )
+        ''',
+    ]),
+    # categories(name) is already served by the index behind its UNIQUE constraint.
+    (2, "Add covering index on study history and index on flashcard category", [
+        '''
+        CREATE INDEX IF NOT EXISTS idx_study_history_card_time
+        ON study_history (flashcard_id, timestamp, id, is_correct)
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_flashcards_category ON flashcards (category_id)',
+    ]),
+    # card_stats is kept in sync with study_history by triggers, so statistics are a plain read.
+    (3, "Add trigger-maintained card_stats aggregate table", [
+        '''
+        CREATE TABLE IF NOT EXISTS card_stats (
+            flashcard_id INTEGER PRIMARY KEY,
+            correct INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            last_reviewed DATETIME,
+            FOREIGN KEY (flashcard_id) REFERENCES flashcards (id)
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_study_history_insert_card_stats
+        AFTER INSERT ON study_history
+        BEGIN
+            INSERT INTO card_stats (flashcard_id, correct, total, last_reviewed)
+            VALUES (NEW.flashcard_id, CASE WHEN NEW.is_correct THEN 1 ELSE 0 END, 1, NEW.timestamp)
+            ON CONFLICT (flashcard_id) DO UPDATE SET
+                correct = correct + excluded.correct,
+                total = total + 1,
+                last_reviewed = MAX(COALESCE(last_reviewed, excluded.last_reviewed), excluded.last_reviewed);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_study_history_delete_card_stats
+        AFTER DELETE ON study_history
+        BEGIN
+            UPDATE card_stats SET
+                correct = correct - CASE WHEN OLD.is_correct THEN 1 ELSE 0 END,
+                total = total - 1,
+                last_reviewed = (SELECT MAX(timestamp) FROM study_history WHERE flashcard_id = OLD.flashcard_id)
+            WHERE flashcard_id = OLD.flashcard_id;
+            DELETE FROM card_stats WHERE flashcard_id = OLD.flashcard_id AND total <= 0;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_delete_card_stats
+        AFTER DELETE ON flashcards
+        BEGIN
+            DELETE FROM card_stats WHERE flashcard_id = OLD.id;
+        END
+        ''',
+        *REBUILD_CARD_STATS,
+    ]),
+    (4, "Add FTS5 search index over flashcard questions and answers", [
+        create_search_index,
+    ]),
+    # Lets the flashcard list page through cards sorted by question without sorting the table.
+    (5, "Add index on flashcard question for sorted paging", [
+        'CREATE INDEX IF NOT EXISTS idx_flashcards_question ON flashcards (question, id)',
+    ]),
+    # Storing the weight lets a study deck be drawn in SQL without reading any study history.
+    (6, "Add trigger-maintained study weight to card_stats", [
+        f'ALTER TABLE card_stats ADD COLUMN weight INTEGER NOT NULL DEFAULT {MAX_CARD_WEIGHT}',
+        create_card_weight_triggers,
+    ]),
+    # Cards without a row have never been reviewed and are due immediately.
+    (7, "Add card_schedule table with an index on due time", [
+        '''
+        CREATE TABLE IF NOT EXISTS card_schedule (
+            flashcard_id INTEGER PRIMARY KEY,
+            interval_days INTEGER NOT NULL,
+            ease REAL NOT NULL,
+            repetitions INTEGER NOT NULL,
+            due DATETIME NOT NULL,
+            FOREIGN KEY (flashcard_id) REFERENCES flashcards (id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_card_schedule_due ON card_schedule (due)',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_delete_card_schedule
+        AFTER DELETE ON flashcards
+        BEGIN
+            DELETE FROM card_schedule WHERE flashcard_id = OLD.id;
+        END
+        ''',
+        replay_card_schedules,
+    ]),
+    # The success rate expression must match ACCURACY_SQL in database_manager.py for the
+    # planner to walk this index instead of sorting every card.
+    (8, "Add card_stats indexes for sorted statistics pages", [
+        'CREATE INDEX IF NOT EXISTS idx_card_stats_accuracy ON card_stats (CAST(correct AS REAL) / total, flashcard_id)',
+        'CREATE INDEX IF NOT EXISTS idx_card_stats_total ON card_stats (total, flashcard_id)',
+    ]),
+    # Trend charts read a few hundred daily rows instead of the raw study history. The
+    # rollups are updated incrementally by update_rollups, not by triggers, so recording a
+    # study result stays cheap.
+    (9, "Add daily study rollup tables", [
+        '''
+        CREATE TABLE IF NOT EXISTS daily_rollup (
+            day TEXT NOT NULL,
+            category_id INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (day, category_id)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS card_daily_rollup (
+            flashcard_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            correct INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (flashcard_id, day)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_delete_card_daily_rollup
+        AFTER DELETE ON flashcards
+        BEGIN
+            DELETE FROM card_daily_rollup WHERE flashcard_id = OLD.id;
+        END
+        ''',
+        update_rollups,
+    ]),
+    # Archived study results only survive as per-card totals; see archive_history.
+    (10, "Add study_history_archive table for per-card totals of archived results", [
+        '''
+        CREATE TABLE IF NOT EXISTS study_history_archive (
+            flashcard_id INTEGER PRIMARY KEY,
+            correct INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            first_reviewed DATETIME,
+            last_reviewed DATETIME
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_flashcards_delete_study_history_archive
+        AFTER DELETE ON flashcards
+        BEGIN
+            DELETE FROM study_history_archive WHERE flashcard_id = OLD.id;
+        END
+        ''',
+    ]),
+]
+
+# The queries whose plans are shown by a dry run, with representative parameters.
+HOT_QUERIES = [
+    ("get_study_history", '''
+        SELECT is_correct FROM study_history
+        WHERE flashcard_id = ?
+        ORDER BY timestamp DESC, id DESC
+        LIMIT 10
+    ''', (1,)),
+    ("get_flashcards_by_categories", '''
+        SELECT f.id, f.question, f.answer, c.name, c.color
+        FROM flashcards f
+        JOIN categories c ON f.category_id = c.id
+        WHERE c.id IN (?, ?)
+    ''', (1, 2)),
+    ("delete_category", 'UPDATE flashcards SET category_id = ? WHERE category_id = ?', (1, 2)),
+    ("get_category_id_by_name", 'SELECT id FROM categories WHERE name = ?', ("Default",)),
+    ("get_flashcard_statistics", '''
+        SELECT f.question, c.name, COALESCE(cs.correct, 0), COALESCE(cs.total, 0), cs.last_reviewed
+        FROM flashcards f
+        LEFT JOIN card_stats cs ON cs.flashcard_id = f.id
+        LEFT JOIN categories c ON f.category_id = c.id
+    ''', ()),
+    ("get_statistics_page", '''
+        SELECT f.id, f.question, c.name, cs.correct, cs.total, CAST(cs.correct AS REAL) / cs.total
+        FROM card_stats cs JOIN flashcards f ON f.id = cs.flashcard_id JOIN categories c ON c.id = f.category_id
+        WHERE cs.total >= ? AND CAST(cs.correct AS REAL) / cs.total >= ?
+            AND (CAST(cs.correct AS REAL) / cs.total, cs.flashcard_id) > (?, ?)
+        ORDER BY CAST(cs.correct AS REAL) / cs.total, cs.flashcard_id
+        LIMIT 100
+    ''', (1, 0.5, 0.5, 1)),
+    ("get_daily_activity", '''
+        SELECT day, SUM(correct), SUM(total)
+        FROM daily_rollup
+        WHERE day >= ?
+        GROUP BY day
+        ORDER BY day
+    ''', ("2026-01-01",)),
+    ("get_due_flashcards", '''
+        SELECT s.flashcard_id
+        FROM card_schedule s
+        CROSS JOIN flashcards f ON f.id = s.flashcard_id
+        WHERE s.due <= ? AND f.category_id IN (?, ?)
+        ORDER BY s.due
+        LIMIT 20
+    ''', ("2026-01-01 00:00:00", 1, 2)),
+    ("get_flashcard_page (category)", '''
+        SELECT f.id, f.question, f.answer, c.name
+        FROM categories c CROSS JOIN flashcards f ON f.category_id = c.id
+        ORDER BY c.name DESC, f.id DESC
+        LIMIT 100
+    ''', ()),
+    ("get_flashcard_page (category, after key)", '''
+        SELECT f.id, f.question, f.answer, c.name
+        FROM categories c CROSS JOIN flashcards f ON f.category_id = c.id
+        WHERE c.name = ? AND f.id > ?
+        ORDER BY c.name, f.id
+        LIMIT 100
+    ''', ("Default", 1)),
+]
+
+def get_schema_version(conn):
+    """
+    Get the schema version of a database.
+
+    Parameters:
+    - conn (sqlite3.Connection): The database connection.
+
+    Returns:
+    - int: The value of the user_version pragma.
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def get_pending_migrations(conn):
+    """
+    Get the migrations that have not been applied to a database yet.
+
+    Parameters:
+    - conn (sqlite3.Connection): The database connection.
+
+    Returns:
+    - list: The pending (version, description, steps) tuples in order.
+    """
+    current_version = get_schema_version(conn)
+    return [migration for migration in MIGRATIONS if migration[0] > current_version]
+
+def apply_migration(cursor, migration):
+    """
+    Apply a single migration and record it. The caller owns the transaction.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): The cursor to run the migration with.
+    - migration (tuple): The (version, description, steps) tuple.
+    """
+    version, description, steps = migration
+    for step in steps:
+        if callable(step):
+            step(cursor)
+        else:
+            cursor.execute(step)
+    cursor.execute('INSERT INTO schema_migrations (version, description) VALUES (?, ?)', (version, description))
+    cursor.execute(f'PRAGMA user_version = {int(version)}')
+
+def migrate(conn):
+    """
+    Upgrade a database to the latest schema version in place.
+
+    Every migration runs in its own transaction, so an interrupted upgrade leaves the
+    database at the last fully applied version.
+
+    Parameters:
+    - conn (sqlite3.Connection): The database connection.
+
+    Returns:
+    - int: The schema version after the upgrade.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        for migration in get_pending_migrations(conn):
+            cursor.execute('BEGIN')
+            try:
+                apply_migration(cursor, migration)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            logging.info(f"Applied database migration {migration[0]}: {migration[1]}")
+        return get_schema_version(conn)
+    except sqlite3.Error as e:
+        logging.error(f"Error migrating database: {e}")
+        raise
+    finally:
+        cursor.close()
+
+def explain_hot_queries(conn):
+    """
+    Get the query plans of the hot queries.
+
+    Parameters:
+    - conn (sqlite3.Connection): The database connection.
+
+    Returns:
+    - list: A list of (name, plan lines) tuples.
+    """
+    plans = []
+    for name, query, params in HOT_QUERIES:
+        try:
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+            plans.append((name, [row[-1] for row in rows]))
+        except sqlite3.Error as e:
+            plans.append((name, [f"unavailable: {e}"]))
+    return plans
+
+def dry_run(conn):
+    """
+    Print the hot query plans before and after the pending migrations, then roll them back.
+
+    Parameters:
+    - conn (sqlite3.Connection): The database connection.
+    """
+    pending = get_pending_migrations(conn)
+    print(f"Schema version: {get_schema_version(conn)}")
+    if not pending:
+        print("No pending migrations.")
+        return
+
+    before = explain_hot_queries(conn)
+    cursor = conn.cursor()
+    cursor.execute('BEGIN')
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        for migration in pending:
+            print(f"Would apply migration {migration[0]}: {migration[1]}")
+            apply_migration(cursor, migration)
+        after = explain_hot_queries(conn)
+    finally:
+        conn.rollback()
+        cursor.close()
+
+    for (name, before_plan), (_, after_plan) in zip(before, after):
+        print(f"\n{name}")
+        print("  before:")
+        for line in before_plan:
+            print(f"    {line}")
+        print("  after:")
+        for line in after_plan:
+            print(f"    {line}")
+
+def main():
+    # Imported here: the app imports this module at startup and never uses the command line.
+    import argparse
+    parser = argparse.ArgumentParser(description="Upgrade a flashcards database to the latest schema.")
+    parser.add_argument("db_file", nargs="?", default="flashcards.db", help="The database file to upgrade.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Show query plans before and after the pending migrations without applying them.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    conn = sqlite3.connect(args.db_file)
+    try:
+        if args.dry_run:
+            dry_run(conn)
+        else:
+            version = migrate(conn)
+            print(f"Database '{args.db_file}' is at schema version {version}.")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
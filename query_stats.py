@@ -0,0 +1,246 @@
+"""
+query_stats.py
+
+This file contains the QueryStats class, which records the call counts, latencies and row counts
+of DatabaseManager methods and logs slow calls with the query plans of their statements, and the
+instrumented class decorator that routes the methods through it.
+"""
+
+import bisect
+import collections
+import datetime
+import functools
+import logging
+import threading
+import time
+import types
+from constants import SLOW_QUERY_MS, SLOW_QUERY_LOG, SLOW_QUERY_KEEP
+
+# Upper bounds in milliseconds of the latency histogram buckets: 10 microseconds to about two
+# minutes, each 15% wider than the last, so percentiles are accurate to within 15%.
+BUCKET_BOUNDS_MS = [0.01 * 1.15 ** i for i in range(118)]
+
+# The number of statements of a slow call whose query plans are logged.
+SLOW_QUERY_STATEMENTS = 5
+
+# Only these statements are explained; the rest (PRAGMA, BEGIN, DDL) have no useful plan.
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# The code flag of generator functions (inspect.CO_GENERATOR; inspect is slow to import).
+CO_GENERATOR = 0x20
+
+slow_query_logger = logging.getLogger("flashcards.slow_queries")
+
+def result_rows(result):
+    """Return the number of rows in a method result: its length, 0 for None, 1 for a single value."""
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        # A dict keyed by column names is one row; others, such as card weights, map IDs to rows.
+        return 1 if isinstance(next(iter(result), None), str) else len(result)
+    if isinstance(result, (list, tuple, set)):
+        return len(result)
+    return 1
+
+class MethodStats:
+    """The counters and latency histogram of one method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, elapsed_ms, rows, failed):
+        """Count one call."""
+        self.calls += 1
+        self.errors += failed
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction):
+        """Estimate a latency percentile as the upper bound of the bucket it falls in."""
+        target = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+class QueryStats:
+    """
+    Per-method latency and row count statistics for a DatabaseManager.
+
+    Calls are timed by the methods wrapped by instrumented. While a call runs, the SQL of the
+    statements it executes is collected from the connections' trace callback, so a call slower
+    than slow_ms can be logged with the EXPLAIN QUERY PLAN of its statements. Nested calls are
+    counted under their own method as well, and their statements belong to the outer call too.
+    """
+
+    def __init__(self, explain=None, slow_ms=SLOW_QUERY_MS, log_file=SLOW_QUERY_LOG, keep=SLOW_QUERY_KEEP):
+        """
+        Initialize the QueryStats.
+
+        Parameters:
+        - explain (callable): A function (sql) that returns the query plan of a statement as a
+          list of lines. Without it, slow calls are logged without plans.
+        - slow_ms (float): The duration in milliseconds from which a call is logged as slow.
+        - log_file (str): The file slow calls are appended to, or "" to only keep them in memory.
+        - keep (int): The number of recent slow calls kept for slow_queries().
+        """
+        self.explain = explain
+        self.slow_ms = slow_ms
+        self.methods = {}
+        self.recent_slow = collections.deque(maxlen=max(1, keep))
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.time()
+        if log_file and not slow_query_logger.handlers:
+            handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            slow_query_logger.addHandler(handler)
+            slow_query_logger.setLevel(logging.INFO)
+            slow_query_logger.propagate = False
+
+    def trace(self, sql):
+        """Collect a statement for the calls running on this thread. Set as the connections' trace callback."""
+        frames = getattr(self.local, "frames", None)
+        if frames and len(frames[-1]) < SLOW_QUERY_STATEMENTS:
+            frames[-1].append(sql)
+
+    def call(self, name, method, args, kwargs):
+        """
+        Run and time one method call.
+
+        Parameters:
+        - name (str): The name of the method.
+        - method (callable): The bound method.
+        - args (tuple): The positional arguments.
+        - kwargs (dict): The keyword arguments.
+
+        Returns:
+        - object: The result of the method.
+        """
+        frames = getattr(self.local, "frames", None)
+        if frames is None:
+            frames = self.local.frames = []
+        statements = []
+        frames.append(statements)
+        failed = False
+        result = None
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+            return result
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            frames.pop()
+            if frames:
+                outer = frames[-1]
+                outer.extend(statements[:SLOW_QUERY_STATEMENTS - len(outer)])
+            with self.lock:
+                stats = self.methods.get(name)
+                if stats is None:
+                    stats = self.methods[name] = MethodStats()
+                stats.add(elapsed_ms, result_rows(result), failed)
+            # Nested calls are left to the outermost one, which sees all the statements.
+            if elapsed_ms >= self.slow_ms and not frames:
+                self.log_slow(name, elapsed_ms, statements)
+
+    def log_slow(self, name, elapsed_ms, statements):
+        """Record a slow call with the query plans of its statements."""
+        plans = []
+        for sql in statements:
+            plan = []
+            if self.explain and sql.lstrip().upper().startswith(EXPLAINABLE):
+                try:
+                    plan = self.explain(sql)
+                except Exception as e:
+                    plan = [f"(no plan: {e})"]
+            plans.append((" ".join(sql.split()), plan))
+        entry = {"time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "method": name,
+                 "elapsed_ms": elapsed_ms, "statements": plans}
+        with self.lock:
+            self.recent_slow.append(entry)
+        lines = [f"{name} took {elapsed_ms:.1f} ms"]
+        for sql, plan in plans:
+            lines.append(f"  {sql}")
+            lines.extend(f"    {step}" for step in plan)
+        slow_query_logger.info("\n".join(lines))
+
+    def snapshot(self):
+        """
+        Return the statistics of every method called so far, slowest in total first.
+
+        Returns:
+        - list: One dict per method with "method", "calls", "errors", "total_ms", "mean_ms",
+          "p50_ms", "p95_ms", "p99_ms", "max_ms", "rows" and "mean_rows".
+        """
+        with self.lock:
+            rows = [{
+                "method": name,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "total_ms": stats.total_ms,
+                "mean_ms": stats.total_ms / stats.calls,
+                "p50_ms": stats.percentile(0.5),
+                "p95_ms": stats.percentile(0.95),
+                "p99_ms": stats.percentile(0.99),
+                "max_ms": stats.max_ms,
+                "rows": stats.rows,
+                "mean_rows": stats.rows / stats.calls,
+            } for name, stats in self.methods.items()]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def slow_queries(self):
+        """Return the recent slow calls, newest first."""
+        with self.lock:
+            return list(reversed(self.recent_slow))
+
+    def reset(self):
+        """Forget all statistics and slow calls."""
+        with self.lock:
+            self.methods.clear()
+            self.recent_slow.clear()
+            self.started = time.time()
+
+def instrumented(exclude=()):
+    """
+    Return a class decorator that times the public methods of a class through its query_stats.
+
+    Generator methods are left alone, since only their creation could be timed. The methods
+    run untimed while the instance's query_stats attribute is missing or None.
+
+    Parameters:
+    - exclude (iterable): The names of public methods not to time.
+
+    Returns:
+    - callable: The class decorator.
+    """
+    def decorate(cls):
+        for name, attr in list(vars(cls).items()):
+            if (name.startswith("_") or name in exclude or not isinstance(attr, types.FunctionType)
+                    or attr.__code__.co_flags & CO_GENERATOR):
+                continue
+            setattr(cls, name, timed(name, attr))
+        return cls
+    return decorate
+
+def timed(name, method):
+    """Wrap one method so its calls are recorded by the instance's query_stats."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stats = getattr(self, "query_stats", None)
+        if stats is None:
+            return method(self, *args, **kwargs)
+        return stats.call(name, method, (self, *args), kwargs)
+    return wrapper
@@ -0,0 +1,127 @@
+"""
+review_writer.py
+
+This file contains the ReviewWriter class, which buffers study results and the spaced repetition
+schedules they produce and writes them to the database in batches.
+"""
+
+import logging
+import time
+import scheduler
+from constants import REVIEW_FLUSH_SIZE, REVIEW_FLUSH_INTERVAL_MS
+
+class ReviewWriter:
+    """
+    A write-behind buffer for study results.
+
+    Results are queued in memory and written with a single executemany transaction once
+    flush_size results are pending or the oldest pending result is flush_interval_ms old.
+    A crash therefore loses at most one flush window of results.
+
+    Each result also advances the card's spaced repetition schedule right away; the new
+    schedules are written in the same transaction as the results.
+    """
+
+    def __init__(self, db_manager, flush_size=REVIEW_FLUSH_SIZE, flush_interval_ms=REVIEW_FLUSH_INTERVAL_MS, schedule=None):
+        """
+        Initialize the ReviewWriter.
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager to write the results to.
+        - flush_size (int): The number of pending results that triggers a flush.
+        - flush_interval_ms (int): The maximum age in milliseconds of a pending result.
+        - schedule (callable): A function (delay_ms, callback) that runs callback later, such as
+          tk.Tk.after. Without it, results are flushed by size, by flush_if_due or explicitly.
+        """
+        self.db_manager = db_manager
+        self.flush_size = max(1, flush_size)
+        self.flush_interval_ms = flush_interval_ms
+        self.schedule = schedule
+        self.pending = []
+        self.pending_schedules = {}
+        # The time.monotonic() value at which the oldest pending result was queued.
+        self.oldest_pending = None
+        self.timer_scheduled = False
+
+    def add(self, flashcard_id, is_correct):
+        """
+        Queue a study result.
+
+        Parameters:
+        - flashcard_id (int): The ID of the flashcard.
+        - is_correct (bool): Whether the user's answer was correct.
+        """
+        timestamp = scheduler.utc_now()
+        if not self.pending:
+            self.oldest_pending = time.monotonic()
+        self.pending.append((flashcard_id, is_correct, timestamp))
+        schedule = self.get_schedule(flashcard_id)
+        self.pending_schedules[flashcard_id] = scheduler.review(schedule, is_correct, timestamp)
+        if len(self.pending) >= self.flush_size:
+            self.flush()
+        elif self.schedule and not self.timer_scheduled:
+            self.timer_scheduled = True
+            self.schedule(self.flush_interval_ms, self.on_timer)
+
+    def get_schedule(self, flashcard_id):
+        """
+        Get the current schedule of a card, including reviews that are not written yet.
+
+        Parameters:
+        - flashcard_id (int): The ID of the flashcard.
+
+        Returns:
+        - dict: The schedule of the card.
+        """
+        schedule = self.pending_schedules.get(flashcard_id)
+        if schedule is None:
+            schedule = self.db_manager.get_card_schedule(flashcard_id) or scheduler.new_schedule()
+        return schedule
+
+    def flush_due_in(self):
+        """
+        Get how long until the oldest pending result is flush_interval_ms old.
+
+        Returns:
+        - float: The time in seconds, 0 if it is already due, or None if nothing is pending.
+        """
+        if not self.pending:
+            return None
+        return max(0.0, self.oldest_pending + self.flush_interval_ms / 1000 - time.monotonic())
+
+    def flush_if_due(self):
+        """
+        Flush the pending results if the oldest of them is flush_interval_ms old. For callers
+        without a schedule function, such as worker threads, to call after each event.
+
+        Returns:
+        - bool: False if a flush failed, True otherwise.
+        """
+        if self.flush_due_in() == 0:
+            return self.flush()
+        return True
+
+    def on_timer(self):
+        """Flush the results that were pending when the flush interval elapsed."""
+        self.timer_scheduled = False
+        self.flush()
+
+    def flush(self):
+        """
+        Write all pending results to the database in one transaction.
+
+        Returns:
+        - bool: True if there was nothing to write or the results were written, False otherwise.
+        """
+        if not self.pending:
+            return True
+        batch, self.pending = self.pending, []
+        schedules, self.pending_schedules = self.pending_schedules, {}
+        if self.db_manager.add_study_results(batch, list(schedules.items())):
+            return True
+        # Keep the results so the next flush can retry them, one flush interval from now.
+        self.oldest_pending = time.monotonic()
+        self.pending = batch + self.pending
+        self.pending_schedules = {**schedules, **self.pending_schedules}
+        logging.error(f"Failed to write {len(batch)} study results; they will be retried.")
+        return False
@@ -0,0 +1,78 @@
+"""
+sampling.py
+
+This file contains weighted sampling without replacement, used to draw study decks in which
+cards with a higher weight are more likely to appear and no card appears twice.
+"""
+
+import heapq
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this population size the pure Python path is faster than setting up NumPy arrays.
+VECTORIZE_THRESHOLD = 1000
+
+def weighted_sample(population, weights, k, seed=None):
+    """
+    Draw k distinct items, each with probability proportional to its weight.
+
+    Every item gets the key log(u) / weight for a uniform random u (Efraimidis and Spirakis),
+    and the k items with the largest keys are returned in descending key order. Drawing them in
+    that order is the same as drawing items one at a time with probability proportional to the
+    weight of the remaining items, so the result is already shuffled. It takes one pass over
+    the population and keeps only k items in memory; large populations use NumPy when it is
+    installed.
+
+    Parameters:
+    - population (sequence): The items to draw from.
+    - weights (sequence): The positive weight of each item. Items with a weight of 0 are never drawn.
+    - k (int): The number of items to draw. Fewer are returned when there are not enough items.
+    - seed (int): The random seed, for a reproducible draw. The same seed gives the same draw
+      for the same population size and NumPy availability.
+
+    Returns:
+    - list: The drawn items.
+    """
+    if len(population) != len(weights):
+        raise ValueError("population and weights must have the same length.")
+    if k <= 0 or not population:
+        return []
+    if np is not None and len(population) >= VECTORIZE_THRESHOLD:
+        return weighted_sample_numpy(population, weights, k, seed)
+
+    rng = random.Random(seed)
+    # 1 - random() lies in (0, 1], so the logarithm is always defined.
+    keys = ((math.log(1.0 - rng.random()) / weight, index)
+            for index, weight in enumerate(weights) if weight > 0)
+    return [population[index] for _, index in heapq.nlargest(k, keys)]
+
+def weighted_sample_numpy(population, weights, k, seed=None):
+    """
+    Draw k distinct items with NumPy, with the same distribution as weighted_sample.
+
+    Parameters:
+    - population (sequence): The items to draw from.
+    - weights (sequence): The weight of each item.
+    - k (int): The number of items to draw.
+    - seed (int): The random seed.
+
+    Returns:
+    - list: The drawn items.
+    """
+    weights = np.asarray(weights, dtype=float)
+    rng = np.random.default_rng(seed)
+    with np.errstate(divide="ignore"):
+        keys = np.log(1.0 - rng.random(len(weights))) / weights
+    keys[weights <= 0] = -np.inf
+    k = min(k, int(np.count_nonzero(weights > 0)))
+    if k == 0:
+        return []
+    # argpartition finds the k largest keys in linear time; only those k are sorted.
+    top = np.argpartition(-keys, k - 1)[:k]
+    top = top[np.argsort(-keys[top], kind="stable")]
+    return [population[index] for index in top]
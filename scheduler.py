@@ -0,0 +1,56 @@
+"""
+scheduler.py
+
+This file contains the SM-2 spaced repetition scheduler, which decides when each flashcard is
+due for review again.
+"""
+
+from datetime import datetime, timedelta, timezone
+from constants import SM2_INITIAL_EASE, SM2_MIN_EASE, SM2_MAX_INTERVAL_DAYS, SM2_CORRECT_QUALITY, SM2_INCORRECT_QUALITY
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def utc_now():
+    """Return the current UTC time as a study timestamp string."""
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+def new_schedule():
+    """
+    Return the schedule of a card that has never been reviewed.
+
+    Returns:
+    - dict: The schedule with "interval" (days), "ease", "repetitions" and "due" (None, due now).
+    """
+    return {"interval": 0, "ease": SM2_INITIAL_EASE, "repetitions": 0, "due": None}
+
+def review(schedule, is_correct, timestamp):
+    """
+    Compute the schedule of a card after a review, following SM-2.
+
+    A failed card starts over with a one-day interval. A passed card is due again after one day,
+    then six days, then the previous interval times the ease factor, up to SM2_MAX_INTERVAL_DAYS.
+    The ease factor moves with the answer quality and never drops below SM2_MIN_EASE.
+
+    Parameters:
+    - schedule (dict): The current schedule of the card, see new_schedule.
+    - is_correct (bool): Whether the user's answer was correct.
+    - timestamp (str): The UTC time of the review, as "%Y-%m-%d %H:%M:%S" or another ISO 8601 form.
+
+    Returns:
+    - dict: The new schedule.
+    """
+    quality = SM2_CORRECT_QUALITY if is_correct else SM2_INCORRECT_QUALITY
+    if quality >= 3:
+        repetitions = schedule["repetitions"] + 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = min(SM2_MAX_INTERVAL_DAYS, round(schedule["interval"] * schedule["ease"]))
+    else:
+        repetitions = 0
+        interval = 1
+    ease = max(SM2_MIN_EASE, schedule["ease"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    due = datetime.fromisoformat(timestamp) + timedelta(days=interval)
+    return {"interval": interval, "ease": ease, "repetitions": repetitions, "due": due.strftime(TIMESTAMP_FORMAT)}
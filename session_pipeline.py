@@ -0,0 +1,154 @@
+"""
+session_pipeline.py
+
+This file contains the SessionPipeline class, which loads the upcoming cards of a study session
+and records its results on a worker thread.
+"""
+
+import logging
+import queue
+import threading
+from review_writer import ReviewWriter
+from constants import STUDY_PREFETCH_COUNT, REVIEW_FLUSH_INTERVAL_MS
+
+class SessionPipeline:
+    """
+    A worker thread that keeps the next cards of a study session ready and writes its results.
+
+    The Tk thread only exchanges messages with the worker through queues: it takes prepared
+    cards from the ready queue (polling with after() when the worker is behind) and hands
+    results to the worker, so neither showing the next question nor recording an answer waits
+    for the database.
+    """
+
+    def __init__(self, db_manager, deck_ids, prefetch=STUDY_PREFETCH_COUNT, flush_interval_ms=REVIEW_FLUSH_INTERVAL_MS):
+        """
+        Initialize the SessionPipeline and start its worker thread.
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager.
+        - deck_ids (list): The flashcard IDs of the session in study order.
+        - prefetch (int): The number of cards kept ready ahead of the current card.
+        - flush_interval_ms (int): How long the worker may hold an unwritten result.
+        """
+        self.db_manager = db_manager
+        self.deck_ids = list(deck_ids)
+        self.prefetch = max(1, prefetch)
+        self.flush_interval_ms = flush_interval_ms
+        self.commands = queue.Queue()
+        self.ready = queue.Queue()
+        self.closed = False
+        self.exhausted = False
+        self.thread = threading.Thread(target=self.run, name="session-pipeline", daemon=True)
+        self.thread.start()
+
+    def next_card(self, timeout=None):
+        """
+        Take the next prepared card. Call from the thread driving the session, the Tk thread in the app.
+
+        Parameters:
+        - timeout (float): How long to wait in seconds for the worker to prepare the card.
+          By default, does not wait.
+
+        Returns:
+        - dict: The next card, with "id", "question", "answer", "category" and "color", or None
+          if the worker has not prepared it yet or, once exhausted is set, if the deck is done.
+
+        Raises:
+        - Exception: The error the worker hit while loading cards.
+        """
+        if self.exhausted:
+            return None
+        try:
+            kind, payload = self.ready.get(timeout=timeout) if timeout else self.ready.get_nowait()
+        except queue.Empty:
+            return None
+        if kind == "error":
+            raise payload
+        if kind == "end":
+            self.exhausted = True
+            return None
+        self.commands.put(("consumed", None))
+        return payload
+
+    def record(self, flashcard_id, is_correct):
+        """
+        Record a study result on the worker thread. Call from the Tk thread.
+
+        Parameters:
+        - flashcard_id (int): The ID of the flashcard.
+        - is_correct (bool): Whether the user's answer was correct.
+        """
+        self.commands.put(("record", (flashcard_id, is_correct)))
+
+    @property
+    def running(self):
+        """Whether the worker thread is still running, e.g. writing the results after close()."""
+        return self.thread.is_alive()
+
+    def close(self, wait=True):
+        """
+        Stop the worker after it has written every recorded result.
+
+        Parameters:
+        - wait (bool): Whether to wait for the worker to finish.
+        """
+        if not self.closed:
+            self.closed = True
+            self.commands.put(("stop", None))
+        if wait:
+            self.thread.join()
+
+    def run(self):
+        """Load cards ahead of the Tk thread and write results until the pipeline is closed."""
+        writer = ReviewWriter(self.db_manager, flush_interval_ms=self.flush_interval_ms)
+        next_index = 0
+        outstanding = 0
+        try:
+            while True:
+                if next_index < len(self.deck_ids) and outstanding < self.prefetch:
+                    batch = self.deck_ids[next_index:next_index + self.prefetch - outstanding]
+                    try:
+                        cards = self.load_cards(batch)
+                    except Exception as e:
+                        logging.error(f"Failed to load study cards: {e}")
+                        self.ready.put(("error", e))
+                        next_index = len(self.deck_ids)
+                        self.ready.put(("end", None))
+                        continue
+                    for card in cards:
+                        self.ready.put(("card", card))
+                    next_index += len(batch)
+                    outstanding += len(cards)
+                    if next_index >= len(self.deck_ids):
+                        self.ready.put(("end", None))
+
+                # Wake up when the oldest unwritten result is due, even while answers keep coming.
+                try:
+                    kind, payload = self.commands.get(timeout=writer.flush_due_in())
+                except queue.Empty:
+                    kind = None
+                if kind == "consumed":
+                    outstanding -= 1
+                elif kind == "record":
+                    writer.add(*payload)
+                elif kind == "stop":
+                    break
+                writer.flush_if_due()
+        finally:
+            writer.flush()
+
+    def load_cards(self, flashcard_ids):
+        """
+        Fetch and prepare cards for display.
+
+        Cards that were deleted since the deck was drawn are skipped.
+
+        Parameters:
+        - flashcard_ids (list): The IDs of the cards to load.
+
+        Returns:
+        - list: The prepared cards in the order of the IDs.
+        """
+        return [{"id": card[0], "question": card[1], "answer": card[2], "category": card[3], "color": card[4]}
+                for card in self.db_manager.get_flashcards_by_ids(flashcard_ids)]
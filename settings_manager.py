@@ -6,20 +6,31 @@ This file contains the SettingsManager class for managing the application's sett
 
 import json
 import os
+import stat
 import logging
+import tempfile
+import threading
+from constants import SETTINGS_SAVE_DELAY_MS
 
 class SettingsManager:
     """
     A class to manage the settings and themes for the flashcards application.
+
+    Changes are written to the settings file by a timer thread once they have stopped for
+    save_delay_ms, so a burst of changes costs one write. Writes go to a temporary file that
+    replaces the settings file, so a crash never leaves a half-written file. If another
+    instance changed the file since it was read, its values are kept for the settings this
+    instance did not change. Call flush() before exiting to write pending changes.
     """
     
-    def __init__(self, settings_file=None, themes_file=None):
+    def __init__(self, settings_file=None, themes_file=None, save_delay_ms=SETTINGS_SAVE_DELAY_MS):
         """
         Initialize the SettingsManager with the specified settings and themes files.
         
         Parameters:
         - settings_file (str): The name of the settings file. Default is 'settings.json'.
         - themes_file (str): The name of the themes file. Default is 'themes.json'.
+        - save_delay_ms (int): How long changes are held before they are written.
         """
         self.settings_file = settings_file or os.getenv("FLASHCARDS_SETTINGS_FILE", "settings.json")
         self.themes_file = themes_file or os.getenv("FLASHCARDS_THEMES_FILE", "themes.json")
@@ -27,9 +38,26 @@ class SettingsManager:
             "scaling_factor": 1.0,
             "theme_name": "light"
         }
+        self.save_delay = save_delay_ms / 1000
+        self.lock = threading.RLock()
+        self.save_timer = None
+        self.changed_keys = set()
+        self.file_mtime = self.read_mtime()
         self.settings = self.load_settings()
         self.themes = self.load_themes()
 
+    def read_mtime(self):
+        """
+        Get the modification time of the settings file.
+
+        Returns:
+        - int: The modification time in nanoseconds, or None if the file does not exist.
+        """
+        try:
+            return os.stat(self.settings_file).st_mtime_ns
+        except OSError:
+            return None
+
     def load_settings(self):
         """
         Load settings from the settings file. If the file does not exist, return default settings.
@@ -70,13 +98,76 @@ class SettingsManager:
             return {}
 
     def save_settings(self):
-        """Save the current settings to the settings file."""
-        try:
-            with open(self.settings_file, "w") as f:
-                json.dump(self.settings, f)
-                logging.info("Settings saved successfully.")
-        except IOError as e:
-            logging.error(f"Error saving settings: {e}")
+        """Write every setting to the settings file now."""
+        with self.lock:
+            self.changed_keys.update(self.settings)
+        self.flush()
+
+    def schedule_save(self, keys):
+        """
+        Mark settings as changed and (re)start the timer that writes them.
+
+        Parameters:
+        - keys (iterable): The keys of the changed settings.
+        """
+        with self.lock:
+            self.changed_keys.update(keys)
+            if self.save_timer:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """
+        Write pending changes to the settings file, merging changes made by other instances.
+        Safe to call from any thread; does nothing when there are no pending changes.
+        """
+        with self.lock:
+            if self.save_timer:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.changed_keys:
+                return
+
+            settings = dict(self.settings)
+            mtime = self.read_mtime()
+            if mtime is not None and mtime != self.file_mtime:
+                # Another instance wrote the file since it was read: keep its values for
+                # everything this instance did not change.
+                try:
+                    with open(self.settings_file, "r") as f:
+                        on_disk = json.load(f)
+                    settings = {**on_disk, **{key: settings[key] for key in self.changed_keys if key in settings}}
+                    logging.info("Settings file changed on disk; merged the changes.")
+                except (IOError, json.JSONDecodeError) as e:
+                    logging.warning(f"Could not merge changed settings file: {e}")
+
+            directory = os.path.dirname(os.path.abspath(self.settings_file))
+            temp_file = None
+            try:
+                with tempfile.NamedTemporaryFile("w", dir=directory, prefix=".settings-", suffix=".tmp", delete=False) as f:
+                    temp_file = f.name
+                    json.dump(settings, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # The temporary file is created 0600; keep the mode of the file it replaces.
+                try:
+                    mode = stat.S_IMODE(os.stat(self.settings_file).st_mode)
+                except FileNotFoundError:
+                    mode = 0o644
+                os.chmod(temp_file, mode)
+                os.replace(temp_file, self.settings_file)
+            except (IOError, OSError) as e:
+                logging.error(f"Error saving settings: {e}")
+                if temp_file and os.path.exists(temp_file):
+                    os.remove(temp_file)
+                return
+
+            self.settings = settings
+            self.file_mtime = self.read_mtime()
+            self.changed_keys.clear()
+            logging.info("Settings saved successfully.")
 
     def get(self, key):
         """
@@ -98,8 +189,9 @@ class SettingsManager:
         - key (str): The setting key.
         - value: The value to set.
         """
-        self.settings[key] = value
-        self.save_settings()
+        with self.lock:
+            self.settings[key] = value
+        self.schedule_save([key])
 
     def update(self, new_settings):
         """
@@ -108,21 +200,31 @@ class SettingsManager:
         Parameters:
         - new_settings (dict): A dictionary of new settings.
         """
-        self.settings.update(new_settings)
-        self.save_settings()
+        with self.lock:
+            self.settings.update(new_settings)
+        self.schedule_save(new_settings)
 
-    def get_current_theme(self):
+    def get_current_theme_name(self):
         """
-        Get the current theme based on the 'theme_name' setting.
+        Get the name of the current theme based on the 'theme_name' setting.
 
         Returns:
-        - dict: The current theme.
+        - str: The name of the current theme, 'light' if the setting names an unknown theme.
         """
         theme_name = self.settings.get("theme_name", "light")
         if theme_name not in self.themes:
             logging.warning(f"Theme '{theme_name}' not found. Using 'light' theme.")
             theme_name = "light"
-        return self.themes.get(theme_name, {})
+        return theme_name
+
+    def get_current_theme(self):
+        """
+        Get the current theme based on the 'theme_name' setting.
+
+        Returns:
+        - dict: The current theme.
+        """
+        return self.themes.get(self.get_current_theme_name(), {})
 
     def get_theme_names(self):
         """
@@ -146,6 +248,7 @@ class SettingsManager:
         """
         Reset the settings to the default settings.
         """
-        self.settings = self.default_settings.copy()
-        self.save_settings()
+        with self.lock:
+            self.settings = self.default_settings.copy()
+        self.schedule_save(self.default_settings)
         logging.info("Settings reset to default.")
@@ -0,0 +1,151 @@
+"""
+study_cli.py
+
+This file contains the terminal study mode of the flashcards application. It runs a session
+through StudyEngine and never imports tkinter, so it starts in a fraction of the time the
+window takes.
+
+Usage:
+    python main.py --cli [--db flashcards.db] [--length 20] [--mode weighted|due]
+                         [--categories NAME ...] [--seed N]
+
+Press Enter to show the answer, then answer y (correct), n (incorrect) or q (quit). Answers
+can also be piped in, one per line, for scripted sessions; the session ends at end of input.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from database_manager import DatabaseManager
+from study_engine import StudyEngine, STUDY_MODES
+
+# The default number of cards, as in the study options dialog.
+DEFAULT_LENGTH = 20
+
+# How long to wait for the pipeline to load a card before giving up, in seconds.
+CARD_TIMEOUT = 10
+
+def read_line(prompt):
+    """Show a prompt and read a line, or return None at end of input."""
+    try:
+        return input(prompt)
+    except EOFError:
+        print()
+        return None
+
+def ask_correct():
+    """
+    Ask whether the answer was right until the user gives a valid reply.
+
+    Returns:
+    - bool: True or False for the answer, or None to end the session.
+    """
+    while True:
+        reply = read_line("Correct? [y/n/q] ")
+        if reply is None:
+            return None
+        reply = reply.strip().lower()
+        if reply in ("y", "yes"):
+            return True
+        if reply in ("n", "no"):
+            return False
+        if reply in ("q", "quit"):
+            return None
+
+def select_categories(db_manager, names):
+    """
+    Find the IDs of the named categories, or of every category when no names are given.
+
+    Raises:
+    - SystemExit: If a named category does not exist.
+    """
+    categories = {category["name"]: category["id"] for category in db_manager.get_all_categories()}
+    if not names:
+        return list(categories.values())
+    missing = [name for name in names if name not in categories]
+    if missing:
+        raise SystemExit(f"Unknown categories: {', '.join(missing)}. Choose from: {', '.join(categories)}")
+    return [categories[name] for name in names]
+
+def run_session(engine, started_at):
+    """
+    Run a started session in the terminal until the deck is done or the user quits.
+
+    Parameters:
+    - engine (StudyEngine): The started session.
+    - started_at (float): The time.perf_counter() value the program started at.
+    """
+    total = engine.stats["total"]
+    while True:
+        card = engine.next_card(timeout=CARD_TIMEOUT)
+        if card is None:
+            if not engine.finished:
+                print("Timed out waiting for the next card.", file=sys.stderr)
+            return
+        if started_at is not None and engine.answered == 0:
+            logging.info(f"First question after {(time.perf_counter() - started_at) * 1000:.0f} ms.")
+        print(f"\nQuestion {engine.answered + 1}/{total} [{card['category']}]")
+        print(card["question"])
+        if read_line("Press Enter to show the answer... ") is None:
+            return
+        print(card["answer"])
+        is_correct = ask_correct()
+        if is_correct is None:
+            return
+        engine.answer(is_correct)
+
+def print_summary(summary):
+    """Print the statistics of a finished session."""
+    print("\nSession Summary")
+    print(f"Total Questions: {summary['total']}")
+    print(f"Correct Answers: {summary['correct']}")
+    print(f"Incorrect Answers: {summary['incorrect']}")
+    if summary["accuracy"] is not None:
+        print(f"Accuracy: {summary['accuracy']:.2f}%")
+
+def main(argv=None, started_at=None):
+    """
+    Run a study session in the terminal.
+
+    Parameters:
+    - argv (list): The command line arguments, without the program name.
+    - started_at (float): The time.perf_counter() value the program started at, to log the time
+      to the first question.
+
+    Returns:
+    - int: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="main.py --cli", description="Study flashcards in the terminal.")
+    parser.add_argument("--db", default="flashcards.db", help="The database file.")
+    parser.add_argument("--length", type=int, default=DEFAULT_LENGTH, help="The number of cards.")
+    parser.add_argument("--mode", choices=STUDY_MODES, default="weighted",
+                        help="Weighted practice, or the cards due for review.")
+    parser.add_argument("--categories", nargs="+", metavar="NAME", help="The categories to study. Defaults to all.")
+    parser.add_argument("--seed", type=int, help="Draw a reproducible weighted deck.")
+    parser.add_argument("--verbose", action="store_true", help="Log progress, including the startup time.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"{args.db} does not exist. Add flashcards in the app or import them first.")
+    with DatabaseManager(args.db) as db_manager:
+        engine = StudyEngine(db_manager, select_categories(db_manager, args.categories), args.length,
+                             mode=args.mode, seed=args.seed)
+        if not engine.start():
+            print("No flashcards are due for review in the selected categories." if args.mode == "due"
+                  else "No flashcards available for the selected categories.")
+            return 0
+        try:
+            run_session(engine, started_at)
+        except KeyboardInterrupt:
+            print()
+        finally:
+            engine.close()
+        print_summary(engine.summary())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+study_engine.py
+
+This file contains the StudyEngine class, which runs a study session without any user interface.
+The Tk study screen, the terminal study mode and the benchmarks all drive sessions through it.
+"""
+
+from scheduler import utc_now
+from session_pipeline import SessionPipeline
+
+STUDY_MODES = ("weighted", "due")
+
+def draw_deck(db_manager, category_ids, length, mode="weighted", seed=None):
+    """
+    Draw the flashcard IDs of a study deck.
+
+    Parameters:
+    - db_manager (DatabaseManager): The database manager.
+    - category_ids (list): The IDs of the categories to study.
+    - length (int): The number of cards to draw.
+    - mode (str): "weighted" to favour cards that are often answered wrong, or "due" for the
+      cards due for review by the spaced repetition schedule, then new cards.
+    - seed (int): Draw a reproducible weighted deck from this seed. Ignored in "due" mode.
+
+    Returns:
+    - list: The flashcard IDs in study order.
+    """
+    if mode == "due":
+        # Overdue cards come straight from the due time index, then new cards.
+        return db_manager.get_due_flashcards(category_ids, length, utc_now())
+
+    if seed is None:
+        return db_manager.select_study_deck(category_ids, length)
+
+    # SQLite's random() cannot be seeded, so reproducible decks are drawn in Python, from the
+    # card IDs and weights only; the pipeline fetches the text of the drawn cards. Imported here
+    # because sampling may import NumPy, which would slow down the start of every session.
+    from sampling import weighted_sample
+    weights = db_manager.get_card_weights(category_ids)
+    # Sorted so a seed draws the same deck whatever order the rows come back in.
+    flashcard_ids = sorted(weights)
+    return weighted_sample(flashcard_ids, [weights[flashcard_id] for flashcard_id in flashcard_ids], length, seed=seed)
+
+class StudyEngine:
+    """
+    A study session: the deck, the current card, the answers given and their statistics.
+
+    The deck is drawn as a list of card IDs up front; a SessionPipeline loads the cards a few
+    ahead of the current one and records the answers on its worker thread. The engine never
+    blocks unless asked to: next_card returns None while the pipeline is behind, so a GUI can
+    poll it, while scripts pass a timeout and wait.
+    """
+
+    def __init__(self, db_manager, category_ids, length, mode="weighted", seed=None):
+        """
+        Initialize the StudyEngine. The deck is drawn by draw() or passed to start().
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager.
+        - category_ids (list): The IDs of the categories to study.
+        - length (int): The number of cards in the session.
+        - mode (str): One of STUDY_MODES, see draw_deck.
+        - seed (int): The seed of a reproducible weighted deck, or None.
+
+        Raises:
+        - ValueError: If mode is not one of STUDY_MODES.
+        """
+        if mode not in STUDY_MODES:
+            raise ValueError(f"Study mode {mode} is not supported. Choose from {list(STUDY_MODES)}.")
+        self.db_manager = db_manager
+        self.category_ids = list(category_ids)
+        self.length = length
+        self.mode = mode
+        self.seed = seed
+        self.deck = []
+        self.pipeline = None
+        self.current_card = None
+        self.stats = {"total": 0, "correct": 0, "incorrect": 0}
+
+    def draw(self):
+        """
+        Draw the deck of the session. Safe to run on a worker thread.
+
+        Returns:
+        - list: The flashcard IDs in study order.
+        """
+        return draw_deck(self.db_manager, self.category_ids, self.length, self.mode, self.seed)
+
+    def start(self, deck=None):
+        """
+        Start the session, drawing the deck first unless it is given.
+
+        Parameters:
+        - deck (list): The flashcard IDs in study order, as returned by draw().
+
+        Returns:
+        - bool: True if the deck has cards to study, False if it is empty.
+        """
+        self.deck = self.draw() if deck is None else list(deck)
+        self.stats["total"] = len(self.deck)
+        if self.deck:
+            self.pipeline = SessionPipeline(self.db_manager, self.deck)
+        return bool(self.deck)
+
+    @property
+    def answered(self):
+        """The number of cards answered so far."""
+        return self.stats["correct"] + self.stats["incorrect"]
+
+    @property
+    def finished(self):
+        """Whether every card of the deck has been shown."""
+        return self.pipeline is None or self.pipeline.exhausted
+
+    def next_card(self, timeout=None):
+        """
+        Move on to the next card.
+
+        Parameters:
+        - timeout (float): How long to wait in seconds for the pipeline to load the card.
+          By default, does not wait.
+
+        Returns:
+        - dict: The card, with "id", "question", "answer", "category" and "color", or None if it
+          is not loaded yet or, once finished is set, if the deck is done.
+
+        Raises:
+        - Exception: The error the pipeline hit while loading cards.
+        """
+        self.current_card = None if self.pipeline is None else self.pipeline.next_card(timeout)
+        return self.current_card
+
+    def answer(self, is_correct):
+        """
+        Record the answer to the current card.
+
+        Parameters:
+        - is_correct (bool): Whether the user's answer was correct.
+
+        Returns:
+        - bool: True if the answer was recorded, False if no card is shown, e.g. while the next
+          one is loading or after the current one was answered.
+        """
+        if self.current_card is None:
+            return False
+        self.pipeline.record(self.current_card["id"], is_correct)
+        self.stats["correct" if is_correct else "incorrect"] += 1
+        self.current_card = None
+        return True
+
+    def summary(self):
+        """
+        Return the statistics of the session.
+
+        Cards deleted since the deck was drawn are skipped, so the total is the number of cards
+        answered, not the length of the deck.
+
+        Returns:
+        - dict: "total", "correct" and "incorrect" counts, and "accuracy" in percent, or None
+          if no card was answered.
+        """
+        total = self.answered
+        accuracy = self.stats["correct"] / total * 100 if total else None
+        return {"total": total, "correct": self.stats["correct"], "incorrect": self.stats["incorrect"], "accuracy": accuracy}
+
+    def close(self, wait=True):
+        """
+        Stop the session after writing every recorded answer.
+
+        Parameters:
+        - wait (bool): Whether to wait for the answers to be written.
+        """
+        if self.pipeline is not None:
+            self.pipeline.close(wait)
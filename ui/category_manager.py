@@ -23,6 +23,7 @@ class CategoryManager(ttk.Frame):
         """
         super().__init__(parent)
         self.controller = controller
+        self.controller.db_executor.cancel_on_destroy(self)
         self.create_widgets()
 
     def create_widgets(self):
@@ -45,13 +46,34 @@ class CategoryManager(ttk.Frame):
 
         self.load_categories()
 
+    def refresh(self):
+        """Reload the categories after they changed while the view was hidden."""
+        self.load_categories()
+
     def load_categories(self):
-        """Load the categories from the database and display them in the treeview."""
+        """Load the categories from the database in the background, showing a placeholder meanwhile."""
+        self.tree.delete(*self.tree.get_children())
+        self.tree.insert("", "end", values=("Loading categories...", ""))
+        self.controller.db_executor.cancel(self)
+        self.controller.db_executor.submit(self.controller.db_manager.get_all_categories, tag=self,
+                                           callback=self.show_categories, error_callback=self.on_load_error)
+
+    def show_categories(self, categories):
+        """
+        Display loaded categories in the treeview.
+
+        Parameters:
+        - categories (list): The categories from DatabaseManager.get_all_categories.
+        """
         self.tree.delete(*self.tree.get_children())
-        categories = self.controller.db_manager.get_all_categories()
         for category in categories:
             self.tree.insert("", "end", values=(category["name"], category["color"]))
 
+    def on_load_error(self, error):
+        """Report a failure to load the categories."""
+        self.tree.delete(*self.tree.get_children())
+        self.controller.error_handler.show_error("Failed to load categories", str(error))
+
     def add_category(self):
         """Handle the Add Category button click event."""
         dialog = CategoryDialog(self, "Add Category")
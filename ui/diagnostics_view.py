@@ -0,0 +1,145 @@
+"""
+diagnostics_view.py
+
+This file contains the DiagnosticsView class for showing the live query statistics of the
+database and the recent slow queries.
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk
+from constants import DIAGNOSTICS_REFRESH_MS
+
+class DiagnosticsView(ttk.Frame):
+    """
+    A class to show how long each DatabaseManager method takes.
+
+    The numbers come from the in-memory DatabaseManager.query_stats, so updating them runs no
+    queries; they are updated every DIAGNOSTICS_REFRESH_MS while the view is shown.
+    """
+
+    def __init__(self, parent, controller):
+        """
+        Initialize the DiagnosticsView.
+
+        Parameters:
+        - parent (tk.Widget): The parent widget.
+        - controller (FlashcardApp): The main application controller.
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.query_stats = controller.db_manager.query_stats
+        self.refresh_job = None
+        self.slow_queries = []
+        self.create_widgets()
+        self.bind("<Destroy>", self.on_destroy)
+        self.refresh()
+
+    def create_widgets(self):
+        """Create the widgets for the diagnostics view."""
+        self.summary_label = ttk.Label(self)
+        self.summary_label.pack(anchor="w", padx=10, pady=(10, 0))
+
+        columns = [("calls", "Calls", 60), ("errors", "Errors", 60), ("p50_ms", "p50 ms", 70), ("p95_ms", "p95 ms", 70),
+                   ("p99_ms", "p99 ms", 70), ("max_ms", "Max ms", 70), ("total_ms", "Total ms", 80), ("mean_rows", "Rows", 60)]
+        self.methods_tree = ttk.Treeview(self, columns=[column[0] for column in columns], height=10)
+        self.methods_tree.heading("#0", text="Method")
+        self.methods_tree.column("#0", width=200)
+        for column, text, width in columns:
+            self.methods_tree.heading(column, text=text)
+            self.methods_tree.column(column, width=width, anchor="e")
+        self.methods_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        ttk.Label(self, text="Slow queries").pack(anchor="w", padx=10)
+        slow_frame = ttk.Frame(self)
+        slow_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.slow_tree = ttk.Treeview(slow_frame, columns=("method", "elapsed"), show="headings", height=6)
+        self.slow_tree.heading("method", text="Method")
+        self.slow_tree.heading("elapsed", text="ms")
+        self.slow_tree.column("method", width=180)
+        self.slow_tree.column("elapsed", width=70, anchor="e")
+        self.slow_tree.pack(side=tk.LEFT, fill=tk.Y)
+        self.slow_tree.bind("<<TreeviewSelect>>", lambda event: self.show_slow_query())
+        self.plan_text = tk.Text(slow_frame, height=8, wrap=tk.WORD, state=tk.DISABLED)
+        self.plan_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(button_frame, text="Reset Statistics", command=self.reset).pack(side=tk.LEFT, padx=5)
+
+    def refresh(self):
+        """Show the current numbers and schedule the next update."""
+        self.refresh_job = None
+        if self.query_stats is None:
+            self.summary_label.config(text="Query statistics are off. Unset FLASHCARDS_QUERY_STATS to turn them on.")
+            return
+        self.show_methods(self.query_stats.snapshot())
+        self.show_slow_queries(self.query_stats.slow_queries())
+        self.refresh_job = self.after(DIAGNOSTICS_REFRESH_MS, self.refresh)
+
+    def show_methods(self, rows):
+        """
+        Show the statistics of each method, updating the rows in place.
+
+        Parameters:
+        - rows (list): The rows of QueryStats.snapshot.
+        """
+        calls = sum(row["calls"] for row in rows)
+        minutes = (time.time() - self.query_stats.started) / 60
+        self.summary_label.config(text=f"{calls} database calls in {minutes:.1f} minutes. "
+                                       f"Calls over {self.query_stats.slow_ms:g} ms are logged as slow.")
+        shown = set(self.methods_tree.get_children())
+        for index, row in enumerate(rows):
+            values = (row["calls"], row["errors"], f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['p99_ms']:.2f}",
+                      f"{row['max_ms']:.2f}", f"{row['total_ms']:.1f}", f"{row['mean_rows']:.1f}")
+            if row["method"] in shown:
+                self.methods_tree.item(row["method"], values=values)
+                self.methods_tree.move(row["method"], "", index)
+                shown.discard(row["method"])
+            else:
+                self.methods_tree.insert("", index, iid=row["method"], text=row["method"], values=values)
+        if shown:
+            self.methods_tree.delete(*shown)
+
+    def show_slow_queries(self, slow_queries):
+        """
+        Show the recent slow queries, keeping the selection while the list is unchanged.
+
+        Parameters:
+        - slow_queries (list): The entries of QueryStats.slow_queries, newest first.
+        """
+        if slow_queries == self.slow_queries:
+            return
+        self.slow_queries = slow_queries
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        for index, entry in enumerate(slow_queries):
+            self.slow_tree.insert("", tk.END, iid=str(index), values=(f"{entry['time']} {entry['method']}",
+                                                                      f"{entry['elapsed_ms']:.1f}"))
+
+    def show_slow_query(self):
+        """Show the statements and query plans of the selected slow query."""
+        selected = self.slow_tree.selection()
+        lines = []
+        if selected and int(selected[0]) < len(self.slow_queries):
+            for sql, plan in self.slow_queries[int(selected[0])]["statements"]:
+                lines.append(sql)
+                lines.extend(f"    {step}" for step in plan)
+                lines.append("")
+        self.plan_text.config(state=tk.NORMAL)
+        self.plan_text.delete("1.0", tk.END)
+        self.plan_text.insert("1.0", "\n".join(lines))
+        self.plan_text.config(state=tk.DISABLED)
+
+    def reset(self):
+        """Forget the statistics collected so far."""
+        if self.query_stats is not None:
+            self.query_stats.reset()
+            self.show_methods([])
+            self.show_slow_queries([])
+            self.show_slow_query()
+
+    def on_destroy(self, event):
+        """Stop updating once the view is closed."""
+        if event.widget is self and self.refresh_job:
+            self.after_cancel(self.refresh_job)
+            self.refresh_job = None
@@ -7,6 +7,33 @@ as well as the EditCardDialog class for editing flashcard details.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from constants import SEARCH_DEBOUNCE_MS
+from ui.virtual_list import VirtualList, ListPageSource
+
+# Sortable list columns and the index of their value in (id, question, answer, category) rows.
+ROW_SORT_INDEXES = {"id": 0, "question": 1, "category": 3}
+
+class FlashcardPageSource:
+    """
+    A row source for VirtualList that pages through all flashcards in the database.
+    """
+
+    def __init__(self, db_manager):
+        """
+        Initialize the FlashcardPageSource.
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager.
+        """
+        self.db_manager = db_manager
+
+    def count(self):
+        """Return the number of flashcards."""
+        return self.db_manager.count_flashcards()
+
+    def fetch_page(self, sort_column, descending=False, after=None, before=None, offset=0, limit=100):
+        """Return one sorted page of (id, question, answer, category) rows."""
+        return self.db_manager.get_flashcard_page(sort_column, descending, after, before, offset, limit)
 
 class FlashcardViews(ttk.Frame):
     """
@@ -25,6 +52,9 @@ class FlashcardViews(ttk.Frame):
         super().__init__(parent)
         self.controller = controller
         self.mode = mode
+        self.tree = None
+        self.search_job = None
+        self.controller.db_executor.cancel_on_destroy(self)
 
         if mode == "view":
             self.create_view_flashcards()
@@ -33,19 +63,109 @@ class FlashcardViews(ttk.Frame):
         elif mode == "edit":
             self.create_edit_flashcards()
 
+    def refresh(self):
+        """Reload the data of the view after it changed while the view was hidden."""
+        if self.mode == "add":
+            self.controller.db_executor.submit(self.controller.db_manager.get_all_categories, tag=self,
+                                               callback=self.show_categories)
+        else:
+            self.run_search(keep_position=True)
+
+    def show_categories(self, categories):
+        """
+        Offer the loaded categories in the category box of the add view.
+
+        Parameters:
+        - categories (list): The categories from DatabaseManager.get_all_categories.
+        """
+        self.category_combobox.config(values=[cat['name'] for cat in categories])
+
     def create_view_flashcards(self):
         """Create the view for displaying flashcards."""
-        tree = ttk.Treeview(self, columns=("Question", "Answer", "Category"), show="headings")
-        tree.heading("Question", text="Question")
-        tree.heading("Answer", text="Answer")
-        tree.heading("Category", text="Category")
-        tree.column("Question", width=250)
-        tree.column("Answer", width=250)
-        tree.column("Category", width=100)
+        self.create_search_box()
+        # The answer column has no index to page through, so it is not sortable.
+        columns = [("question", "Question", 250, 1, True), ("answer", "Answer", 250, 2, False), ("category", "Category", 100, 3, True)]
+        self.tree = self.create_list(columns)
+
+    def create_list(self, columns):
+        """
+        Create the flashcard list, loading its rows on the database executor.
+
+        Parameters:
+        - columns (list): The displayed columns, see VirtualList.
+
+        Returns:
+        - VirtualList: The packed list.
+        """
+        tree = VirtualList(self, columns, FlashcardPageSource(self.controller.db_manager),
+                           executor=self.controller.db_executor, placeholder="Loading flashcards...",
+                           error_callback=lambda error: self.controller.error_handler.show_error(
+                               "Failed to load flashcards", str(error)))
         tree.pack(fill=tk.BOTH, expand=True)
+        return tree
+
+    def create_search_box(self):
+        """Create the search box that filters the flashcard list as the user types."""
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        search_entry.bind("<KeyRelease>", self.schedule_search)
+
+    def schedule_search(self, event=None):
+        """Run the search once the user pauses typing for SEARCH_DEBOUNCE_MS."""
+        if self.search_job:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self, keep_position=False):
+        """
+        Show the flashcards that match the search box, or all flashcards when it is empty.
 
-        for card in self.controller.flashcards:
-            tree.insert("", tk.END, values=(card[1], card[2], card[3]))
+        Parameters:
+        - keep_position (bool): Whether to keep the list scrolled where it is, when the search is
+          run again because the flashcards changed.
+        """
+        self.search_job = None
+        query = self.search_var.get().strip()
+        # A newer search supersedes one that is still running.
+        self.controller.db_executor.cancel(self)
+        if not query:
+            self.tree.set_source(FlashcardPageSource(self.controller.db_manager), keep_position)
+            return
+        self.controller.db_executor.submit(self.controller.db_manager.search_flashcards, query, tag=self,
+                                           callback=lambda results: self.show_results(results, keep_position),
+                                           error_callback=self.on_search_error)
+
+    def show_results(self, results, keep_position=False):
+        """
+        Show search results in the flashcard list.
+
+        Parameters:
+        - results (list): The results from DatabaseManager.search_flashcards.
+        - keep_position (bool): Whether to keep the list scrolled where it is.
+        """
+        if self.mode == "view":
+            rows = [(r["id"], r["question_snippet"], r["answer_snippet"], r["category"]) for r in results]
+        else:
+            rows = [(r["id"], r["question"], r["answer"], r["category"]) for r in results]
+        self.show_rows(rows, keep_position)
+
+    def on_search_error(self, error):
+        """Report a failed search."""
+        self.controller.error_handler.show_error("Search failed", str(error))
+
+    def show_rows(self, cards, keep_position=False):
+        """
+        Show a fixed list of rows, such as search results, in the flashcard list.
+
+        Parameters:
+        - cards (list): (id, question, answer, category) tuples.
+        - keep_position (bool): Whether to keep the list scrolled where it is.
+        """
+        self.tree.set_source(ListPageSource(cards, ROW_SORT_INDEXES), keep_position)
 
     def create_add_flashcard(self):
         """Create the view for adding a new flashcard."""
@@ -79,21 +199,16 @@ class FlashcardViews(ttk.Frame):
 
     def create_edit_flashcards(self):
         """Create the view for editing existing flashcards."""
-        tree = ttk.Treeview(self, columns=("ID", "Question", "Answer", "Category"), show="headings")
-        tree.heading("ID", text="ID")
-        tree.heading("Question", text="Question")
-        tree.heading("Answer", text="Answer")
-        tree.heading("Category", text="Category")
-        tree.pack(fill=tk.BOTH, expand=True)
-
-        for card in self.controller.flashcards:
-            tree.insert("", tk.END, values=card)
+        self.create_search_box()
+        columns = [("id", "ID", 60, 0, True), ("question", "Question", 250, 1, True),
+                   ("answer", "Answer", 250, 2, False), ("category", "Category", 100, 3, True)]
+        self.tree = self.create_list(columns)
 
         button_frame = ttk.Frame(self)
         button_frame.pack(fill=tk.X, pady=10)
 
-        ttk.Button(button_frame, text="Edit", command=lambda: self.edit_selected(tree)).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Delete", command=lambda: self.delete_selected(tree)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Edit", command=self.edit_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Delete", command=self.delete_selected).pack(side=tk.LEFT, padx=5)
 
     def create_entry(self, parent, label_text, width=50):
         """
@@ -129,7 +244,6 @@ class FlashcardViews(ttk.Frame):
 
         new_id = self.controller.db_manager.add_flashcard(question, answer, category_id)
         if new_id:
-            self.controller.flashcards.append((new_id, question, answer, category))
             self.controller.show_toast("Flashcard added successfully!")
             self.clear_form()  # Clear the form for the next entry
         else:
@@ -141,32 +255,20 @@ class FlashcardViews(ttk.Frame):
         self.answer_entry.delete(0, tk.END)
         self.question_entry.focus()  # Set focus back to the question entry
 
-    def edit_selected(self, tree):
-        """
-        Edit the selected flashcard.
-
-        Parameters:
-        - tree (ttk.Treeview): The treeview widget displaying the flashcards.
-        """
-        selected = tree.selection()
-        if selected:
-            item = tree.item(selected[0])
-            EditCardDialog(self, self.controller, item['values'])
-
-    def delete_selected(self, tree):
-        """
-        Delete the selected flashcard.
-
-        Parameters:
-        - tree (ttk.Treeview): The treeview widget displaying the flashcards.
-        """
-        selected = tree.selection()
-        if selected:
-            item = tree.item(selected[0])
-            card_id = item['values'][0]
+    def edit_selected(self):
+        """Edit the selected flashcard."""
+        card = self.tree.selected_row()
+        if card:
+            EditCardDialog(self, self.controller, card)
+
+    def delete_selected(self):
+        """Delete the selected flashcard."""
+        card = self.tree.selected_row()
+        if card:
+            card_id = card[0]
             if self.controller.db_manager.delete_flashcard(card_id):
-                self.controller.flashcards = [card for card in self.controller.flashcards if card[0] != card_id]
-                tree.delete(selected)
+                # Search results are a snapshot, so the search runs again to drop the card.
+                self.run_search(keep_position=True)
                 self.controller.show_toast("Flashcard deleted successfully!")
             else:
                 self.controller.show_toast("Failed to delete flashcard.")
@@ -186,6 +288,7 @@ class EditCardDialog(tk.Toplevel):
         - card_data (tuple): The flashcard data.
         """
         super().__init__(parent)
+        self.parent = parent
         self.controller = controller
         self.card_id, self.question, self.answer, self.category = card_data
         self.title("Edit Flashcard")
@@ -238,7 +341,7 @@ class EditCardDialog(tk.Toplevel):
             return
 
         if self.controller.db_manager.update_flashcard(self.card_id, new_question, new_answer, category_id):
-            self.controller.flashcards = [(id, q, a, c) if id != self.card_id else (self.card_id, new_question, new_answer, new_category) for id, q, a, c in self.controller.flashcards]
+            self.parent.run_search(keep_position=True)
             self.controller.show_toast("Flashcard updated successfully!")
             self.destroy()
         else:
@@ -0,0 +1,135 @@
+"""
+import_view.py
+
+This file contains the ImportView class for importing flashcards from CSV, TSV and JSONL files.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog
+import queue
+import threading
+from importer import BulkImporter
+
+class ImportView(ttk.Frame):
+    """
+    A class to represent the import view of the flashcards application.
+
+    The import runs on a worker thread; progress is passed back through a queue that the Tk
+    thread polls, so the window stays responsive while large files are imported.
+    """
+
+    POLL_INTERVAL_MS = 100
+
+    def __init__(self, parent, controller):
+        """
+        Initialize the ImportView.
+
+        Parameters:
+        - parent (tk.Widget): The parent widget.
+        - controller (FlashcardApp): The main application controller.
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.importer = None
+        self.events = queue.Queue()
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Create the widgets for the import view."""
+        ttk.Label(self, text="Import Flashcards", style="Header.TLabel").pack(pady=(0, 20))
+        ttk.Label(self, text="Choose a CSV, TSV or JSONL file with question, answer and optional category columns.",
+                  wraplength=600).pack(pady=(0, 20))
+
+        self.progress_bar = ttk.Progressbar(self, orient="horizontal", length=400, mode="determinate", maximum=100)
+        self.progress_bar.pack(pady=(0, 10))
+
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.pack(pady=(0, 20))
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=10)
+
+        self.choose_button = ttk.Button(button_frame, text="Choose File...", command=self.choose_file)
+        self.choose_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_import, state="disabled")
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+    def choose_file(self):
+        """Ask for a deck file and start importing it."""
+        path = filedialog.askopenfilename(
+            title="Import Flashcards",
+            filetypes=[("Deck files", "*.csv *.tsv *.txt *.jsonl *.ndjson"), ("All files", "*.*")])
+        if path:
+            self.start_import(path)
+
+    def start_import(self, path):
+        """
+        Start importing a deck file on a worker thread.
+
+        Parameters:
+        - path (str): The path of the deck file.
+        """
+        self.importer = BulkImporter(self.controller.db_manager, progress_callback=lambda progress: self.events.put(("progress", progress)))
+        self.choose_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress_bar["value"] = 0
+        self.status_label.config(text="Importing...")
+        threading.Thread(target=self.run_import, args=(self.importer, path), daemon=True).start()
+        # Poll through the root window so the import still finishes cleanly if this view is closed.
+        self.controller.root.after(self.POLL_INTERVAL_MS, self.poll_events)
+
+    def run_import(self, importer, path):
+        """Run the import on the worker thread and report the outcome through the queue."""
+        try:
+            self.events.put(("done", importer.import_file(path)))
+        except Exception as e:
+            self.events.put(("error", e))
+
+    def poll_events(self):
+        """Apply queued progress events on the Tk thread."""
+        finished = False
+        while True:
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self.show_progress(payload)
+            else:
+                finished = True
+                self.finish_import(kind, payload)
+
+        if not finished:
+            self.controller.root.after(self.POLL_INTERVAL_MS, self.poll_events)
+
+    def show_progress(self, progress):
+        """Update the progress bar and status text."""
+        if not self.winfo_exists():
+            return
+        if progress["total_bytes"]:
+            self.progress_bar["value"] = progress["bytes_read"] / progress["total_bytes"] * 100
+        self.status_label.config(text=f"{progress['imported']} imported, {progress['skipped']} skipped")
+
+    def finish_import(self, kind, payload):
+        """Reload the application data and report the result of the import."""
+        self.controller.load_data()
+        if kind == "error":
+            self.controller.error_handler.show_error("Import failed", str(payload))
+        elif payload["cancelled"]:
+            self.controller.show_toast(f"Import cancelled after {payload['imported']} flashcards.")
+        else:
+            self.controller.show_toast(f"Imported {payload['imported']} flashcards ({payload['skipped']} skipped).")
+
+        if self.winfo_exists():
+            if kind == "done" and not payload["cancelled"]:
+                self.progress_bar["value"] = 100
+            self.status_label.config(text="")
+            self.choose_button.config(state="normal")
+            self.cancel_button.config(state="disabled")
+
+    def cancel_import(self):
+        """Stop the running import after its current chunk."""
+        if self.importer:
+            self.importer.cancel()
+            self.cancel_button.config(state="disabled")
+            self.status_label.config(text="Cancelling...")
@@ -32,10 +32,12 @@ class MainMenu(ttk.Frame):
             ("View Flashcards", self.controller.view_flashcards, "📚"),
             ("Add Flashcard", self.controller.add_flashcard, "➕"),
             ("Edit Flashcards", self.controller.edit_flashcards, "✏️"),
+            ("Import Flashcards", self.controller.import_flashcards, "📥"),
             ("Start Study Session", self.controller.start_study_session, "🎓"),
             ("View Progress", self.controller.view_progress, "📊"),
             ("Manage Categories", self.controller.manage_categories, "🗂️"),
             ("Settings", self.controller.show_settings, "⚙️"),
+            ("Diagnostics", self.controller.show_diagnostics, "🩺"),
             ("Quit App", self.controller.quit_app, "🚪")
         ]
 
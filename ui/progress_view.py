@@ -6,10 +6,53 @@ This file contains the ProgressView class for displaying flashcard study statist
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from ui.virtual_list import VirtualList, ListPageSource
+from constants import WEAKEST_CARDS_LIMIT
+
+ALL_CATEGORIES = "All categories"
+
+# The row index of each sortable statistics column, for lists of statistics rows held in memory.
+STATISTICS_SORT_INDEXES = {"question": 1, "category": 2, "total": 4, "accuracy": 5}
+
+class StatisticsPageSource:
+    """
+    A row source for VirtualList that pages through the statistics of the studied cards.
+    """
+
+    def __init__(self, db_manager, category_ids=None, min_attempts=1):
+        """
+        Initialize the StatisticsPageSource.
+
+        Parameters:
+        - db_manager (DatabaseManager): The database manager.
+        - category_ids (list): The IDs of the categories to include, or None for all.
+        - min_attempts (int): The minimum number of study results of a card.
+        """
+        self.db_manager = db_manager
+        self.category_ids = category_ids
+        self.min_attempts = min_attempts
+
+    def count(self):
+        """Return the number of cards that match the filters."""
+        return self.db_manager.count_statistics(self.category_ids, self.min_attempts)
+
+    def fetch_page(self, sort_column, descending=False, after=None, before=None, offset=0, limit=100):
+        """Return one sorted page of rows, with the success rate also formatted for display."""
+        rows = self.db_manager.get_statistics_page(sort_column, descending, self.category_ids, self.min_attempts,
+                                                   after, before, offset, limit)
+        return format_statistics(rows)
+
+def format_statistics(rows):
+    """Return statistics rows with the success rate also formatted for display."""
+    return [(*row, f"{row[5] * 100:.2f}%") for row in rows]
 
 class ProgressView(ttk.Frame):
     """
     A class to represent the progress view of the flashcards application.
+
+    Statistics are sorted, filtered and paged in SQL on the database executor thread, and the
+    list opens on the weakest cards. "Weakest First" narrows the list to the WEAKEST_CARDS_LIMIT
+    weakest cards until the filters change.
     """
     
     def __init__(self, parent, controller):
@@ -22,27 +65,46 @@ class ProgressView(ttk.Frame):
         """
         super().__init__(parent)
         self.controller = controller
+        self.showing_weakest = False
+        self.controller.db_executor.cancel_on_destroy(self)
         self.create_widgets()
 
     def create_widgets(self):
         """Create the widgets for the progress view."""
-        self.create_treeview()
+        self.create_filters()
+        self.create_statistics_list()
         self.create_buttons()
-        self.load_statistics()
 
-    def create_treeview(self):
-        """Create the treeview for displaying statistics."""
-        self.tree = ttk.Treeview(self, columns=("Question", "Category", "Correct", "Total", "Percentage"), show="headings")
-        self.tree.heading("Question", text="Question")
-        self.tree.heading("Category", text="Category")
-        self.tree.heading("Correct", text="Correct")
-        self.tree.heading("Total", text="Total")
-        self.tree.heading("Percentage", text="Success Rate")
-        self.tree.column("Question", width=300)
-        self.tree.column("Category", width=100)
-        self.tree.column("Correct", width=70)
-        self.tree.column("Total", width=70)
-        self.tree.column("Percentage", width=100)
+    def create_filters(self):
+        """Create the category and minimum attempts filters."""
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        ttk.Label(filter_frame, text="Category:").pack(side=tk.LEFT, padx=(0, 5))
+        self.category_var = tk.StringVar(value=ALL_CATEGORIES)
+        self.category_combobox = ttk.Combobox(filter_frame, textvariable=self.category_var, state="readonly",
+                                              values=self.category_names())
+        self.category_combobox.pack(side=tk.LEFT, padx=(0, 15))
+        self.category_combobox.bind("<<ComboboxSelected>>", lambda event: self.apply_filters())
+
+        ttk.Label(filter_frame, text="Min. attempts:").pack(side=tk.LEFT, padx=(0, 5))
+        self.min_attempts_var = tk.IntVar(value=1)
+        min_attempts_spinbox = ttk.Spinbox(filter_frame, from_=1, to=1000, width=6, textvariable=self.min_attempts_var,
+                                           command=self.apply_filters)
+        min_attempts_spinbox.pack(side=tk.LEFT)
+        min_attempts_spinbox.bind("<Return>", lambda event: self.apply_filters())
+
+    def create_statistics_list(self):
+        """Create the list of card statistics, sorted by success rate."""
+        columns = [("question", "Question", 300, 1, True), ("category", "Category", 100, 2, True),
+                   ("correct", "Correct", 70, 3, False), ("total", "Total", 70, 4, True),
+                   ("accuracy", "Success Rate", 100, 6, True)]
+        # The success rate column shows formatted text, so rows are keyed on the raw rate. Pages
+        # load on the database executor, and leaving the view cancels them.
+        self.tree = VirtualList(self, columns, StatisticsPageSource(self.controller.db_manager),
+                                sort_column="accuracy", sort_indexes={"accuracy": 5},
+                                executor=self.controller.db_executor, placeholder="Loading statistics...",
+                                error_callback=self.on_load_error)
         self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def create_buttons(self):
@@ -50,40 +112,88 @@ class ProgressView(ttk.Frame):
         button_frame = ttk.Frame(self)
         button_frame.pack(fill=tk.X, padx=10, pady=10)
 
+        ttk.Button(button_frame, text="Weakest First", command=self.show_weakest).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Trends", command=self.controller.view_trends).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Reset Statistics", command=self.reset_statistics).pack(side=tk.LEFT, padx=5)
 
-    def load_statistics(self):
-        """Load the statistics from the database and display them in the treeview."""
-        self.tree.delete(*self.tree.get_children())
+    def category_names(self):
+        """Return the choices of the category filter."""
+        return [ALL_CATEGORIES] + [cat['name'] for cat in self.controller.categories]
+
+    def get_filters(self):
+        """
+        Get the values of the filters.
+
+        Returns:
+        - tuple: (category IDs or None for all categories, minimum attempts).
+        """
+        category = self.category_var.get()
+        category_ids = None
+        if category != ALL_CATEGORIES:
+            category_ids = [cat['id'] for cat in self.controller.categories if cat['name'] == category]
         try:
-            statistics = self.controller.db_manager.get_flashcard_statistics()
-            for stat in statistics:
-                success_rate = self.calculate_success_rate(stat['correct'], stat['total'])
-                self.tree.insert("", tk.END, values=(stat['question'], stat['category'], stat['correct'], stat['total'], success_rate))
-        except Exception as e:
-            self.controller.error_handler.show_error("Failed to load statistics", str(e))
-
-    def calculate_success_rate(self, correct, total):
+            min_attempts = max(1, int(self.min_attempts_var.get()))
+        except (tk.TclError, ValueError):
+            min_attempts = 1
+        return category_ids, min_attempts
+
+    def apply_filters(self):
+        """Show the statistics that match the category and minimum attempts filters."""
+        self.showing_weakest = False
+        self.controller.db_executor.cancel(self)
+        self.tree.set_source(StatisticsPageSource(self.controller.db_manager, *self.get_filters()))
+
+    def show_weakest(self):
+        """Show the WEAKEST_CARDS_LIMIT cards with the lowest success rate that match the filters."""
+        self.showing_weakest = True
+        self.controller.db_executor.cancel(self)
+        self.controller.db_executor.submit(self.controller.db_manager.get_weakest_cards, WEAKEST_CARDS_LIMIT,
+                                           *self.get_filters(), tag=self, callback=self.show_weakest_cards,
+                                           error_callback=self.on_load_error)
+
+    def show_weakest_cards(self, rows):
         """
-        Calculate the success rate for a flashcard.
+        Show the weakest cards in the statistics list.
 
         Parameters:
-        - correct (int): The number of correct answers.
-        - total (int): The total number of answers.
-
-        Returns:
-        - str: The success rate as a percentage string.
+        - rows (list): The rows from DatabaseManager.get_weakest_cards.
         """
-        if total > 0:
-            return f"{(correct / total * 100):.2f}%"
-        return "N/A"
+        self.tree.set_source(ListPageSource(format_statistics(rows), STATISTICS_SORT_INDEXES))
+        self.tree.sort_by("accuracy", descending=False)
+
+    def refresh(self):
+        """Reload the statistics after they changed while the view was hidden."""
+        self.category_combobox.config(values=self.category_names())
+        self.load_statistics()
+
+    def load_statistics(self):
+        """Reload the statistics list in the background, keeping its filters and sort order."""
+        if self.showing_weakest:
+            self.show_weakest()
+        else:
+            self.tree.reload()
+
+    def on_load_error(self, error):
+        """Report a failure to load the statistics."""
+        self.controller.error_handler.show_error("Failed to load statistics", str(error))
 
     def reset_statistics(self):
         """Reset the statistics after user confirmation."""
         if messagebox.askyesno("Confirm Reset", "Are you sure you want to reset all statistics? This action cannot be undone."):
-            try:
-                self.controller.db_manager.reset_statistics()
-                self.load_statistics()
-                self.controller.show_toast("Statistics reset successfully")
-            except Exception as e:
-                self.controller.error_handler.show_error("Failed to reset statistics", str(e))
+            # Not tagged with the view: a confirmed reset is not cancelled by leaving the view.
+            self.controller.db_executor.submit(self.controller.db_manager.reset_statistics,
+                                               callback=self.on_reset, error_callback=self.on_reset_error)
+
+    def on_reset(self, success):
+        """Reload the statistics after a reset."""
+        if not success:
+            self.controller.error_handler.show_error("Failed to reset statistics", "The study history could not be deleted.")
+            return
+        if not self.winfo_exists():
+            return
+        self.load_statistics()
+        self.controller.show_toast("Statistics reset successfully")
+
+    def on_reset_error(self, error):
+        """Report a failure to reset the statistics."""
+        self.controller.error_handler.show_error("Failed to reset statistics", str(error))
@@ -0,0 +1,99 @@
+"""
+screen_cache.py
+
+This file contains the ScreenCache class, which keeps built screens alive between visits.
+"""
+
+import threading
+from collections import OrderedDict
+from constants import SCREEN_CACHE_SIZE
+
+class ScreenCache:
+    """
+    A least recently used cache of built screens.
+
+    Screens are hidden rather than destroyed when the user navigates away, and shown again on
+    the next visit. Each screen declares the data topics it displays ("cards", "categories",
+    "history"); mark_dirty flags the screens of the topics a write changed, and a flagged screen
+    is refreshed the next time it is shown instead of on every visit. Once more than capacity
+    screens are cached, the least recently shown one is destroyed.
+    """
+
+    def __init__(self, capacity=SCREEN_CACHE_SIZE):
+        """
+        Initialize the ScreenCache.
+
+        Parameters:
+        - capacity (int): The largest number of screens kept alive.
+        """
+        self.capacity = max(1, capacity)
+        self.screens = OrderedDict()
+        # mark_dirty runs on whichever thread wrote to the database.
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Take a cached screen and clear its dirty flag. Call from the Tk thread.
+
+        Parameters:
+        - key (str): The key of the screen.
+
+        Returns:
+        - tuple: (widget, dirty), where widget is None if the screen is not cached and dirty
+          tells whether its data changed since it was last shown.
+        """
+        with self.lock:
+            entry = self.screens.get(key)
+            if entry is None:
+                return None, False
+            if not entry["widget"].winfo_exists():
+                del self.screens[key]
+                return None, False
+            self.screens.move_to_end(key)
+            dirty, entry["dirty"] = entry["dirty"], False
+            return entry["widget"], dirty
+
+    def put(self, key, widget, topics=()):
+        """
+        Cache a newly built screen, destroying the least recently shown screens over capacity.
+        Call from the Tk thread.
+
+        Parameters:
+        - key (str): The key of the screen.
+        - widget (tk.Widget): The screen.
+        - topics (iterable): The data topics the screen displays.
+        """
+        with self.lock:
+            self.screens[key] = {"widget": widget, "topics": frozenset(topics), "dirty": False}
+            self.screens.move_to_end(key)
+            evicted = []
+            while len(self.screens) > self.capacity:
+                evicted.append(self.screens.popitem(last=False)[1]["widget"])
+        for screen in evicted:
+            screen.destroy()
+
+    def holds(self, widget):
+        """
+        Tell whether a screen is cached.
+
+        Parameters:
+        - widget (tk.Widget): The screen.
+
+        Returns:
+        - bool: True if the screen is kept alive by the cache.
+        """
+        with self.lock:
+            return any(entry["widget"] is widget for entry in self.screens.values())
+
+    def mark_dirty(self, topics):
+        """
+        Flag the screens that display any of the changed topics. Safe to call from any thread.
+
+        Parameters:
+        - topics (iterable): The data topics that changed.
+        """
+        topics = frozenset(topics)
+        with self.lock:
+            for entry in self.screens.values():
+                if entry["topics"] & topics:
+                    entry["dirty"] = True
@@ -7,7 +7,8 @@ and the StudySession class for managing the study session itself.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
+from constants import STUDY_POLL_INTERVAL_MS
+from study_engine import StudyEngine
 
 class PreStudyOptionsDialog:
     """
@@ -31,6 +32,11 @@ class PreStudyOptionsDialog:
         self.length_var = tk.IntVar(value=20)
         ttk.Spinbox(self.top, from_=5, to=50, textvariable=self.length_var).pack(padx=10, pady=5)
 
+        ttk.Label(self.top, text="Cards:").pack(padx=10, pady=5)
+        self.mode_var = tk.StringVar(value="weighted")
+        ttk.Radiobutton(self.top, text="Weighted practice", variable=self.mode_var, value="weighted").pack(padx=10, pady=2, anchor="w")
+        ttk.Radiobutton(self.top, text="Due for review", variable=self.mode_var, value="due").pack(padx=10, pady=2, anchor="w")
+
         ttk.Label(self.top, text="Categories:").pack(padx=10, pady=5)
         self.category_vars = []
         for category in categories:
@@ -48,6 +54,7 @@ class PreStudyOptionsDialog:
         """Save the selected options and close the dialog."""
         self.result = {
             "length": self.length_var.get(),
+            "mode": self.mode_var.get(),
             "categories": [name for name, var in self.category_vars if var.get()]
         }
         self.top.destroy()
@@ -58,7 +65,10 @@ class PreStudyOptionsDialog:
 
 class StudySession(ttk.Frame):
     """
-    A class to manage the study session.
+    A class to show a study session.
+
+    The session itself is run by a StudyEngine: the deck is drawn on the database executor
+    thread, and the view polls the engine for each card so it never waits for the database.
     """
     
     def __init__(self, parent, controller, options):
@@ -73,38 +83,51 @@ class StudySession(ttk.Frame):
         super().__init__(parent)
         self.controller = controller
         self.options = options
-        self.study_deck = self.get_study_deck()
-        self.current_card_index = 0
-        self.session_stats = {"total": len(self.study_deck), "correct": 0, "incorrect": 0}
+        self.poll_job = None
+        self.bind("<Destroy>", self.on_destroy)
+
+        category_ids = [cat['id'] for cat in self.controller.categories if cat['name'] in self.options['categories']]
+        self.engine = StudyEngine(self.controller.db_manager, category_ids, self.options["length"],
+                                  mode=self.options.get("mode", "weighted"), seed=self.options.get("seed"))
+
+        self.loading_label = ttk.Label(self, text="Preparing study deck...")
+        self.loading_label.pack(pady=20)
+        self.controller.db_executor.cancel_on_destroy(self)
+        self.controller.db_executor.submit(self.engine.draw, tag=self,
+                                           callback=self.start_deck, error_callback=self.on_deck_error)
+
+    def start_deck(self, study_deck):
+        """
+        Start the session with the drawn deck.
+
+        Parameters:
+        - study_deck (list): The flashcard IDs in study order.
+        """
+        self.loading_label.destroy()
+        if self.engine.start(study_deck):
+            pipelines = self.controller.session_pipelines
+            pipelines[:] = [pipeline for pipeline in pipelines if pipeline.running]
+            pipelines.append(self.engine.pipeline)
+        elif self.engine.mode == "due":
+            self.controller.show_toast("No flashcards are due for review in the selected categories.")
+        else:
+            self.controller.show_toast("No flashcards available for the selected categories.")
         self.create_widgets()
 
-    def get_study_deck(self):
-        """Prepare the study deck based on the selected categories and session length."""
-        try:
-            category_ids = [cat['id'] for cat in self.controller.categories if cat['name'] in self.options['categories']]
-            flashcards = self.controller.db_manager.get_flashcards_by_categories(category_ids)
-            
-            if not flashcards:
-                return []
-
-            weighted_deck = []
-            for card in flashcards:
-                weight = self.calculate_card_weight(card[0])
-                weighted_deck.extend([card] * weight)
-            random.shuffle(weighted_deck)
-            return weighted_deck[:min(self.options["length"], len(weighted_deck))]
-        except Exception as e:
-            self.controller.error_handler.show_error("Failed to prepare study deck", str(e))
-            return []
+    def on_deck_error(self, error):
+        """Report a failure to draw the deck and show the empty session."""
+        self.controller.error_handler.show_error("Failed to prepare study deck", str(error))
+        self.loading_label.destroy()
+        self.create_widgets()
 
     def create_widgets(self):
         """Create the widgets for the study session."""
-        if not self.study_deck:
+        if not self.engine.deck:
             ttk.Label(self, text="No flashcards available for the selected categories.", wraplength=300).pack(pady=20)
             ttk.Button(self, text="Back to Main Menu", command=self.controller.show_main_menu).pack(pady=10)
             return
 
-        self.progress_label = ttk.Label(self, text=f"Question 1/{self.session_stats['total']}")
+        self.progress_label = ttk.Label(self, text=f"Question 1/{self.engine.stats['total']}")
         self.progress_label.pack(pady=(0, 20))
 
         self.progress_bar = ttk.Progressbar(self, orient="horizontal", length=300, mode="determinate")
@@ -128,82 +151,80 @@ class StudySession(ttk.Frame):
 
         self.show_question()
 
-    def calculate_card_weight(self, card_id):
-        """
-        Calculate the weight of a flashcard based on its study history.
-
-        Parameters:
-        - card_id (int): The ID of the flashcard.
-
-        Returns:
-        - int: The weight of the flashcard.
-        """
+    def show_question(self):
+        """Display the next question, waiting for the pipeline if it has not loaded it yet."""
+        self.poll_job = None
         try:
-            history = self.controller.db_manager.get_study_history(card_id)
-            if not history:
-                return 5
-            correct_ratio = sum(1 for result in history if result[0]) / len(history)
-            return max(1, int(5 * (1 - correct_ratio)))
+            card = self.engine.next_card()
         except Exception as e:
-            self.controller.error_handler.show_error("Failed to calculate card weight", str(e))
-            return 1
+            self.controller.error_handler.show_error("Failed to load flashcards", str(e))
+            card = None
+        if card is None:
+            if self.engine.finished:
+                self.show_session_summary()
+            else:
+                self.question_label.config(text="Loading...")
+                # No card is shown, so there is nothing to answer until it loads.
+                self.show_answer_button.config(state="disabled")
+                self.correct_button.config(state="disabled")
+                self.incorrect_button.config(state="disabled")
+                self.poll_job = self.after(STUDY_POLL_INTERVAL_MS, self.show_question)
+            return
 
-    def show_question(self):
-        """Display the current question."""
-        if self.current_card_index < len(self.study_deck):
-            self.progress_label.config(text=f"Question {self.current_card_index + 1}/{self.session_stats['total']}")
-            self.question_label.config(text=self.study_deck[self.current_card_index][1])
-            self.answer_label.config(text="")
-            
-            self.correct_button.config(state="disabled")
-            self.incorrect_button.config(state="disabled")
-            self.show_answer_button.config(state="normal")
-
-            progress = (self.current_card_index + 1) / self.session_stats['total'] * 100
-            self.progress_bar["value"] = progress
-        else:
-            self.show_session_summary()
+        question_number = self.engine.answered + 1
+        self.progress_label.config(text=f"Question {question_number}/{self.engine.stats['total']}")
+        self.question_label.config(text=card["question"])
+        self.answer_label.config(text="")
+
+        self.correct_button.config(state="disabled")
+        self.incorrect_button.config(state="disabled")
+        self.show_answer_button.config(state="normal")
+
+        progress = question_number / self.engine.stats['total'] * 100
+        self.progress_bar["value"] = progress
 
     def show_answer(self):
         """Display the answer to the current question."""
-        self.answer_label.config(text=self.study_deck[self.current_card_index][2])
+        self.answer_label.config(text=self.engine.current_card["answer"])
         self.correct_button.config(state="normal")
         self.incorrect_button.config(state="normal")
         self.show_answer_button.config(state="disabled")
 
     def mark_correct(self):
         """Mark the current question as correct and move to the next question."""
-        self.controller.db_manager.add_study_result(self.study_deck[self.current_card_index][0], True)
-        self.session_stats["correct"] += 1
-        self.next_question()
+        if self.engine.answer(True):
+            self.show_question()
 
     def mark_incorrect(self):
         """Mark the current question as incorrect and move to the next question."""
-        self.controller.db_manager.add_study_result(self.study_deck[self.current_card_index][0], False)
-        self.session_stats["incorrect"] += 1
-        self.next_question()
-
-    def next_question(self):
-        """Move to the next question in the study deck, ensuring no duplicate questions in a row."""
-        previous_question = self.study_deck[self.current_card_index][1]
-        while self.current_card_index < len(self.study_deck):
-            self.current_card_index += 1
-            if self.current_card_index < len(self.study_deck) and self.study_deck[self.current_card_index][1] != previous_question:
-                break
-        self.show_question()
+        if self.engine.answer(False):
+            self.show_question()
+
+    def on_destroy(self, event):
+        """
+        Stop the engine when the session is closed. Its remaining results are written in the
+        background; FlashcardApp.shutdown waits for them.
+        """
+        if event.widget is not self or self.engine.pipeline is None:
+            return
+        if self.poll_job:
+            self.after_cancel(self.poll_job)
+        self.engine.close(wait=False)
 
     def show_session_summary(self):
         """Display the summary of the study session."""
+        summary = self.engine.summary()
+        self.engine.close(wait=False)
         for widget in self.winfo_children():
             widget.destroy()
 
         ttk.Label(self, text="Session Summary", style="Header.TLabel").pack(pady=(0, 20))
-        ttk.Label(self, text=f"Total Questions: {self.session_stats['total']}").pack()
-        ttk.Label(self, text=f"Correct Answers: {self.session_stats['correct']}").pack()
-        ttk.Label(self, text=f"Incorrect Answers: {self.session_stats['incorrect']}").pack()
+        ttk.Label(self, text=f"Total Questions: {summary['total']}").pack()
+        ttk.Label(self, text=f"Correct Answers: {summary['correct']}").pack()
+        ttk.Label(self, text=f"Incorrect Answers: {summary['incorrect']}").pack()
         
-        if self.session_stats['total'] > 0:
-            accuracy = (self.session_stats['correct'] / self.session_stats['total']) * 100
+        if summary['total'] > 0:
+            accuracy = summary['accuracy']
             ttk.Label(self, text=f"Accuracy: {accuracy:.2f}%").pack(pady=(10, 20))
             self.create_circular_progress_bar(accuracy)
         else:
@@ -0,0 +1,160 @@
+"""
+theme_styles.py
+
+This file contains the ThemeStyles class, which applies themes from themes.json to the ttk styles
+of the application.
+"""
+
+from tkinter import font as tkfont
+
+# The named fonts shared by every style; widgets follow them when a theme changes their size.
+MAIN_FONT = "FlashcardMain"
+BOLD_FONT = "FlashcardBold"
+HEADER_FONT = "FlashcardHeader"
+
+def compile_theme(theme, scaling_factor):
+    """
+    Turn a theme into a table of style options, ready to apply.
+
+    Parameters:
+    - theme (dict): A theme from themes.json.
+    - scaling_factor (float): The UI scaling factor.
+
+    Returns:
+    - dict: "fonts" maps named fonts to their options, "configure" and "map" map style names
+      to their options for ttk.Style.configure and ttk.Style.map, and "background" is the
+      color of the root window.
+    """
+    colors = theme["colors"]
+    fonts = theme["fonts"]
+    styles = theme["styles"]
+
+    main_font_size = int(fonts["main"]["size"] * scaling_factor)
+    header_font_size = int(fonts["header"]["size"] * scaling_factor)
+    entry_height = int(30 * scaling_factor)
+
+    return {
+        "fonts": {
+            MAIN_FONT: {"family": fonts["main"]["family"], "size": main_font_size, "weight": "normal"},
+            BOLD_FONT: {"family": fonts["main"]["family"], "size": main_font_size, "weight": "bold"},
+            HEADER_FONT: {"family": fonts["header"]["family"], "size": header_font_size, "weight": fonts["header"]["weight"]},
+        },
+        "configure": {
+            ".": {"font": MAIN_FONT, "background": colors["background"]},
+            "TFrame": {"background": colors["background"]},
+            "TLabel": {"background": colors["background"], "foreground": colors["foreground"], "font": MAIN_FONT},
+            "Header.TLabel": {"font": HEADER_FONT},
+            "TButton": {"background": colors["button"], "foreground": colors["button_text"], "font": BOLD_FONT,
+                        "padding": int(styles["button"]["padding"] * scaling_factor)},
+            "TEntry": {"fieldbackground": colors["background"], "foreground": colors["foreground"],
+                       "borderwidth": styles["entry"]["borderwidth"], "font": MAIN_FONT, "height": entry_height},
+            "TCombobox": {"fieldbackground": colors["background"], "foreground": colors["foreground"],
+                          "borderwidth": styles["entry"]["borderwidth"], "font": MAIN_FONT, "height": entry_height},
+            "Treeview": {"background": styles["treeview"]["background"], "fieldbackground": styles["treeview"]["fieldbackground"],
+                         "foreground": colors["foreground"], "font": MAIN_FONT,
+                         "rowheight": int(styles["treeview"]["rowheight"] * scaling_factor)},
+            "Treeview.Heading": {"background": colors["button"], "foreground": colors["button_text"], "font": BOLD_FONT},
+            "Vertical.TScrollbar": {"background": colors["button"], "troughcolor": colors["background"]},
+            "Horizontal.TScrollbar": {"background": colors["button"], "troughcolor": colors["background"]},
+            "TProgressbar": {"background": colors["accent"], "troughcolor": colors["background"]},
+        },
+        "map": {
+            "TButton": {"background": [("active", colors["accent"])], "foreground": [("active", colors["background"])]},
+        },
+        "background": colors["background"],
+    }
+
+class ThemeStyles:
+    """
+    Apply themes to the ttk styles of a root window.
+
+    Each (theme name, scaling factor) pair is compiled once. Applying a theme pushes only the
+    options that differ from the ones already applied, so re-applying the active theme does
+    nothing, and fonts are changed by reconfiguring the shared named fonts in place.
+    """
+
+    def __init__(self, root, style):
+        """
+        Initialize the ThemeStyles.
+
+        Parameters:
+        - root (tk.Tk): The root window.
+        - style (ttk.Style): The style of the root window.
+        """
+        self.root = root
+        self.style = style
+        self.compiled = {}
+        self.fonts = {}
+        self.applied_fonts = {}
+        self.applied_options = {}
+        self.applied_maps = {}
+        self.applied_background = None
+        self.theme_ready = False
+
+    def compile(self, theme_name, theme, scaling_factor):
+        """
+        Return the compiled style table of a theme, compiling it on first use.
+
+        Parameters:
+        - theme_name (str): The name of the theme.
+        - theme (dict): The theme from themes.json.
+        - scaling_factor (float): The UI scaling factor.
+
+        Returns:
+        - dict: The style table, as returned by compile_theme.
+        """
+        key = (theme_name, scaling_factor)
+        if key not in self.compiled:
+            self.compiled[key] = compile_theme(theme, scaling_factor)
+        return self.compiled[key]
+
+    def apply(self, theme_name, theme, scaling_factor):
+        """
+        Apply a theme, pushing only the options that changed.
+
+        Parameters:
+        - theme_name (str): The name of the theme.
+        - theme (dict): The theme from themes.json.
+        - scaling_factor (float): The UI scaling factor.
+
+        Returns:
+        - int: The number of fonts, style options and maps that were pushed to Tk.
+        """
+        table = self.compile(theme_name, theme, scaling_factor)
+        pushed = 0
+        if not self.theme_ready:
+            # Switching the ttk theme restyles every widget, so it is only done once.
+            self.style.theme_use("clam")
+            self.theme_ready = True
+
+        for name, options in table["fonts"].items():
+            if self.applied_fonts.get(name) == options:
+                continue
+            if name in self.fonts:
+                self.fonts[name].configure(**options)
+            else:
+                self.fonts[name] = tkfont.Font(self.root, name=name, exists=False, **options)
+            self.applied_fonts[name] = options
+            pushed += 1
+
+        for style_name, options in table["configure"].items():
+            applied = self.applied_options.setdefault(style_name, {})
+            changed = {option: value for option, value in options.items() if applied.get(option) != value}
+            if changed:
+                self.style.configure(style_name, **changed)
+                applied.update(changed)
+                pushed += len(changed)
+
+        for style_name, options in table["map"].items():
+            applied = self.applied_maps.setdefault(style_name, {})
+            changed = {option: value for option, value in options.items() if applied.get(option) != value}
+            if changed:
+                self.style.map(style_name, **changed)
+                applied.update(changed)
+                pushed += len(changed)
+
+        if table["background"] != self.applied_background:
+            self.root.configure(bg=table["background"])
+            self.applied_background = table["background"]
+            pushed += 1
+        return pushed
@@ -0,0 +1,204 @@
+"""
+trend_view.py
+
+This file contains the TrendView class for charting study activity over time.
+"""
+
+import datetime
+import tkinter as tk
+from tkinter import ttk
+
+# The selectable chart ranges, in days.
+TREND_RANGES = {"30 days": 30, "90 days": 90, "1 year": 365}
+
+# Ranges longer than this chart accuracy per week instead of per day.
+WEEKLY_ACCURACY_ABOVE_DAYS = 90
+
+class TrendView(ttk.Frame):
+    """
+    A class to chart reviews per day, accuracy over time and study streaks.
+
+    The charts are drawn from the daily rollup tables, which are brought up to date with the
+    study history in the background each time the view loads.
+    """
+
+    def __init__(self, parent, controller):
+        """
+        Initialize the TrendView.
+
+        Parameters:
+        - parent (tk.Widget): The parent widget.
+        - controller (FlashcardApp): The main application controller.
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.activity = []
+        self.streaks = {"current": 0, "longest": 0}
+        self.controller.db_executor.cancel_on_destroy(self)
+        self.create_widgets()
+        self.load_trends()
+
+    def create_widgets(self):
+        """Create the widgets for the trend view."""
+        top_frame = ttk.Frame(self)
+        top_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        ttk.Label(top_frame, text="Range:").pack(side=tk.LEFT, padx=(0, 5))
+        self.range_var = tk.StringVar(value="90 days")
+        range_combobox = ttk.Combobox(top_frame, textvariable=self.range_var, values=list(TREND_RANGES),
+                                      state="readonly", width=10)
+        range_combobox.pack(side=tk.LEFT)
+        range_combobox.bind("<<ComboboxSelected>>", lambda event: self.load_trends())
+
+        self.summary_label = ttk.Label(top_frame, text="Loading trends...")
+        self.summary_label.pack(side=tk.LEFT, padx=20)
+
+        ttk.Label(self, text="Reviews per day").pack(anchor="w", padx=10, pady=(10, 0))
+        self.reviews_canvas = tk.Canvas(self, height=150, highlightthickness=0)
+        self.reviews_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.accuracy_title = ttk.Label(self, text="Accuracy")
+        self.accuracy_title.pack(anchor="w", padx=10, pady=(10, 0))
+        self.accuracy_canvas = tk.Canvas(self, height=150, highlightthickness=0)
+        self.accuracy_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
+
+        for canvas in (self.reviews_canvas, self.accuracy_canvas):
+            canvas.bind("<Configure>", lambda event: self.draw_charts())
+
+    def range_days(self):
+        """Return the number of days in the selected range."""
+        return TREND_RANGES.get(self.range_var.get(), 90)
+
+    def load_trends(self):
+        """Update the rollups and load the selected range in the background."""
+        self.controller.db_executor.cancel(self)
+        self.controller.db_executor.submit(self.fetch_trends, self.range_days(), tag=self,
+                                           callback=self.show_trends, error_callback=self.on_load_error)
+
+    def fetch_trends(self, days):
+        """
+        Update the rollups and read the activity and streaks. Runs on the database executor thread.
+
+        Parameters:
+        - days (int): The number of days to read, ending today.
+
+        Returns:
+        - tuple: (first day, activity rows, streaks).
+        """
+        db_manager = self.controller.db_manager
+        db_manager.update_rollups()
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        first_day = today - datetime.timedelta(days=days - 1)
+        return first_day, db_manager.get_daily_activity(first_day.isoformat()), db_manager.get_study_streaks(today.isoformat())
+
+    def show_trends(self, data):
+        """
+        Show loaded trend data.
+
+        Parameters:
+        - data (tuple): The result of fetch_trends.
+        """
+        first_day, rows, self.streaks = data
+        # One entry per day of the range, including the days without reviews.
+        by_day = {day: (correct, total) for day, correct, total in rows}
+        days = [first_day + datetime.timedelta(days=offset) for offset in range(self.range_days())]
+        self.activity = [(day, *by_day.get(day.isoformat(), (0, 0))) for day in days]
+
+        reviews = sum(total for _, _, total in self.activity)
+        correct = sum(correct for _, correct, _ in self.activity)
+        accuracy = f"{correct / reviews * 100:.1f}%" if reviews else "N/A"
+        self.summary_label.config(text=f"Reviews: {reviews}    Accuracy: {accuracy}    "
+                                       f"Current streak: {self.streaks['current']} days    "
+                                       f"Longest streak: {self.streaks['longest']} days")
+        self.draw_charts()
+
+    def on_load_error(self, error):
+        """Report a failure to load the trends."""
+        self.summary_label.config(text="")
+        self.controller.error_handler.show_error("Failed to load trends", str(error))
+
+    def refresh(self):
+        """Reload the trends after the study history changed while the view was hidden."""
+        self.load_trends()
+
+    def accuracy_points(self):
+        """
+        Group the activity into the buckets of the accuracy chart.
+
+        Returns:
+        - list: (bucket start day, accuracy or None) tuples, None for buckets without reviews.
+        """
+        size = 7 if len(self.activity) > WEEKLY_ACCURACY_ABOVE_DAYS else 1
+        points = []
+        for start in range(0, len(self.activity), size):
+            bucket = self.activity[start:start + size]
+            total = sum(row[2] for row in bucket)
+            points.append((bucket[0][0], sum(row[1] for row in bucket) / total if total else None))
+        return points
+
+    def draw_charts(self):
+        """Draw both charts for the current canvas sizes."""
+        colors = self.controller.settings_manager.get_current_theme()["colors"]
+        self.draw_reviews_chart(colors)
+        self.draw_accuracy_chart(colors)
+
+    def draw_reviews_chart(self, colors):
+        """Draw the reviews per day as bars."""
+        canvas = self.reviews_canvas
+        canvas.delete("all")
+        canvas.configure(bg=colors["background"])
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if not self.activity or width < 20 or height < 20:
+            return
+
+        peak = max(total for _, _, total in self.activity)
+        bar_width = (width - 40) / len(self.activity)
+        baseline = height - 15
+        for index, (day, _, total) in enumerate(self.activity):
+            if total:
+                x = 35 + index * bar_width
+                top = baseline - (baseline - 10) * total / peak
+                canvas.create_rectangle(x, top, x + max(1, bar_width - 1), baseline, fill=colors["accent"], width=0)
+        canvas.create_line(35, baseline, width - 5, baseline, fill=colors["foreground"])
+        canvas.create_text(30, 10, text=str(peak), anchor="ne", fill=colors["foreground"])
+        self.draw_day_labels(canvas, colors, baseline, width)
+
+    def draw_accuracy_chart(self, colors):
+        """Draw the accuracy over time as a line, with gaps for periods without reviews."""
+        points = self.accuracy_points()
+        self.accuracy_title.config(text="Accuracy per week" if len(points) < len(self.activity) else "Accuracy per day")
+        canvas = self.accuracy_canvas
+        canvas.delete("all")
+        canvas.configure(bg=colors["background"])
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if not points or width < 20 or height < 20:
+            return
+
+        baseline = height - 15
+        step = (width - 40) / max(1, len(points) - 1)
+        segment = []
+        for index, (_, accuracy) in enumerate(points):
+            if accuracy is None:
+                self.draw_segment(canvas, segment, colors)
+                segment = []
+                continue
+            segment.append((35 + index * step, baseline - (baseline - 10) * accuracy))
+        self.draw_segment(canvas, segment, colors)
+
+        canvas.create_line(35, baseline, width - 5, baseline, fill=colors["foreground"])
+        canvas.create_text(30, 10, text="100%", anchor="ne", fill=colors["foreground"])
+        canvas.create_text(30, baseline, text="0%", anchor="e", fill=colors["foreground"])
+        self.draw_day_labels(canvas, colors, baseline, width)
+
+    def draw_segment(self, canvas, segment, colors):
+        """Draw one unbroken run of accuracy points."""
+        if len(segment) > 1:
+            canvas.create_line(*[coordinate for point in segment for coordinate in point], fill=colors["accent"], width=2)
+        elif segment:
+            x, y = segment[0]
+            canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill=colors["accent"], width=0)
+
+    def draw_day_labels(self, canvas, colors, baseline, width):
+        """Label the first and last day of the range under a chart."""
+        canvas.create_text(35, baseline + 2, text=self.activity[0][0].isoformat(), anchor="nw", fill=colors["foreground"])
+        canvas.create_text(width - 5, baseline + 2, text=self.activity[-1][0].isoformat(), anchor="ne", fill=colors["foreground"])
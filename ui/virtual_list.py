@@ -0,0 +1,491 @@
+"""
+virtual_list.py
+
+This file contains the VirtualList class, a Treeview that only renders the visible rows of a
+large sorted row source, and the ListPageSource class for small in-memory row sources.
+"""
+
+import bisect
+import logging
+import tkinter as tk
+from tkinter import ttk
+from constants import VIRTUAL_LIST_MARGIN
+
+# The number of row keys a VirtualList remembers the position of, to seek from on jumps.
+MAX_ANCHORS = 1024
+
+class ListPageSource:
+    """
+    A row source backed by an in-memory list, for short lists such as search results.
+
+    Row sources provide count() and fetch_page(sort_column, descending, after, before, offset, limit)
+    with the same meaning as DatabaseManager.count_flashcards and DatabaseManager.get_flashcard_page:
+    offset skips rows after the after key, or before the before key.
+    """
+
+    def __init__(self, rows, sort_indexes):
+        """
+        Initialize the ListPageSource.
+
+        Parameters:
+        - rows (list): The row tuples. The first value of each row is its unique ID.
+        - sort_indexes (dict): A mapping of sort column name to row index.
+        """
+        self.rows = rows
+        self.sort_indexes = sort_indexes
+        self.sorted_cache = {}
+
+    def count(self):
+        """Return the number of rows."""
+        return len(self.rows)
+
+    def sorted_rows(self, sort_column):
+        """Return the rows and their keys in ascending (sort value, id) order, cached per column."""
+        if sort_column not in self.sorted_cache:
+            index = self.sort_indexes[sort_column]
+            rows = sorted(self.rows, key=lambda row: (row[index], row[0]))
+            self.sorted_cache[sort_column] = (rows, [(row[index], row[0]) for row in rows])
+        return self.sorted_cache[sort_column]
+
+    def fetch_page(self, sort_column, descending=False, after=None, before=None, offset=0, limit=100):
+        """Return up to limit rows following after, preceding before, or starting at offset."""
+        rows, keys = self.sorted_rows(sort_column)
+        if descending:
+            rows = rows[::-1]
+        # The keys need not be in the list any more, so they are looked up by bisection.
+        if after is not None:
+            start = (len(keys) - bisect.bisect_left(keys, tuple(after)) if descending
+                     else bisect.bisect_right(keys, tuple(after))) + offset
+            return rows[start:start + limit]
+        if before is not None:
+            end = (len(keys) - bisect.bisect_right(keys, tuple(before)) if descending
+                   else bisect.bisect_left(keys, tuple(before))) - offset
+            return rows[max(0, end - limit):max(0, end)]
+        return rows[offset:offset + limit]
+
+class VirtualList(ttk.Frame):
+    """
+    A Treeview that renders only the visible window of a row source.
+
+    Rows are kept in a buffer covering the visible window plus a margin on each side. Scrolling
+    extends the buffer with keyset pages from the row source before the window reaches its edge.
+    Jumps with the scrollbar seek from the nearest row key whose position is known (the rows
+    seen so far, the top and the bottom), so they only skip the rows in between. The row count
+    is only taken when the list is reloaded.
+
+    With an executor, the row source is called on the database executor thread and the list
+    shows a placeholder row until the rows arrive; while a fetch runs, further scrolling only
+    moves the window, and the rows for wherever it ended up are fetched next. Clicking a
+    sortable heading sorts the rows in the row source.
+    """
+
+    def __init__(self, parent, columns, source, sort_column="id", margin=VIRTUAL_LIST_MARGIN, sort_indexes=None,
+                 executor=None, placeholder="Loading...", error_callback=None):
+        """
+        Initialize the VirtualList.
+
+        Parameters:
+        - parent (tk.Widget): The parent widget.
+        - columns (list): (name, heading, width, row index, sortable) tuples for the displayed columns.
+        - source: The row source, see ListPageSource. The first value of each row is its unique ID.
+        - sort_column (str): The initial sort column name.
+        - margin (int): The number of rows buffered beyond each edge of the visible window.
+        - sort_indexes (dict): The row index of the sort key of columns that display a formatted
+          value instead of it, by column name.
+        - executor (DatabaseExecutor): Runs the row source calls off the Tk thread. Without it,
+          they run on the Tk thread.
+        - placeholder (str): The text shown while the rows of the window are loading.
+        - error_callback (callable): Called with the exception when a row source call fails.
+          Errors are logged when it is None.
+        """
+        super().__init__(parent)
+        self.columns = columns
+        self.source = source
+        self.sort_column = sort_column
+        self.descending = False
+        self.margin = margin
+        self.sort_indexes = sort_indexes or {}
+        self.executor = executor
+        self.placeholder = placeholder
+        self.error_callback = error_callback
+        self.total = 0
+        self.position = 0
+        self.visible_count = 20
+        self.buffer = []
+        self.buffer_start = 0
+        self.anchor_positions = []
+        self.anchor_keys = {}
+        # Bumped whenever buffered rows become invalid, so late results are dropped.
+        self.generation = 0
+        self.loading = False
+        self.selected_id = None
+        self.rendering = False
+        self.create_widgets()
+        if executor is not None:
+            executor.cancel_on_destroy(self)
+        self.reload()
+
+    def create_widgets(self):
+        """Create the Treeview and its scrollbar."""
+        self.tree = ttk.Treeview(self, columns=[column[0] for column in self.columns], show="headings", selectmode="browse")
+        for name, heading, width, _, sortable in self.columns:
+            command = (lambda name=name: self.sort_by(name)) if sortable else ""
+            self.tree.heading(name, text=heading, command=command)
+            self.tree.column(name, width=width)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self.on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_count))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_count))
+
+    def set_source(self, source, keep_position=False):
+        """
+        Show the rows of another row source.
+
+        Parameters:
+        - source: The new row source.
+        - keep_position (bool): Whether to stay near the rows shown now, e.g. when the new source
+          holds the same rows after a change, instead of starting from the top.
+        """
+        self.source = source
+        if not keep_position:
+            self.position = 0
+            self.buffer = []
+        self.reload()
+
+    def reload(self):
+        """Count the rows again and show the window at the same place, e.g. after the data changed."""
+        self.invalidate()
+        # Stay at the first buffered row: seek past its key, which works even if it was deleted.
+        if self.buffer and self.buffer_start > 0:
+            start, seek = self.buffer_start + 1, {"after": self.row_key(self.buffer[0])}
+        else:
+            start = 0 if self.buffer else max(0, self.position - self.margin)
+            seek = {"offset": start}
+        limit = max(self.visible_count + 2 * self.margin, self.position + self.visible_count + self.margin - start)
+        self.buffer = []
+        self.buffer_start = start
+        source, sort_column, descending = self.source, self.sort_column, self.descending
+
+        def load():
+            return source.count(), source.fetch_page(sort_column, descending, limit=limit, **seek)
+
+        def show(result):
+            self.total, rows = result
+            self.store_rows(start, rows, limit)
+        self.call(load, show)
+        self.refresh_window()
+
+    def sort_by(self, sort_column, descending=None):
+        """
+        Sort by a column, toggling the direction when it is already the sort column.
+
+        Parameters:
+        - sort_column (str): The column name.
+        - descending (bool): The sort direction, overriding the toggle.
+        """
+        if descending is None:
+            descending = not self.descending if sort_column == self.sort_column else False
+        self.invalidate()
+        self.descending = descending
+        self.sort_column = sort_column
+        self.position = 0
+        self.buffer = []
+        self.buffer_start = 0
+        self.refresh_window()
+
+    def invalidate(self):
+        """Forget the row positions learned so far and drop the results of running fetches."""
+        self.generation += 1
+        self.loading = False
+        if self.executor is not None:
+            self.executor.cancel(self)
+        self.anchor_positions = []
+        self.anchor_keys = {}
+
+    def clamp(self, position):
+        """Limit a position to the range that keeps the window inside the rows."""
+        return max(0, min(position, self.total - self.visible_count))
+
+    def row_key(self, row):
+        """Return the (sort value, id) keyset key of a row."""
+        if self.sort_column == "id":
+            index = 0
+        elif self.sort_column in self.sort_indexes:
+            index = self.sort_indexes[self.sort_column]
+        else:
+            index = next(column[3] for column in self.columns if column[0] == self.sort_column)
+        return (row[index], row[0])
+
+    def call(self, func, callback):
+        """
+        Run a row source call, on the executor if there is one, and pass its result to callback
+        unless the list was reloaded or re-sorted in the meantime.
+
+        Parameters:
+        - func (callable): The call, taking no arguments and touching no widgets.
+        - callback (callable): Called on the Tk thread with the result.
+        """
+        generation = self.generation
+        self.loading = True
+
+        def deliver(result):
+            if generation == self.generation:
+                self.loading = False
+                callback(result)
+                if self.executor is not None:
+                    self.refresh_window()
+
+        def fail(error):
+            if generation == self.generation:
+                self.loading = False
+                self.render()
+                if self.error_callback:
+                    self.error_callback(error)
+                else:
+                    logging.error(f"Failed to load list rows: {error}")
+
+        if self.executor is None:
+            try:
+                result = func()
+            except Exception as e:
+                fail(e)
+                return
+            deliver(result)
+        else:
+            self.executor.submit(func, tag=self, callback=deliver, error_callback=fail)
+
+    def remember(self, position, row):
+        """Remember the position of a row key, to seek from on later jumps."""
+        if position not in self.anchor_keys:
+            bisect.insort(self.anchor_positions, position)
+        self.anchor_keys[position] = self.row_key(row)
+        if len(self.anchor_positions) > MAX_ANCHORS:
+            # Keep every other position, which still spreads them over everything seen.
+            del self.anchor_positions[::2]
+            self.anchor_keys = {position: self.anchor_keys[position] for position in self.anchor_positions}
+
+    def store_rows(self, start, rows, limit):
+        """
+        Replace the buffer with a page of rows.
+
+        Parameters:
+        - start (int): The position of the first row.
+        - rows (list): The rows.
+        - limit (int): The number of rows asked for; fewer means the page reached the end.
+        """
+        self.buffer = rows
+        self.buffer_start = start
+        if len(rows) < limit or start + len(rows) > self.total:
+            self.total = start + len(rows)
+            # The rows changed since their positions were learned.
+            self.anchor_positions = []
+            self.anchor_keys = {}
+        if rows:
+            self.remember(start, rows[0])
+            self.remember(start + len(rows) - 1, rows[-1])
+
+    def fetch(self, **kwargs):
+        """Return a function fetching a page of rows from the row source in the current sort order."""
+        source, sort_column, descending = self.source, self.sort_column, self.descending
+        return lambda: source.fetch_page(sort_column, descending, **kwargs)
+
+    def fill_buffer(self):
+        """Start fetching the rows the buffer is missing around the window, fetching as little as possible."""
+        window_end = min(self.total, self.position + self.visible_count)
+        if window_end <= self.position:
+            return
+        buffer_end = self.buffer_start + len(self.buffer)
+        # Fetch ahead once the window comes within half a margin of the edge of the buffer.
+        lead = self.margin // 2
+        wanted_start = max(0, self.position - lead)
+        wanted_end = min(self.total, window_end + lead)
+        if self.buffer and self.buffer_start <= wanted_start and wanted_end <= buffer_end:
+            return
+
+        max_buffer = self.visible_count + 4 * self.margin
+        if self.buffer and self.buffer_start <= self.position <= buffer_end and wanted_end > buffer_end:
+            # Scrolling forward past the buffer: continue after its last row.
+            limit = window_end + self.margin - buffer_end
+
+            def extend(rows):
+                self.buffer.extend(rows)
+                if rows:
+                    self.remember(self.buffer_start + len(self.buffer) - 1, rows[-1])
+                if len(rows) < min(limit, self.total - buffer_end):
+                    self.total = self.buffer_start + len(self.buffer)
+                overflow = len(self.buffer) - max_buffer
+                if overflow > 0:
+                    del self.buffer[:overflow]
+                    self.buffer_start += overflow
+            self.call(self.fetch(after=self.row_key(self.buffer[-1]), limit=limit), extend)
+        elif self.buffer and wanted_start < self.buffer_start <= window_end:
+            # Scrolling backward past the buffer: continue before its first row.
+            limit = self.buffer_start - max(0, self.position - self.margin)
+
+            def prepend(rows):
+                self.buffer[:0] = rows
+                self.buffer_start -= len(rows)
+                if rows:
+                    self.remember(self.buffer_start, rows[0])
+                if len(rows) < limit and self.buffer_start > 0:
+                    # Fewer rows precede the buffer than its position says: it starts the list.
+                    self.position -= self.buffer_start
+                    self.total -= self.buffer_start
+                    self.buffer_start = 0
+                del self.buffer[max_buffer:]
+            self.call(self.fetch(before=self.row_key(self.buffer[0]), limit=limit), prepend)
+        else:
+            self.jump()
+
+    def jump(self):
+        """Start fetching a fresh page around the window, seeking from the nearest known row key."""
+        start = max(0, self.position - self.margin)
+        end = min(self.total, start + self.visible_count + 2 * self.margin)
+        limit = end - start
+        # Skip from the top, from the bottom (the rows before it in the reverse order) or from
+        # the nearest remembered key before or after the page, whichever skips fewest rows.
+        source, sort_column, descending, from_end = self.source, self.sort_column, self.descending, self.total - end
+        candidates = [(start, self.fetch(offset=start, limit=limit)),
+                      (from_end, lambda: source.fetch_page(sort_column, not descending, offset=from_end, limit=limit)[::-1])]
+        index = bisect.bisect_left(self.anchor_positions, start)
+        if index > 0:
+            anchor = self.anchor_positions[index - 1]
+            candidates.append((start - anchor - 1,
+                               self.fetch(after=self.anchor_keys[anchor], offset=start - anchor - 1, limit=limit)))
+        index = bisect.bisect_left(self.anchor_positions, end)
+        if index < len(self.anchor_positions):
+            anchor = self.anchor_positions[index]
+            candidates.append((anchor - end, self.fetch(before=self.anchor_keys[anchor], offset=anchor - end, limit=limit)))
+        _, fetch = min(candidates, key=lambda candidate: candidate[0])
+        self.call(fetch, lambda rows: self.store_rows(start, rows, limit))
+
+    def refresh_window(self):
+        """Render the rows of the current window and fetch the rows around it that are missing."""
+        self.position = self.clamp(self.position)
+        if not self.loading:
+            self.fill_buffer()
+            self.position = self.clamp(self.position)
+        self.render()
+
+    def render(self):
+        """Replace the Treeview items with the rows of the visible window."""
+        offset = self.position - self.buffer_start
+        rows = self.buffer[offset:offset + self.visible_count] if offset >= 0 else []
+        if self.loading and len(rows) < min(self.visible_count, self.total - self.position):
+            # Show the placeholder rather than a part of the window or rows from elsewhere.
+            rows = []
+        self.rendering = True
+        try:
+            self.tree.delete(*self.tree.get_children())
+            if not rows and self.loading:
+                self.tree.insert("", tk.END, values=[self.placeholder] + [""] * (len(self.columns) - 1))
+            for row in rows:
+                self.tree.insert("", tk.END, iid=str(row[0]), values=[row[column[3]] for column in self.columns])
+            if self.selected_id is not None and self.tree.exists(str(self.selected_id)):
+                self.tree.selection_set(str(self.selected_id))
+        finally:
+            self.rendering = False
+
+        for name, heading, _, _, sortable in self.columns:
+            arrow = (" ▼" if self.descending else " ▲") if name == self.sort_column else ""
+            self.tree.heading(name, text=heading + arrow)
+
+        if self.total:
+            self.scrollbar.set(self.position / self.total, min(1.0, (self.position + self.visible_count) / self.total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, position):
+        """
+        Show the window starting at a row position.
+
+        Parameters:
+        - position (int): The index of the first visible row.
+        """
+        position = self.clamp(position)
+        if position != self.position:
+            self.position = position
+            self.refresh_window()
+
+    def scroll_by(self, rows):
+        """Scroll by a number of rows and stop further handling of the event."""
+        self.scroll_to(self.position + rows)
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags, arrow clicks and trough clicks."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_count if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        """Scroll three rows per wheel notch."""
+        notches = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll_by(-3 * notches)
+
+    def on_configure(self, event):
+        """Recompute how many rows fit when the Treeview is resized."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # One row's worth of height is taken by the headings.
+        visible_count = max(1, event.height // row_height - 1)
+        if visible_count != self.visible_count:
+            self.visible_count = visible_count
+            self.refresh_window()
+
+    def on_select(self, event):
+        """Remember the selected row ID so the selection survives scrolling."""
+        if self.rendering:
+            return
+        selection = self.tree.selection()
+        self.selected_id = self.row_id_for(selection[0]) if selection else None
+
+    def row_id_for(self, iid):
+        """Return the row ID of a Treeview item."""
+        offset = self.position - self.buffer_start
+        for row in self.buffer[max(0, offset):offset + self.visible_count]:
+            if str(row[0]) == iid:
+                return row[0]
+        return None
+
+    def move_selection(self, step):
+        """Move the selection one row up or down, scrolling at the edges of the window."""
+        items = self.tree.get_children()
+        if not items:
+            return "break"
+        selection = self.tree.selection()
+        index = items.index(selection[0]) + step if selection else 0
+        if index < 0:
+            self.scroll_by(-1)
+            index = 0
+        elif index >= len(items):
+            self.scroll_by(1)
+            index = len(items) - 1
+        items = self.tree.get_children()
+        if items:
+            index = min(index, len(items) - 1)
+            self.tree.selection_set(items[index])
+            self.tree.see(items[index])
+        return "break"
+
+    def selected_row(self):
+        """
+        Get the selected row.
+
+        Returns:
+        - tuple: The selected row, or None when nothing is selected or it is no longer buffered.
+        """
+        for row in self.buffer:
+            if row[0] == self.selected_id:
+                return row
+        return None